@@ -1,23 +1,69 @@
 from __future__ import annotations
 
-import base64
-from datetime import date, timedelta
 from typing import List
 
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor
 from PySide6.QtWidgets import (
     QFrame,
     QHBoxLayout,
     QLabel,
+    QAbstractItemView,
+    QHeaderView,
     QLineEdit,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
 )
 
+from core.quote_render import QuoteTemplate, logo_img, quote_dates
+from core.spans import traced
+from core.workload_calendar import DAY_COLORS, ONSITE, TRAVEL, WorkloadSchedule, schedule_assignments
+from ui.calendar_model import CalendarDelegate, CalendarModel
+
 from legacy_pcp.pcp_v1_1 import MainWindow as PCPMainWindow
 from legacy_pcp.pcp_v1_1 import RoleTotals, ExpenseLine, Assignment, money, LOGO_PATH, TRAVEL_DAYS_PER_PERSON, Section
+from legacy_pcp.pcp_v1_1 import TABLE_ROW_HEIGHT
+
+CALENDAR_DAY_WIDTH = 30
+
+
+# Printed CTO quote layout, parsed once; build_quote_html fills it from the calc result.
+CTO_QUOTE_TEMPLATE = QuoteTemplate("""<html><head><meta charset='utf-8'/><style>
+    body { font-family: Arial, Helvetica, sans-serif; font-size:10pt; color:#0F172A; }
+    .topbar { display:flex; justify-content:space-between; border-bottom:3px solid #F05A28; padding-bottom:10px; margin-bottom:14px; }
+    .band { width:100%; background:#eaf0f4; padding:10px; margin:10px 0 14px 0; box-sizing:border-box; }
+    .two { display:table; width:100%; } .two > div { display:table-cell; width:50%; vertical-align:top; padding-right:10px; }
+    .grid { width:100%; border-collapse:collapse; margin-top:10px; table-layout:fixed; }
+    .grid th { background:#343551; color:white; text-align:left; padding:8px; } .grid td { padding:7px; border-bottom:1px solid #E2E8F0; }
+    .right { text-align:right; } h3 { color:#4c4b4c; margin:16px 0 8px 0; }
+    .travel { background:$travel_color; text-align:center; } .onsite { background:$onsite_color; text-align:center; }
+    .legend span { display:inline-block; padding:2px 8px; margin-right:8px; border:1px solid #9aa4b2; }
+</style></head><body>
+<div class='topbar'><div><p style='margin:0;font-size:18pt;font-weight:800;color:#4c4b4c;'>Commissioning Budget Quote</p><p style='margin:4px 0 0 0;color:#6D6E71;'>Service Estimate</p></div><div>$logo_html</div></div>
+
+<table class='grid'><tr><th>Customer Name</th><th>Reference</th><th>Submitted to</th><th>Prepared By</th></tr>
+<tr><td>$customer</td><td>$reference</td><td>$submitted_to</td><td>$prepared_by</td></tr></table>
+
+<div class='band'><div class='two'><div><b>DATE</b><br/>$date_str<br/><br/><b>TOTAL PERSONNEL</b><br/>$headcount ($tech_headcount Tech, $eng_headcount Eng)</div>
+<div><b>QUOTE VALIDITY</b><br/>$valid_str<br/><br/><b>ESTIMATED DURATION</b><br/>$max_onsite days onsite + $travel_days travel days</div></div></div>
+
+<h3>Workload Calendar ($horizon-Day)</h3>
+<div class='legend'><span class='travel'>Travel (T)</span><span class='onsite'>Onsite (O)</span></div>
+$calendar
+
+<h3>Machine Breakdown</h3><table class='grid'><tr><th style='width:26%'>Model</th><th style='width:8%;text-align:center;'>Qty</th><th style='width:22%'>Tech Days</th><th style='width:12%;text-align:center;'>Eng Days</th><th style='width:16%;text-align:center;'>Technicians</th><th style='width:16%;text-align:center;'>Engineers</th></tr>$machine_rows</table>
+
+<h3>Labor Costs</h3><table class='grid'><tr><th style='width:78%'>Item</th><th class='right' style='width:22%'>Extended</th></tr>
+<tr><td>Tech. Regular Time ($tech_days days × $tech_day_rate/day)</td><td class='right'>$tech_labor</td></tr>
+<tr><td>Eng. Regular Time ($eng_days days × $eng_day_rate/day)</td><td class='right'>$eng_labor</td></tr>
+<tr><td><b>Labor Subtotal</b></td><td class='right'><b>$labor_sub</b></td></tr></table>
+
+<h3>Estimated Expenses</h3><table class='grid'><tr><th style='width:28%'>Expense</th><th style='width:52%'>Details</th><th class='right' style='width:20%'>Amount</th></tr>$exp_rows
+<tr><td><b>Expenses Subtotal</b></td><td>—</td><td class='right'><b>$exp_total</b></td></tr></table>
+
+<h3>Estimated Total</h3><div style='background:#eaf0f4;padding:10px;'><b style='font-size:16pt'>$grand_total</b></div>
+$req_html
+</body></html>""", travel_color=DAY_COLORS[TRAVEL], onsite_color=DAY_COLORS[ONSITE],
+                                   travel_days=TRAVEL_DAYS_PER_PERSON)
 
 
 class CTOMainWindow(PCPMainWindow):
@@ -51,29 +97,57 @@ class CTOMainWindow(PCPMainWindow):
         form_section.content_layout.addWidget(form)
         self.right_content.layout().insertWidget(0, form_section)
 
+    def quote_state(self) -> dict:
+        state = dict(super().quote_state())
+        state["header"] = {label: inp.text() for label, inp in self.quote_fields.items()}
+        return state
+
+    def restore_quote_state(self, state: dict):
+        for label, text in state.get("header", {}).items():
+            if label in self.quote_fields:
+                self.quote_fields[label].setText(text)
+        super().restore_quote_state(state)
+
     def _build_workload_calendar_ui(self):
         # Hide legacy chart-centric workload section for CTO and replace with a 14-day calendar.
         if hasattr(self, "chart_view") and self.chart_view is not None:
             self.chart_view.setVisible(False)
 
-        sec = Section("Workload Calendar (14-Day)", "Travel and onsite schedule by assigned resource.", "🗓")
+        sec = Section("Workload Calendar", "Travel and onsite schedule by assigned resource.", "🗓")
 
         legend = QHBoxLayout()
         legend.addWidget(QLabel("Legend:"))
-        legend.addWidget(self._legend_chip("Travel", "#d9e8ff"))
-        legend.addWidget(self._legend_chip("Onsite", "#d7f4df"))
+        legend.addWidget(self._legend_chip("Travel", DAY_COLORS[TRAVEL]))
+        legend.addWidget(self._legend_chip("Onsite", DAY_COLORS[ONSITE]))
         legend.addStretch(1)
         sec.content_layout.addLayout(legend)
 
-        headers = ["Resource", "Group"] + [f"D{i}" for i in range(1, 15)]
-        self.tbl_calendar = QTableWidget(0, len(headers))
-        self.tbl_calendar.setHorizontalHeaderLabels(headers)
+        # Any horizon and crew size: cells come from the schedule's intervals and only the
+        # visible ones are painted; fixed sizes keep the view from measuring every cell.
+        self.tbl_calendar = QTableView()
+        self.tbl_calendar.setModel(CalendarModel(self.tbl_calendar))
+        self.tbl_calendar.setItemDelegate(CalendarDelegate(self.tbl_calendar))
         self.tbl_calendar.verticalHeader().setVisible(False)
+        self.tbl_calendar.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.tbl_calendar.verticalHeader().setDefaultSectionSize(TABLE_ROW_HEIGHT)
+        hdr = self.tbl_calendar.horizontalHeader()
+        hdr.setSectionResizeMode(QHeaderView.Fixed)
+        hdr.setDefaultSectionSize(CALENDAR_DAY_WIDTH)
+        hdr.setStretchLastSection(False)
+        self.tbl_calendar.model().modelReset.connect(self._size_calendar_columns)
+        self._size_calendar_columns()
         self.tbl_calendar.setAlternatingRowColors(True)
+        self.tbl_calendar.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.tbl_calendar.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
         sec.content_layout.addWidget(self.tbl_calendar)
 
         self.right_content.layout().insertWidget(1, sec)
 
+    def _size_calendar_columns(self):
+        hdr = self.tbl_calendar.horizontalHeader()
+        hdr.resizeSection(0, 180)
+        hdr.resizeSection(1, 80)
+
     def _legend_chip(self, text: str, color: str) -> QFrame:
         f = QFrame()
         r = QHBoxLayout(f)
@@ -94,148 +168,98 @@ class CTOMainWindow(PCPMainWindow):
             self.tbl_breakdown: [0, 2, 3],
             self.tbl_labor: [0, 1],
             self.tbl_exp: [0, 1],
-            self.tbl_calendar: [0, 1],
         }
         for tbl, stretch_cols in stretch_indices.items():
             hdr = tbl.horizontalHeader()
-            for c in range(tbl.columnCount()):
+            for c in range(tbl.model().columnCount()):
                 mode = hdr.ResizeMode.Stretch if c in stretch_cols else hdr.ResizeMode.ResizeToContents
                 hdr.setSectionResizeMode(c, mode)
 
         # Right align monetary headers
-        self.tbl_labor.horizontalHeaderItem(4).setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        self.tbl_exp.horizontalHeaderItem(2).setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.tbl_labor.model().set_header_alignment(4, Qt.AlignRight | Qt.AlignVCenter)
+        self.tbl_exp.model().set_header_alignment(2, Qt.AlignRight | Qt.AlignVCenter)
 
     def calc(self):
         tech, eng, exp_lines, meta = super().calc()
 
-        # Group/isolated ordering for RPC models.
-        meta["machine_rows"] = sorted(meta["machine_rows"], key=lambda r: (0 if not self._is_rpc(r["model"]) else 1, r["model"]))
-        meta["assignments"] = sorted(meta["assignments"], key=lambda a: (0 if not self._is_rpc(a.model) else 1, a.model, a.role, a.person_num))
+        # Group/isolated ordering for RPC models; within each, models that can share
+        # qualified technicians sit next to each other.
+        tech_groups = [g["models"] for g in meta.get("crew_groups", []) if g["role"] == "Technician"]
+        group_rank = {m: i for i, models in enumerate(tech_groups) for m in models}
+
+        def model_key(model):
+            return (0 if not self._is_rpc(model) else 1, group_rank.get(model, len(tech_groups)), model)
+
+        meta["machine_rows"] = sorted(meta["machine_rows"], key=lambda r: model_key(r["model"]))
+        # Shared people sort with the first of their models in this order.
+        meta["assignments"] = sorted(
+            meta["assignments"], key=lambda a: (*min(model_key(m) for m in a.models), a.role, a.person_num)
+        )
         return tech, eng, exp_lines, meta
 
+    def workload_schedule(self, assignments: List[Assignment]) -> WorkloadSchedule:
+        return schedule_assignments(assignments, lambda model: "RPC" if self._is_rpc(model) else "Non-RPC")
+
+    @traced("recalc.calendar")
     def _render_calendar(self, assignments: List[Assignment]):
-        self.tbl_calendar.setRowCount(len(assignments))
-
-        travel_color = QColor("#d9e8ff")
-        onsite_color = QColor("#d7f4df")
-
-        for r, a in enumerate(assignments):
-            label = f"{a.role[:1]}{a.person_num} - {a.model}"
-            group = "RPC" if self._is_rpc(a.model) else "Non-RPC"
-            self.tbl_calendar.setItem(r, 0, QTableWidgetItem(label))
-            self.tbl_calendar.setItem(r, 1, QTableWidgetItem(group))
-
-            travel_in = 1 if (a.role == "Engineer" and a.model in {"RPC-PH", "RPC-OU"}) else 0
-            onsite_start = travel_in + 1
-            onsite_end = min(onsite_start + int(a.onsite_days) - 1, 12)
-            travel_out = onsite_end + 1
-
-            for d in range(14):
-                cell = QTableWidgetItem("")
-                if d == travel_in or d == travel_out:
-                    cell.setBackground(travel_color)
-                    cell.setText("T")
-                elif onsite_start <= d <= onsite_end:
-                    cell.setBackground(onsite_color)
-                    cell.setText("O")
-                cell.setTextAlignment(Qt.AlignCenter)
-                self.tbl_calendar.setItem(r, d + 2, cell)
+        self.tbl_calendar.model().set_schedule(self.workload_schedule(assignments))
+
+    def reset_views(self):
+        super().reset_views()
+        if hasattr(self, "tbl_calendar"):  # the base __init__ resets before the calendar exists
+            self._render_calendar([])
 
     def recalc(self):
         super().recalc()
-        try:
-            self._apply_cto_table_formatting()
-            assigns = self.calc()[3]["assignments"]
-            self._render_calendar(assigns)
-        except Exception:
-            pass
+        if self.last_quote is not None:  # the calendar shares the tables' pricing pass
+            self._render_calendar(self.last_quote[3]["assignments"])
 
     def build_quote_html(self, tech: RoleTotals, eng: RoleTotals, exp_lines: List[ExpenseLine], meta: dict) -> str:
-        today = date.today()
-        validity = today + timedelta(days=30)
-        date_str = f"{today:%B} {today.day}, {today:%Y}"
-        valid_str = f"{validity:%B} {validity.day}, {validity:%Y}"
-
-        logo_html = ""
-        if LOGO_PATH.exists():
-            try:
-                logo_html = f'<img src="data:image/png;base64,{base64.b64encode(LOGO_PATH.read_bytes()).decode("ascii")}" height="36" />'
-            except Exception:
-                logo_html = ""
-
-        machine_rows = []
-        for r in meta["machine_rows"]:
-            machine_rows.append(
-                f"<tr><td>{r['model']}</td><td style='text-align:center'>{r['qty']}</td>"
-                f"<td>{r['tech_total']}</td><td style='text-align:center'>{r['eng_total'] if r['eng_total'] else '—'}</td>"
-                f"<td style='text-align:center'>{r['tech_headcount'] if r['tech_headcount'] else '—'}</td>"
-                f"<td style='text-align:center'>{r['eng_headcount'] if r['eng_headcount'] else '—'}</td></tr>"
-            )
-
-        labor_sub = tech.labor_cost + eng.labor_cost
-        exp_rows = "".join(
-            [f"<tr><td>{e.description}</td><td>{e.details}</td><td class='right'>{money(e.extended)}</td></tr>" for e in exp_lines]
-        )
+        date_str, valid_str = quote_dates()
+        machine_rows = [
+            f"<tr><td>{r['model']}</td><td style='text-align:center'>{r['qty']}</td>"
+            f"<td>{r['tech_total']}</td><td style='text-align:center'>{r['eng_total'] if r['eng_total'] else '—'}</td>"
+            f"<td style='text-align:center'>{r['tech_headcount'] if r['tech_headcount'] else '—'}</td>"
+            f"<td style='text-align:center'>{r['eng_headcount'] if r['eng_headcount'] else '—'}</td></tr>"
+            for r in meta["machine_rows"]
+        ]
+        exp_rows = [
+            f"<tr><td>{e.description}</td><td>{e.details}</td><td class='right'>{money(e.extended)}</td></tr>" for e in exp_lines
+        ]
 
         req_html = ""
         if self.data.requirements:
             req_html = "<h3>Requirements & Assumptions</h3><ul>" + "".join([f"<li>{x}</li>" for x in self.data.requirements]) + "</ul>"
 
-        # Print calendar with legend
-        cal_rows = []
-        for a in meta["assignments"]:
-            travel_in = 1 if (a.role == "Engineer" and a.model in {"RPC-PH", "RPC-OU"}) else 0
-            onsite_start = travel_in + 1
-            onsite_end = min(onsite_start + int(a.onsite_days) - 1, 12)
-            travel_out = onsite_end + 1
-            row_cells = []
-            for d in range(14):
-                cls = ""
-                txt = ""
-                if d == travel_in or d == travel_out:
-                    cls, txt = "travel", "T"
-                elif onsite_start <= d <= onsite_end:
-                    cls, txt = "onsite", "O"
-                row_cells.append(f"<td class='{cls}'>{txt}</td>")
-            group = "RPC" if self._is_rpc(a.model) else "Non-RPC"
-            cal_rows.append(f"<tr><td>{a.role[:1]}{a.person_num}-{a.model}</td><td>{group}</td>{''.join(row_cells)}</tr>")
+        # Printed from the same schedule the on-screen calendar shows
+        schedule = self.workload_schedule(meta["assignments"])
 
         q = lambda key: self.quote_fields[key].text().strip() or "—"
 
-        return f"""<html><head><meta charset='utf-8'/><style>
-            body {{ font-family: Arial, Helvetica, sans-serif; font-size:10pt; color:#0F172A; }}
-            .topbar {{ display:flex; justify-content:space-between; border-bottom:3px solid #F05A28; padding-bottom:10px; margin-bottom:14px; }}
-            .band {{ width:100%; background:#eaf0f4; padding:10px; margin:10px 0 14px 0; box-sizing:border-box; }}
-            .two {{ display:table; width:100%; }} .two > div {{ display:table-cell; width:50%; vertical-align:top; padding-right:10px; }}
-            .grid {{ width:100%; border-collapse:collapse; margin-top:10px; table-layout:fixed; }}
-            .grid th {{ background:#343551; color:white; text-align:left; padding:8px; }} .grid td {{ padding:7px; border-bottom:1px solid #E2E8F0; }}
-            .right {{ text-align:right; }} h3 {{ color:#4c4b4c; margin:16px 0 8px 0; }}
-            .travel {{ background:#d9e8ff; text-align:center; }} .onsite {{ background:#d7f4df; text-align:center; }}
-            .legend span {{ display:inline-block; padding:2px 8px; margin-right:8px; border:1px solid #9aa4b2; }}
-        </style></head><body>
-        <div class='topbar'><div><p style='margin:0;font-size:18pt;font-weight:800;color:#4c4b4c;'>Commissioning Budget Quote</p><p style='margin:4px 0 0 0;color:#6D6E71;'>Service Estimate</p></div><div>{logo_html}</div></div>
-
-        <table class='grid'><tr><th>Customer Name</th><th>Reference</th><th>Submitted to</th><th>Prepared By</th></tr>
-        <tr><td>{q('Customer Name')}</td><td>{q('Reference')}</td><td>{q('Submitted to')}</td><td>{q('Prepared By')}</td></tr></table>
-
-        <div class='band'><div class='two'><div><b>DATE</b><br/>{date_str}<br/><br/><b>TOTAL PERSONNEL</b><br/>{tech.headcount + eng.headcount} ({tech.headcount} Tech, {eng.headcount} Eng)</div>
-        <div><b>QUOTE VALIDITY</b><br/>{valid_str}<br/><br/><b>ESTIMATED DURATION</b><br/>{meta['max_onsite']} days onsite + {TRAVEL_DAYS_PER_PERSON} travel days</div></div></div>
-
-        <h3>Workload Calendar (14-Day)</h3>
-        <div class='legend'><span class='travel'>Travel (T)</span><span class='onsite'>Onsite (O)</span></div>
-        <table class='grid'><tr><th style='width:18%'>Resource</th><th style='width:8%'>Group</th>{''.join([f'<th>D{i}</th>' for i in range(1,15)])}</tr>{''.join(cal_rows)}</table>
-
-        <h3>Machine Breakdown</h3><table class='grid'><tr><th style='width:26%'>Model</th><th style='width:8%;text-align:center;'>Qty</th><th style='width:22%'>Tech Days</th><th style='width:12%;text-align:center;'>Eng Days</th><th style='width:16%;text-align:center;'>Technicians</th><th style='width:16%;text-align:center;'>Engineers</th></tr>{''.join(machine_rows)}</table>
-
-        <h3>Labor Costs</h3><table class='grid'><tr><th style='width:78%'>Item</th><th class='right' style='width:22%'>Extended</th></tr>
-        <tr><td>Tech. Regular Time ({tech.total_onsite_days} days × {money(tech.day_rate)}/day)</td><td class='right'>{money(tech.labor_cost)}</td></tr>
-        <tr><td>Eng. Regular Time ({eng.total_onsite_days} days × {money(eng.day_rate)}/day)</td><td class='right'>{money(eng.labor_cost)}</td></tr>
-        <tr><td><b>Labor Subtotal</b></td><td class='right'><b>{money(labor_sub)}</b></td></tr></table>
-
-        <h3>Estimated Expenses</h3><table class='grid'><tr><th style='width:28%'>Expense</th><th style='width:52%'>Details</th><th class='right' style='width:20%'>Amount</th></tr>{exp_rows}
-        <tr><td><b>Expenses Subtotal</b></td><td>—</td><td class='right'><b>{money(meta['exp_total'])}</b></td></tr></table>
-
-        <h3>Estimated Total</h3><div style='background:#eaf0f4;padding:10px;'><b style='font-size:16pt'>{money(meta['grand_total'])}</b></div>
-        {req_html}
-        </body></html>"""
+        return CTO_QUOTE_TEMPLATE.render(
+            logo_html=logo_img(LOGO_PATH, style=False),
+            customer=q("Customer Name"),
+            reference=q("Reference"),
+            submitted_to=q("Submitted to"),
+            prepared_by=q("Prepared By"),
+            date_str=date_str,
+            valid_str=valid_str,
+            headcount=tech.headcount + eng.headcount,
+            tech_headcount=tech.headcount,
+            eng_headcount=eng.headcount,
+            max_onsite=meta["max_onsite"],
+            horizon=schedule.horizon,
+            calendar=schedule.html_table(),
+            machine_rows="".join(machine_rows),
+            tech_days=tech.total_onsite_days,
+            tech_day_rate=money(tech.day_rate),
+            tech_labor=money(tech.labor_cost),
+            eng_days=eng.total_onsite_days,
+            eng_day_rate=money(eng.day_rate),
+            eng_labor=money(eng.labor_cost),
+            labor_sub=money(tech.labor_cost + eng.labor_cost),
+            exp_rows="".join(exp_rows),
+            exp_total=money(meta["exp_total"]),
+            grand_total=money(meta["grand_total"]),
+            req_html=req_html,
+        )
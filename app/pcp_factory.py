@@ -1,11 +1,29 @@
+"""Locate the newest versioned PCP module and build its main window.
+
+The module is resolved and executed once per process; every window after the
+first reuses it. Its compiled bytecode is kept next to the workbook snapshots,
+keyed by the source's SHA-256, so later runs (including frozen builds, whose
+extracted files get new paths and mtimes each launch) skip compiling it.
+"""
+
 from __future__ import annotations
 
 import hashlib
 import importlib.util
+import logging
+import marshal
 import os
 import re
 import sys
+import tempfile
+import time
 from pathlib import Path
+from types import CodeType, ModuleType
+
+from core.snapshot import snapshot_dir
+
+
+log = logging.getLogger(__name__)
 
 
 _VERSIONED_PCP_FILE = re.compile(r"^pcp_v(\d+)(?:_(\d+))?\.py$", re.IGNORECASE)
@@ -66,25 +84,114 @@ def _find_latest_pcp_module_file() -> Path:
     )
 
 
-def _load_module_from_file(module_path: Path):
-    digest = hashlib.sha1(str(module_path).encode("utf-8")).hexdigest()[:12]
-    unique_name = f"commissionpro_runtime_{module_path.stem}_{digest}"
+def _bytecode_file(module_path: Path, digest: bytes) -> Path:
+    return snapshot_dir() / "bytecode" / f"{module_path.stem}-{digest.hex()[:16]}.pyc"
+
+
+def _load_bytecode(cache_file: Path, digest: bytes) -> CodeType | None:
+    """The cached code object, or None when missing, from another Python, or not for this source."""
+    header = importlib.util.MAGIC_NUMBER + digest
+    try:
+        blob = cache_file.read_bytes()
+        if not blob.startswith(header):
+            return None
+        code = marshal.loads(blob[len(header):])
+    except Exception:
+        return None
+    return code if isinstance(code, CodeType) else None
+
+
+def _save_bytecode(cache_file: Path, digest: bytes, code: CodeType) -> None:
+    """Write the cache entry atomically; failures are ignored (the cache is best-effort)."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=cache_file.stem, suffix=".tmp", dir=str(cache_file.parent))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(importlib.util.MAGIC_NUMBER + digest + marshal.dumps(code))
+            os.replace(tmp, cache_file)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+    except Exception:
+        pass
+
+
+def _compile_module(module_path: Path) -> tuple[CodeType, str, bool]:
+    """Code object for `module_path`, its SHA-256 and whether it came from the bytecode cache."""
+    source = module_path.read_bytes()
+    digest = hashlib.sha256(source).digest()
+    cache_file = _bytecode_file(module_path, digest)
+    code = _load_bytecode(cache_file, digest)
+    if code is not None:
+        return code, digest.hex(), True
+    code = compile(source, str(module_path), "exec", dont_inherit=True)
+    _save_bytecode(cache_file, digest, code)
+    return code, digest.hex(), False
+
+
+def _load_module_from_file(module_path: Path) -> ModuleType:
+    """Execute `module_path` as a fresh module (load_pcp_module caches the result)."""
+    path_digest = hashlib.sha1(str(module_path).encode("utf-8")).hexdigest()[:12]
+    unique_name = f"commissionpro_runtime_{module_path.stem}_{path_digest}"
     spec = importlib.util.spec_from_file_location(unique_name, str(module_path))
     if spec is None or spec.loader is None:
         raise RuntimeError(f"Failed to create module spec for {module_path}")
 
+    code, sha256, cached = _compile_module(module_path)
     module = importlib.util.module_from_spec(spec)
+    module.__cached__ = None
+    module.__pcp_sha256__ = sha256
+    module.__pcp_bytecode_cached__ = cached
     sys.modules[unique_name] = module
-    spec.loader.exec_module(module)
+    try:
+        exec(code, module.__dict__)
+    except BaseException:
+        sys.modules.pop(unique_name, None)
+        raise
     return module
 
 
-def create_pcp_main_window():
-    module_file = _find_latest_pcp_module_file()
+# Resolved module file per COMMISSION_PRO_PATH value, and executed modules per file.
+_RESOLVED: dict[str, Path] = {}
+_MODULES: dict[Path, ModuleType] = {}
+
+
+def load_pcp_module() -> ModuleType:
+    """The newest PCP module, resolved and executed on the first call only."""
+    t0 = time.perf_counter()
+    env = os.environ.get("COMMISSION_PRO_PATH", "").strip()
+    module_file = _RESOLVED.get(env)
+    if module_file is None:
+        module_file = _RESOLVED[env] = _find_latest_pcp_module_file()
+    module = _MODULES.get(module_file)
+    if module is not None:
+        return module
+    t1 = time.perf_counter()
     module = _load_module_from_file(module_file)
+    t2 = time.perf_counter()
+    _MODULES[module_file] = module
+    log.info(
+        "Loaded PCP module %s (version %d.%d, sha256 %s, %s) - discovery %.1f ms, load %.1f ms",
+        module_file, *_version_key(module_file), module.__pcp_sha256__[:12],
+        "cached bytecode" if module.__pcp_bytecode_cached__ else "compiled from source",
+        (t1 - t0) * 1000.0, (t2 - t1) * 1000.0,
+    )
+    return module
+
+
+def get_pcp_main_window_class():
+    module = load_pcp_module()
     pcp_cls = getattr(module, "PCPMainWindow", None) or getattr(module, "MainWindow", None)
     if pcp_cls is None:
         raise RuntimeError(
-            f"{module_file} loaded but did not expose PCPMainWindow/MainWindow class."
+            f"{module.__file__} loaded but did not expose PCPMainWindow/MainWindow class."
         )
-    return pcp_cls()
+    return pcp_cls
+
+
+def create_pcp_main_window():
+    return get_pcp_main_window_class()()
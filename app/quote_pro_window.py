@@ -1,28 +1,126 @@
-from PySide6.QtWidgets import QMainWindow, QTabWidget
+import os
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QLabel, QMainWindow, QMessageBox, QTabWidget, QWidget
 
 from app.pcp_factory import create_pcp_main_window
 
 
 APP_TITLE = "Pearson Quote Pro"
+TAB_TITLES = ("CTO", "ETO", "Reactive")
+# Tabs left idle this long save their quote and release their widgets; 0 turns hibernation off.
+HIBERNATE_AFTER_MS = 10 * 60 * 1000
+
+
+def hibernate_after_ms() -> int:
+    """Idle period before a tab hibernates (QUOTE_PRO_HIBERNATE_SECONDS overrides it)."""
+    env = os.environ.get("QUOTE_PRO_HIBERNATE_SECONDS", "").strip()
+    try:
+        return int(float(env) * 1000) if env else HIBERNATE_AFTER_MS
+    except ValueError:
+        return HIBERNATE_AFTER_MS
 
 
 class QuoteProWindow(QMainWindow):
-    """Host three identical PCP windows for CTO, ETO, and Reactive tabs."""
+    """Host PCP windows for the CTO, ETO, and Reactive tabs.
+
+    The shell (tab bar + placeholders) is shown immediately. A tab's PCP window is built
+    the first time the tab is shown (the current tab on the first event-loop turn), and
+    fills in its workbook data when the background load ends. Tabs left idle for
+    `idle_ms` hibernate: their quote is kept as plain values and the window is
+    destroyed, to be rebuilt with that quote when the tab is shown again.
+    """
 
-    def __init__(self):
+    def __init__(self, idle_ms: int | None = None):
         super().__init__()
         self.setWindowTitle(APP_TITLE)
         self.resize(1400, 900)
+        self.idle_ms = hibernate_after_ms() if idle_ms is None else idle_ms
 
         self.tabs = QTabWidget()
         self.tabs.setDocumentMode(True)
 
-        self._pcp_cto = create_pcp_main_window()
-        self._pcp_eto = create_pcp_main_window()
-        self._pcp_rx = create_pcp_main_window()
-
-        self.tabs.addTab(self._pcp_cto, "CTO")
-        self.tabs.addTab(self._pcp_eto, "ETO")
-        self.tabs.addTab(self._pcp_rx, "Reactive")
+        self._pages: list[QWidget | None] = [None] * len(TAB_TITLES)
+        self._saved: list[dict | None] = [None] * len(TAB_TITLES)
+        self._idle_timers: list[QTimer] = []
+        for i, title in enumerate(TAB_TITLES):
+            self.tabs.addTab(self._placeholder(f"Loading {title}…"), title)
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda i=i: self.hibernate_tab(i))
+            self._idle_timers.append(timer)
 
         self.setCentralWidget(self.tabs)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        QTimer.singleShot(0, self._build_tabs)
+
+    @staticmethod
+    def _placeholder(text: str) -> QLabel:
+        placeholder = QLabel(text)
+        placeholder.setAlignment(Qt.AlignCenter)
+        placeholder.setWordWrap(True)
+        return placeholder
+
+    def page(self, index: int) -> QWidget | None:
+        """The tab's PCP window, or None while it is unbuilt or hibernating."""
+        return self._pages[index]
+
+    def _build_tabs(self):
+        self._on_tab_changed(self.tabs.currentIndex())
+
+    def _on_tab_changed(self, index: int):
+        if index < 0:
+            return
+        self._build_tab(index)
+        for i, timer in enumerate(self._idle_timers):
+            if i == index or self._pages[i] is None:
+                timer.stop()
+            elif self.idle_ms > 0 and not timer.isActive():
+                timer.start(self.idle_ms)
+
+    def _build_tab(self, index: int):
+        if self._pages[index] is not None:
+            return
+        try:
+            w = create_pcp_main_window()
+        except Exception as e:
+            # Raised from a timer slot, so it would otherwise leave the placeholders up forever.
+            self._show_build_error(e)
+            return
+        self._replace_page(index, w)
+        self._pages[index] = w
+        if self._saved[index] is not None:  # restored once on screen, like any other edit
+            w.restore_quote_state(self._saved[index])
+            self._saved[index] = None
+
+    def hibernate_tab(self, index: int):
+        """Keep the tab's quote as plain values and destroy its window (no-op for the current tab)."""
+        w = self._pages[index]
+        if w is None or index == self.tabs.currentIndex():
+            return
+        self._saved[index] = w.quote_state()
+        self._pages[index] = None
+        self._replace_page(index, self._placeholder(f"{TAB_TITLES[index]} was paused while idle; it reopens with your quote."))
+        w.release_workbook()
+        w.deleteLater()
+
+    def _replace_page(self, index: int, widget: QWidget):
+        current = self.tabs.currentIndex()
+        old = self.tabs.widget(index)
+        self.tabs.blockSignals(True)  # swapping pages must not look like the user changing tabs
+        try:
+            self.tabs.removeTab(index)
+            self.tabs.insertTab(index, widget, TAB_TITLES[index])
+            self.tabs.setCurrentIndex(current)
+        finally:
+            self.tabs.blockSignals(False)
+        if isinstance(old, QLabel):
+            old.deleteLater()
+
+    def _show_build_error(self, error: Exception):
+        message = str(error) or type(error).__name__
+        for i in range(self.tabs.count()):
+            placeholder = self.tabs.widget(i)
+            if isinstance(placeholder, QLabel):
+                placeholder.setText(f"{self.tabs.tabText(i)} is unavailable.\n\n{message}")
+        QMessageBox.critical(self, APP_TITLE, f"Could not open the quoting tabs.\n\n{message}")
@@ -8,6 +8,7 @@ from PySide6.QtWidgets import (
     QFrame, QHBoxLayout, QLabel, QComboBox, QSpinBox, QPushButton, QSizePolicy
 )
 
+from core.pricing import RateCard, money, price_resources
 from legacy_pcp.pcp_v1_1 import MainWindow as PCPMainWindow
 
 
@@ -93,8 +94,9 @@ class ReactiveMainWindow(PCPMainWindow):
     - Training note hidden (not applicable)
 
     For now:
-    - We do NOT run PCP commissioning math. We compute and display basic totals in the cards only.
-    - Reactive day length is fixed at 10 hours/day (used later in pricing math).
+    - We do NOT run PCP commissioning math: each line is priced as one person through
+      core.pricing.price_resources and only the cards and total are shown.
+    - Reactive day length is fixed at 10 hours/day.
     """
     reactive_hours_per_day = 10
 
@@ -158,7 +160,7 @@ class ReactiveMainWindow(PCPMainWindow):
         if getattr(self, "empty_hint", None) is not None:
             self.empty_hint.hide()
 
-        ln = ResourceLine(on_change=self.recalc, on_delete=self.delete_line)
+        ln = ResourceLine(on_change=self.schedule_recalc, on_delete=self.delete_line)
         self.lines.append(ln)
         self.lines_layout.addWidget(ln)
         self.recalc()
@@ -178,37 +180,49 @@ class ReactiveMainWindow(PCPMainWindow):
         else:
             self.recalc()
 
-    # --- Reactive recalc (inputs only, no pricing yet) ---
+    # ResourceLine rows have no model picker, so workbook changes leave them alone.
+    def _refresh_line_models(self):
+        pass
+
+    def _apply_workbook_diff(self, diff, old):
+        pass
+
+    # --- Reactive recalc (resource lines priced directly, no commissioning logic) ---
 
     def recalc(self, *_):  # override PCP recalc to avoid commissioning logic
-        tech_count = 0
-        eng_count = 0
-        tech_days = 0
-        eng_days = 0
-
-        for ln in getattr(self, "lines", []):
-            if not hasattr(ln, "value"):
-                continue
-            v = ln.value()
-            if v.resource_type == "Technician":
-                tech_count += 1
-                tech_days += int(v.onsite_days)
-            else:
-                eng_count += 1
-                eng_days += int(v.onsite_days)
+        people = [
+            (v.resource_type, int(v.onsite_days))
+            for v in (ln.value() for ln in getattr(self, "lines", []) if hasattr(ln, "value"))
+        ]
+        tech_days = sum(d for role, d in people if role == "Technician")
+        eng_days = sum(d for role, d in people if role != "Technician")
 
         # Update PCP cards (keep the same UI components)
         if hasattr(self, "card_tech"):
-            self.card_tech.set_value(str(tech_count), f"{tech_days} total days")
+            self.card_tech.set_value(str(sum(1 for role, _ in people if role == "Technician")), f"{tech_days} total days")
         if hasattr(self, "card_eng"):
-            self.card_eng.set_value(str(eng_count), f"{eng_days} total days")
+            self.card_eng.set_value(str(sum(1 for role, _ in people if role != "Technician")), f"{eng_days} total days")
 
         # Hide / neutralize install window card
         if hasattr(self, "card_window"):
             self.card_window.set_value("—", "Reactive uses 10-hr days")
 
-        # Keep totals elsewhere at zero for now; we’ll wire pricing/output later.
-        # The rest of the PCP UI will still display, but this prevents crashes.
+        # The rest of the PCP UI still displays; only the total is wired to pricing so far.
+        total = "—"
+        if hasattr(self, "alert"):
+            self.alert.hide()
+        if people and getattr(self, "data", None) is not None:
+            try:
+                quote = price_resources(people, RateCard.from_lookup(self.data.get_rate), self.reactive_hours_per_day)
+                total = money(quote.meta["grand_total"])
+            except Exception as e:
+                # Shown like PCP recalc failures (e.g. a rate missing from the workbook), not as an empty total.
+                self.alert.setText(str(e))
+                self.alert.show()
+        if hasattr(self, "card_total"):
+            self.card_total.set_value(total, "labor + expenses")
+        if hasattr(self, "lbl_total_val"):
+            self.lbl_total_val.setText(total)
 
     def _reset_reactive_views(self):
         if hasattr(self, "card_tech"):
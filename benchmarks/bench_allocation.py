@@ -0,0 +1,58 @@
+"""Allocation micro-benchmarks (balanced_allocate / chunk_allocate_by_machine).
+
+Run from the repo root:
+    python -m benchmarks.bench_allocation [--repeat N]
+
+Each case prints the median time per call; compare runs before and after a change
+to catch regressions in the allocation inner loop.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+
+BALANCED_CASES = [(d, h) for d in (10, 100, 1_000, 10_000) for h in (1, 10, 100, 500)]
+
+CHUNK_CASES = [
+    # (install days per machine, qty, training days, window)
+    (3, 10, 4, 7),
+    (3, 999, 333, 14),
+    (1, 999, 333, 3),
+    (20, 500, 10_000, 14),  # install chunk larger than the window -> fallback
+    (0, 0, 10_000, 7),      # training only
+]
+
+
+def _per_call_us(fn, args, repeat: int, inner: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(inner):
+            fn(*args)
+        samples.append((time.perf_counter() - t0) / inner * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--inner", type=int, default=200)
+    args = ap.parse_args()
+
+    from core.allocation import balanced_allocate, chunk_allocate_by_machine
+
+    print("balanced_allocate(total_days, headcount)")
+    for case in BALANCED_CASES:
+        print(f"  {str(case):>14}  {_per_call_us(balanced_allocate, case, args.repeat, args.inner):9.2f} µs")
+
+    print("chunk_allocate_by_machine(install, qty, training, window)")
+    for case in CHUNK_CASES:
+        print(f"  {str(case):>22}  {_per_call_us(chunk_allocate_by_machine, case, args.repeat, args.inner):9.2f} µs")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+"""Headless pricing throughput (core.pricing.price_quote, no Qt).
+
+Run from the repo root:
+    python -m benchmarks.bench_pricing [--quotes N] [--lines N]
+
+Prices random quotes against the bundled workbook's models and rates and prints
+quotes per second plus the engine's import time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--quotes", type=int, default=5000)
+    ap.add_argument("--lines", type=int, default=5)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    from core.pricing import LineSelection, RateCard, price_quote
+    print(f"import core.pricing: {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+    import os
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from legacy_pcp.pcp_v1_1 import DEFAULT_EXCEL, ExcelData
+
+    data = ExcelData(DEFAULT_EXCEL)
+    rates = RateCard.from_lookup(data.get_rate)
+    rng = random.Random(0)
+    models = [m for m, info in data.models.items() if info.tech_install_days_per_machine + 1 <= 14]
+    quotes = [
+        [LineSelection(rng.choice(models), rng.randint(1, 30), rng.random() < 0.8) for _ in range(args.lines)]
+        for _ in range(args.quotes)
+    ]
+
+    t0 = time.perf_counter()
+    for q in quotes:
+        price_quote(q, 14, data.models, rates)
+    dt = time.perf_counter() - t0
+    print(f"price_quote ({args.lines} lines, window 14): {args.quotes / dt:,.0f} quotes/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
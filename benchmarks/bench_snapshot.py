@@ -0,0 +1,63 @@
+"""Warm vs cold ExcelData load benchmark.
+
+Run from the repo root:
+    python -m benchmarks.bench_snapshot [path/to/workbook.xlsx] [--repeat N]
+
+Cold loads delete the rates and qualifications snapshots first (full openpyxl
+parse + snapshot writes); warm loads hit the snapshots written by the previous
+cold load.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+
+def _time_ms(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def main() -> int:
+    repo = Path(__file__).resolve().parents[1]
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("workbook", nargs="?", default=str(repo / "assets" / "Tech days and quote rates.xlsx"))
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="quotepro_bench_") as cache:
+        os.environ["QUOTE_PRO_CACHE_DIR"] = cache
+
+        from core.qualifications import QUALIFICATIONS_SNAPSHOT_KIND
+        from core.snapshot import clear_snapshot
+        from legacy_pcp.pcp_v1_1 import EXCEL_SNAPSHOT_KIND, ExcelData, resolve_qualifications_path
+
+        path = Path(args.workbook)
+        quals = resolve_qualifications_path(path)
+
+        def cold():
+            clear_snapshot(EXCEL_SNAPSHOT_KIND, path)
+            if quals is not None:
+                clear_snapshot(QUALIFICATIONS_SNAPSHOT_KIND, quals)
+            ExcelData(path)
+
+        cold_ms = [_time_ms(cold) for _ in range(args.repeat)]
+        warm_ms = [_time_ms(lambda: ExcelData(path)) for _ in range(args.repeat)]
+
+    cold_med = statistics.median(cold_ms)
+    warm_med = statistics.median(warm_ms)
+    print(f"workbook: {path}")
+    print(f"cold (parse + snapshot write): median {cold_med:8.2f} ms  min {min(cold_ms):8.2f} ms")
+    print(f"warm (snapshot hit):           median {warm_med:8.2f} ms  min {min(warm_ms):8.2f} ms")
+    print(f"speedup: {cold_med / warm_med if warm_med else float('inf'):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
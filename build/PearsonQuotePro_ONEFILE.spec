@@ -1,7 +1,9 @@
 # -*- mode: python ; coding: utf-8 -*-
 
 import os
+import sys
 from PyInstaller.building.build_main import Analysis, PYZ, EXE
+from PyInstaller.utils.hooks import collect_submodules
 
 block_cipher = None
 
@@ -21,6 +23,8 @@ def find_project_dir(start: str, max_up: int = 6) -> str:
 
 PROJECT_DIR = find_project_dir(cwd)
 ASSETS_DIR = os.path.join(PROJECT_DIR, "assets")
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)  # collect_submodules imports core/ui from here
 
 APP_NAME = "PearsonQuotePro"
 ICON_PATH = os.path.join(ASSETS_DIR, "PearsonP.ico")
@@ -38,14 +42,18 @@ a = Analysis(
     pathex=[PROJECT_DIR],
     binaries=[],
     datas=datas,
+    # The PCP module is exec'd from a file at runtime, so PyInstaller never sees its imports:
+    # list the packages and modules it pulls in (including ones imported on first use).
     hiddenimports=[
         "PySide6.QtSvg",
         "PySide6.QtXml",
+        "PySide6.QtPrintSupport",
+        "openpyxl",
         "app",
         "app.__init__",
         "app.quote_pro_window",
         "app.pcp_factory",
-    ],
+    ] + collect_submodules("core") + collect_submodules("ui"),
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
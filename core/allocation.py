@@ -0,0 +1,110 @@
+"""Per-model crew allocation: whole-machine install chunks plus 1-day training chunks.
+
+Pure functions of their integer inputs, so recalcs go through a bounded LRU cache
+that is shared by every tab (and every runtime copy of the PCP module).
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+from typing import Dict as TDict, List, Tuple
+
+
+def ceil_int(x: float) -> int:
+    return int(math.ceil(float(x)))
+
+
+def balanced_allocate(total_days: int, headcount: int) -> List[int]:
+    """Balance integer days to minimize the maximum assigned days.
+
+    Everyone gets total // headcount days and the remainder goes one extra day each,
+    which is what handing out single days to the least-loaded person converges to.
+    """
+    if headcount <= 0:
+        return []
+    base, rem = divmod(max(int(total_days), 0), headcount)
+    return [base + 1] * rem + [base] * (headcount - rem)
+
+
+
+
+def chunk_allocate_by_machine(install_days_per_machine: int, qty: int, training_days: int, window: int) -> List[int]:
+    """Allocate work using whole-machine install chunks + whole-day training chunks.
+
+    Install days are assigned per machine (no fractional splitting). Training days are 1-day chunks.
+    We choose the *minimum* headcount that keeps every person's onsite days <= window.
+
+    Training assignment heuristic:
+      - Prefer assigning training to the currently *most-loaded* person that can still accept a day
+        without exceeding the window (keeps extra people from traveling and mirrors reality).
+      - If none can accept, fall back to the least-loaded person (best-effort).
+    Returns a list of total onsite days per person (sorted descending).
+
+    The heuristic is evaluated in closed form: with machines split evenly, a headcount works iff
+    the busiest person's install days fit the window and the total slack can absorb the training
+    days, so the minimum headcount is the larger of the two bounds. Training then tops people up
+    to the window in descending-load order, exactly as the one-day-at-a-time greedy would.
+    """
+    install_days_per_machine = int(install_days_per_machine or 0)
+    qty = int(qty or 0)
+    training_days = int(training_days or 0)
+    window = int(window or 0)
+
+    if window <= 0:
+        return []
+    if qty <= 0 and training_days <= 0:
+        return []
+
+    # If there is no install work, allocate training only.
+    if qty <= 0 or install_days_per_machine <= 0:
+        headcount = ceil_int(training_days / window) if training_days > 0 else 0
+        loads = balanced_allocate(training_days, headcount) if headcount > 0 else []
+        return loads
+
+    machines_per_person = window // install_days_per_machine
+    if machines_per_person > 0:
+        headcount = max(
+            1,
+            -(-qty // machines_per_person),                                   # busiest person fits
+            -(-(qty * install_days_per_machine + training_days) // window),   # slack covers training
+        )
+        if headcount <= qty:  # at most one machine per person
+            base_n, rem = divmod(qty, headcount)
+            loads = [(base_n + 1) * install_days_per_machine] * rem + [base_n * install_days_per_machine] * (headcount - rem)
+            left = training_days
+            for i, d in enumerate(loads):
+                if left <= 0:
+                    break
+                add = min(window - d, left)
+                loads[i] = d + add
+                left -= add
+            loads.sort(reverse=True)
+            return loads
+
+    # Best-effort fallback (should generally be prevented by validation): one machine per
+    # person, training spread evenly on top.
+    return [install_days_per_machine + d for d in balanced_allocate(training_days, qty)]
+
+# Recalcs re-run the allocation for every line and role; most inputs repeat between edits.
+# Entries are keyed on every input, so they stay valid across workbook changes and are never invalidated.
+ALLOCATION_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=ALLOCATION_CACHE_SIZE)
+def _allocation_cached(install_days_per_machine: int, qty: int, training_days: int, window: int) -> Tuple[int, ...]:
+    return tuple(chunk_allocate_by_machine(install_days_per_machine, qty, training_days, window))
+
+
+def allocate_cached(install_days_per_machine: int, qty: int, training_days: int, window: int) -> List[int]:
+    """chunk_allocate_by_machine through a bounded LRU cache (the function is pure in its inputs)."""
+    return list(_allocation_cached(int(install_days_per_machine), int(qty), int(training_days), int(window)))
+
+
+def clear_allocation_cache():
+    _allocation_cached.cache_clear()
+
+
+def allocation_cache_stats() -> TDict[str, int]:
+    info = _allocation_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
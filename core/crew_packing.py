@@ -0,0 +1,239 @@
+"""Pack install and training days of several models onto one shared crew (per role).
+
+Each person is a bin of `window` onsite days. Install work comes in whole-machine
+chunks and training in 1-day chunks, and a person may only mix models that one
+qualified resource covers (the qualification bitmasks of everything in the bin
+still overlap). Labor is the same however the days are split, and expenses grow
+with headcount, so the packer minimises headcount.
+
+The search is a depth-first branch-and-bound over "fill this person with as many
+chunks of the next model as fit". Its first dive is best-fit decreasing, and the
+search stops at the lower bound or when the time budget runs out. The
+dedicated per-model allocation is the incumbent, so the result is never worse
+than today's pricing; when nothing beats it, that allocation is returned.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Sequence
+
+
+DEFAULT_TIME_BUDGET_S = 0.25
+
+
+@dataclass(frozen=True)
+class CrewDemand:
+    """One quote line's work for one role, with its dedicated (per-model) allocation."""
+    model: str
+    machines: int
+    days_per_machine: int
+    training_days: int
+    qualified: int                  # bitmask of resources qualified on the model (0: nobody listed)
+    dedicated: tuple[int, ...]      # onsite days per person when the model has its own crew
+
+
+@dataclass
+class CrewMember:
+    onsite_days: int
+    work: dict[str, int]            # model -> onsite days
+
+    @property
+    def label(self) -> str:
+        return " + ".join(self.work)
+
+
+@dataclass
+class PackResult:
+    crew: list[CrewMember]
+    lower_bound: int
+    dedicated_headcount: int
+    nodes: int
+    elapsed_s: float
+    timed_out: bool
+    used_fallback: bool             # crew is the dedicated per-model allocation
+
+    @property
+    def headcount(self) -> int:
+        return len(self.crew)
+
+    @property
+    def gap(self) -> int:
+        """People above the lower bound (0: proven optimal)."""
+        return self.headcount - self.lower_bound
+
+    @property
+    def optimal(self) -> bool:
+        return self.gap <= 0
+
+
+def dedicated_crew(demands: Sequence[CrewDemand]) -> list[CrewMember]:
+    return [CrewMember(d, {dm.model: d}) for dm in demands for d in dm.dedicated]
+
+
+def _merge(demands: Sequence[CrewDemand]) -> list[tuple[str, int, int, int, int]]:
+    """(model, machines, days_per_machine, training_days, qualified) per model, in first-seen order."""
+    merged: dict[str, list[int]] = {}
+    for d in demands:
+        row = merged.setdefault(d.model, [0, int(d.days_per_machine), 0, int(d.qualified)])
+        row[0] += int(d.machines)
+        row[2] += int(d.training_days)
+    return [(model, *row) for model, row in merged.items()]
+
+
+def lower_bound(demands: Sequence[CrewDemand], window: int) -> int:
+    """Headcount no packing can beat.
+
+    Models whose qualifications never overlap cannot share anyone, so the bound
+    adds up over connected groups of models. Within a group it takes the larger of
+    ceil(days / window) and the number of install chunks too big to pair up.
+    """
+    models = _merge(demands)
+    parent = list(range(len(models)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(models)):
+        for j in range(i + 1, len(models)):
+            if models[i][4] & models[j][4]:
+                parent[find(i)] = find(j)
+
+    days: dict[int, int] = {}
+    big: dict[int, int] = {}
+    for i, (_model, machines, per_machine, training, _q) in enumerate(models):
+        root = find(i)
+        days[root] = days.get(root, 0) + machines * per_machine + training
+        if per_machine * 2 > window:
+            big[root] = big.get(root, 0) + machines
+    return sum(max(-(-total // window), big.get(root, 0)) for root, total in days.items())
+
+
+def pack_crews(demands: Sequence[CrewDemand], window: int,
+               time_budget_s: float = DEFAULT_TIME_BUDGET_S) -> PackResult:
+    """Smallest shared crew found within the time budget (never more people than dedicated crews)."""
+    start = time.perf_counter()
+    deadline = start + max(time_budget_s, 0.0)
+    window = int(window)
+    fallback = dedicated_crew(demands)
+    lb = lower_bound(demands, window) if window > 0 else 0
+
+    # Chunks of one size per model; big chunks first, training (1 day) after install of the same size.
+    groups = []
+    for model, machines, per_machine, training, q in _merge(demands):
+        if machines > 0 and per_machine > 0:
+            groups.append((per_machine, 0, model, q, machines))
+        if training > 0:
+            groups.append((1, 1, model, q, training))
+    groups.sort(key=lambda g: (-g[0], g[1]))
+
+    if window <= 0 or any(size > window for size, *_ in groups) or len(fallback) <= lb:
+        return PackResult(fallback, lb, len(fallback), 0, time.perf_counter() - start, False, True)
+
+    load: list[int] = []
+    mask: list[int] = []
+    work: list[dict[str, int]] = []
+    best = len(fallback)
+    best_crew: list[CrewMember] | None = None
+    nodes = 0
+    timed_out = False
+
+    def candidates(gi: int) -> list[int]:
+        """Bins that can take a chunk of group `gi` (one per equivalent state), then -1 for new people."""
+        size, _t, model, q, _n = groups[gi]
+        seen = set()
+        own, other = [], []
+        for b in range(len(load)):
+            if window - load[b] < size:
+                continue
+            has = model in work[b]
+            if not has and not (mask[b] & q):
+                continue
+            sig = (load[b], mask[b], has, next(iter(work[b])) if not mask[b] else None)
+            if sig in seen:
+                continue
+            seen.add(sig)
+            (own if has else other).append(b)
+        own.sort(key=lambda b: -load[b])
+        other.sort(key=lambda b: -load[b])
+        return own + other + [-1]
+
+    def place(gi: int, left: int, b: int):
+        size, _t, model, q, _n = groups[gi]
+        if b < 0:
+            # New people are interchangeable: fill as many as the chunks need in one step.
+            per = window // size
+            n_new = max(1, left // per)
+            placed = min(left, n_new * per)
+            first = len(load)
+            for i in range(n_new):
+                k = min(per, placed - i * per)
+                load.append(k * size)
+                mask.append(q)
+                work.append({model: k * size})
+            return placed, ("new", first)
+        k = min(left, (window - load[b]) // size)
+        old_mask = mask[b]
+        if model not in work[b]:
+            mask[b] = old_mask & q
+        load[b] += k * size
+        work[b][model] = work[b].get(model, 0) + k * size
+        return k, ("bin", b, old_mask, k * size)
+
+    def undo(gi: int, rec):
+        if rec[0] == "new":
+            del load[rec[1]:], mask[rec[1]:], work[rec[1]:]
+            return
+        _kind, b, old_mask, days = rec
+        model = groups[gi][2]
+        load[b] -= days
+        work[b][model] -= days
+        if not work[b][model]:
+            del work[b][model]
+        mask[b] = old_mask
+
+    # Iterative DFS; a frame is [group, chunks left, candidate bins, next candidate, undo record].
+    stack = [[0, groups[0][4], None, 0, None]] if groups else []
+    while stack:
+        frame = stack[-1]
+        if frame[4] is not None:
+            undo(frame[0], frame[4])
+            frame[4] = None
+        nodes += 1
+        if (nodes & 63) == 0 and time.perf_counter() > deadline:
+            timed_out = True
+            break
+        gi, left = frame[0], frame[1]
+        if frame[2] is None:
+            if max(len(load), lb) >= best:
+                stack.pop()
+                continue
+            frame[2] = candidates(gi)
+        if frame[3] >= len(frame[2]):
+            stack.pop()
+            continue
+        b = frame[2][frame[3]]
+        frame[3] += 1
+        placed, frame[4] = place(gi, left, b)
+        left -= placed
+        if left == 0:
+            gi += 1
+            left = groups[gi][4] if gi < len(groups) else 0
+        if gi == len(groups):
+            if len(load) < best:
+                best = len(load)
+                best_crew = [CrewMember(d, dict(w)) for d, w in zip(load, work)]
+                if best <= lb:
+                    break
+            continue
+        stack.append([gi, left, None, 0, None])
+
+    elapsed = time.perf_counter() - start
+    if best_crew is None:
+        return PackResult(fallback, lb, len(fallback), nodes, elapsed, timed_out, True)
+    best_crew.sort(key=lambda m: -m.onsite_days)
+    return PackResult(best_crew, lb, len(fallback), nodes, elapsed, timed_out, False)
@@ -0,0 +1,89 @@
+"""Columnar (NumPy) view of the model sheet and batched per-line quantities."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import numpy as np
+
+
+class ModelTable:
+    """Install days, engineer days and training applicability as arrays indexed by model id."""
+
+    def __init__(self, models: dict[str, Any]):
+        self.names = list(models)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        infos = list(models.values())
+        self.install_days = np.array([m.tech_install_days_per_machine for m in infos], dtype=np.int64)
+        self.eng_days = np.array([m.eng_days_per_machine for m in infos], dtype=np.int64)
+        self.training_applicable = np.array([bool(m.training_applicable) for m in infos], dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def model_ids(self, names: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.ids[n] for n in names), dtype=np.int64)
+
+
+@dataclass
+class LineBatch:
+    """Per-line quantities for one quote, all arrays aligned with the selections."""
+    model_ids: np.ndarray
+    qty: np.ndarray
+    training_required: np.ndarray
+    install_days: np.ndarray
+    eng_days: np.ndarray
+    training_applicable: np.ndarray
+    base_training: np.ndarray
+    training_days: np.ndarray
+    eng_training_potential: np.ndarray
+    eng_training_days: np.ndarray
+    tech_total: np.ndarray
+    eng_total: np.ndarray
+    single_training: np.ndarray
+    single_eng_training: np.ndarray
+    tech_fits: np.ndarray
+    eng_fits: np.ndarray
+
+    def first_infeasible(self) -> int | None:
+        """Index of the first line that cannot fit one machine in the window, if any."""
+        bad = np.flatnonzero(~(self.tech_fits & self.eng_fits))
+        return int(bad[0]) if bad.size else None
+
+
+def compute_lines(table: ModelTable, models: list[str], qty: list[int], training_required: list[bool],
+                  window: int, machines_per_training_day: int) -> LineBatch:
+    """Training days, role totals and window feasibility for every line in one pass."""
+    ids = table.model_ids(models)
+    q = np.asarray(qty, dtype=np.int64)
+    req = np.asarray(training_required, dtype=bool)
+    install = table.install_days[ids]
+    eng = table.eng_days[ids]
+    applicable = table.training_applicable[ids]
+
+    base_training = np.where(applicable, -(-q // machines_per_training_day), 0)
+    training_days = np.where(req, base_training, 0)
+    eng_training_potential = np.where(eng > 0, base_training, 0)
+    eng_training_days = np.where(req, eng_training_potential, 0)
+    single_training = (req & applicable).astype(np.int64)
+    single_eng_training = (req & (eng > 0)).astype(np.int64)
+
+    return LineBatch(
+        model_ids=ids,
+        qty=q,
+        training_required=req,
+        install_days=install,
+        eng_days=eng,
+        training_applicable=applicable,
+        base_training=base_training,
+        training_days=training_days,
+        eng_training_potential=eng_training_potential,
+        eng_training_days=eng_training_days,
+        tech_total=install * q + training_days,
+        eng_total=eng * q + eng_training_days,
+        single_training=single_training,
+        single_eng_training=single_eng_training,
+        tech_fits=install + single_training <= window,
+        eng_fits=(eng <= 0) | (eng + single_eng_training <= window),
+    )
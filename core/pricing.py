@@ -0,0 +1,384 @@
+"""Quote pricing engine, independent of Qt and NumPy.
+
+`price_quote` takes plain line selections, the model sheet (anything with the
+ModelInfo attributes, keyed by model name) and a RateCard, and returns the role
+totals, expense lines and per-person assignments the windows display and print.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict as TDict, List, Mapping, Sequence, Tuple
+
+from core.allocation import allocate_cached
+from core.crew_packing import CrewDemand, PackResult, pack_crews
+
+
+# Business rules
+TRAINING_MACHINES_PER_DAY = 3  # 1 training day per 3 machines (ceil)
+TRAVEL_DAYS_PER_PERSON = 2  # travel-in + travel-out
+TRAVEL_HOURS_PER_PERSON = 16
+HOURS_PER_DAY = 8
+
+# Requested overrides
+OVERRIDE_AIRFARE_PER_PERSON = 1500.0
+OVERRIDE_BAGGAGE_PER_DAY_PER_PERSON = 150.0
+
+# Service Rates rows that pricing looks up; resolved (and checked) once per workbook load.
+PRICING_RATE_KEYS = (
+    "tech. regular time",
+    "eng. regular time",
+    "parking",
+    "car rental",
+    "hotel",
+    "per diem weekday",
+    "pre/post trip prep",
+    "travel time",
+)
+
+
+def money(x: float) -> str:
+    return f"${x:,.0f}"
+
+
+@dataclass
+class LineSelection:
+    model: str
+    qty: int
+    training_required: bool
+
+
+@dataclass
+class RoleTotals:
+    headcount: int
+    total_onsite_days: int
+    onsite_days_by_person: List[int]
+    day_rate: float
+    labor_cost: float
+
+
+@dataclass
+class ExpenseLine:
+    description: str
+    quantity: float
+    unit_price: float
+    extended: float
+    details: str
+
+
+@dataclass
+class Assignment:
+    model: str  # shown as-is; "A + B" for a person shared across models
+    role: str  # "Technician" or "Engineer"
+    person_num: int
+    onsite_days: int
+    cost: float
+    work: TDict[str, int] = field(default_factory=dict)  # model -> onsite days, for shared people
+
+    @property
+    def models(self) -> Tuple[str, ...]:
+        """Every model this person works on (match per-model rules against these, not `model`)."""
+        return tuple(self.work) if self.work else (self.model,)
+
+
+@dataclass(frozen=True)
+class RateCard:
+    """Unit prices a quote is priced with (a snapshot of the workbook's Service Rates)."""
+    tech_hourly: float
+    eng_hourly: float
+    parking: float
+    car_rental: float
+    hotel: float
+    per_diem: float
+    prep: float
+    travel_time: float
+
+    @classmethod
+    def from_lookup(cls, get_rate: Callable[[str], Tuple[float, str]]) -> "RateCard":
+        """Resolve every pricing rate through `get_rate` (raises for the first missing one)."""
+        return cls(*(float(get_rate(key)[0]) for key in PRICING_RATE_KEYS))
+
+    @property
+    def tech_day_rate(self) -> float:
+        return self.tech_hourly * HOURS_PER_DAY
+
+    @property
+    def eng_day_rate(self) -> float:
+        return self.eng_hourly * HOURS_PER_DAY
+
+
+@dataclass
+class PricedQuote:
+    tech: RoleTotals
+    eng: RoleTotals
+    expenses: List[ExpenseLine]
+    meta: TDict[str, Any]
+
+    def astuple(self) -> Tuple[RoleTotals, RoleTotals, List[ExpenseLine], TDict[str, Any]]:
+        return self.tech, self.eng, self.expenses, self.meta
+
+
+def line_days(info: Any, qty: int, training_required: bool) -> TDict[str, int]:
+    """Training days and role totals of one line (the scalar form of model_table.compute_lines)."""
+    install = int(info.tech_install_days_per_machine)
+    eng = int(info.eng_days_per_machine)
+    applicable = bool(info.training_applicable)
+    base_training = -(-qty // TRAINING_MACHINES_PER_DAY) if applicable else 0
+    training_days = base_training if training_required else 0
+    eng_training_potential = base_training if eng > 0 else 0
+    eng_training_days = eng_training_potential if training_required else 0
+    return {
+        "install_days": install,
+        "eng_days": eng,
+        "training_applicable": applicable,
+        "base_training": base_training,
+        "training_days": training_days,
+        "eng_training_potential": eng_training_potential,
+        "eng_training_days": eng_training_days,
+        "tech_total": install * qty + training_days,
+        "eng_total": eng * qty + eng_training_days,
+        "single_training": int(training_required and applicable),
+        "single_eng_training": int(training_required and eng > 0),
+    }
+
+
+def _check_window(s: LineSelection, d: TDict[str, int], window: int):
+    """Raise when one machine of the line (plus a training day) cannot fit the window."""
+    if d["install_days"] + d["single_training"] > window:
+        raise ValueError(f"{s.model}: Install ({d['install_days']}) + Training ({d['single_training']}) exceeds the Customer Install Window ({window}).")
+    if d["eng_days"] > 0 and d["eng_days"] + d["single_eng_training"] > window:
+        raise ValueError(
+            f"{s.model}: Engineer ({d['eng_days']}) + Training ({d['single_eng_training']}) exceeds the Customer Install Window ({window})."
+        )
+
+
+def crew_groups(machine_rows: Sequence[TDict[str, Any]], qualifications) -> List[TDict[str, object]]:
+    """Models in this quote that one qualified person could cover together (per role)."""
+    groups = []
+    if not qualifications:
+        return groups
+    for role, total_key in (("Technician", "tech_total"), ("Engineer", "eng_total")):
+        models = list(dict.fromkeys(r["model"] for r in machine_rows if r[total_key] > 0))
+        for members, common in qualifications.share_groups(models, role):
+            if len(members) > 1:
+                groups.append({"role": role, "models": members, "resources": qualifications.resource_names(common)})
+    return groups
+
+
+@dataclass(frozen=True)
+class LineResult:
+    """Everything one quote line contributes before crews are pooled; shared between recalcs."""
+    days: TDict[str, int]
+    tech_alloc: Tuple[int, ...]
+    eng_alloc: Tuple[int, ...]
+    row: TDict[str, Any]
+    assignments: Tuple[Assignment, ...]
+
+
+def line_key(s: LineSelection, info: Any, window: int, rates: RateCard) -> tuple:
+    """Every input price_line reads; equal keys give equal LineResults."""
+    return (s.model, int(s.qty), bool(s.training_required), int(window),
+            int(info.tech_install_days_per_machine), int(info.eng_days_per_machine), bool(info.training_applicable),
+            rates.tech_day_rate, rates.eng_day_rate)
+
+
+def price_line(s: LineSelection, info: Any, window: int, rates: RateCard) -> LineResult:
+    """Training days, dedicated crews and breakdown row of one line (raises if it cannot fit the window)."""
+    d = line_days(info, int(s.qty), bool(s.training_required))
+    _check_window(s, d, window)
+    tech_alloc: Tuple[int, ...] = ()
+    eng_alloc: Tuple[int, ...] = ()
+    assignments: List[Assignment] = []
+    if d["tech_total"] > 0:
+        tech_alloc = tuple(allocate_cached(d["install_days"], s.qty, d["training_days"], window))
+        assignments += [Assignment(s.model, "Technician", i, n, n * rates.tech_day_rate) for i, n in enumerate(tech_alloc, 1)]
+    if d["eng_total"] > 0:
+        eng_alloc = tuple(allocate_cached(d["eng_days"], s.qty, d["eng_training_days"], window))
+        assignments += [Assignment(s.model, "Engineer", i, n, n * rates.eng_day_rate) for i, n in enumerate(eng_alloc, 1)]
+    row = {
+        "model": s.model,
+        "qty": s.qty,
+        "training_days": d["training_days"],
+        "training_potential": d["base_training"],
+        "training_required": s.training_required,
+        "training_applicable": d["training_applicable"],
+        "eng_training_days": d["eng_training_days"],
+        "eng_training_potential": d["eng_training_potential"],
+        "tech_total": d["tech_total"],
+        "eng_total": d["eng_total"],
+        "tech_headcount": len(tech_alloc),
+        "eng_headcount": len(eng_alloc)
+    }
+    return LineResult(d, tech_alloc, eng_alloc, row, tuple(assignments))
+
+
+def line_headcounts(lines: Sequence[Tuple[str, int]], crew: Sequence[Any]) -> List[int]:
+    """People a pooled crew puts on each (model, days) quote line.
+
+    Machines of one model are interchangeable, so each model's days in the crew
+    are handed to that model's lines in quote order, person by person. A person
+    counts once for every line they take days from, so two lines of the same
+    model are not each credited with the whole crew.
+    """
+    supply: TDict[str, List[int]] = {}
+    for member in crew:
+        for model, days in member.work.items():
+            supply.setdefault(model, []).append(days)
+    cursor: TDict[str, Tuple[int, int]] = {}  # model -> (person index, days that person has left)
+    counts = []
+    for model, need in lines:
+        people = supply.get(model, [])
+        i, left = cursor.get(model, (0, people[0] if people else 0))
+        n = 0
+        while need > 0 and i < len(people):
+            take = min(need, left)
+            need -= take
+            left -= take
+            n += 1
+            if left == 0:
+                i += 1
+                left = people[i] if i < len(people) else 0
+        cursor[model] = (i, left)
+        counts.append(n)
+    return counts
+
+
+def price_quote(selections: Sequence[LineSelection], window: int, models: Mapping[str, Any], rates: RateCard,
+                qualifications=None, share_crews: bool = False,
+                line_cache: TDict[tuple, LineResult] | None = None) -> PricedQuote:
+    """Staff and price `selections` under the install window.
+
+    Every line gets its own crew per role unless `share_crews` is set and the
+    qualification index lets one person cover several models. Raises ValueError
+    for the first line that cannot fit the window.
+
+    With a `line_cache`, only lines whose inputs changed since the previous call
+    are recomputed; the cache is left holding exactly the current lines.
+    """
+    window = int(window)
+    tech_day_rate, eng_day_rate = rates.tech_day_rate, rates.eng_day_rate
+    previous = line_cache if line_cache is not None else {}
+    current: TDict[tuple, LineResult] = {}
+    lines: List[LineResult] = []
+    recomputed = 0
+    for s in selections:
+        info = models[s.model]
+        key = line_key(s, info, window, rates)
+        res = current.get(key) or previous.get(key)
+        if res is None:
+            res = price_line(s, info, window, rates)
+            recomputed += 1
+        current[key] = res
+        lines.append(res)
+    if line_cache is not None:
+        line_cache.clear()
+        line_cache.update(current)
+
+    # Rows are copied: pooled crews rewrite headcounts, and the cached rows must stay as priced.
+    machine_rows = [dict(res.row) for res in lines]
+    assignments: List[Assignment] = [a for res in lines for a in res.assignments]
+    tech_all: List[int] = [n for res in lines for n in res.tech_alloc]
+    eng_all: List[int] = [n for res in lines for n in res.eng_alloc]
+
+    # Optional: let qualified people cover several models (fewer people, same days).
+    crew_packing: TDict[str, PackResult] = {}
+    if share_crews and qualifications:
+        for role, rate, key in (("Technician", tech_day_rate, "tech_headcount"), ("Engineer", eng_day_rate, "eng_headcount")):
+            alloc_key, days_key, training_key = (
+                ("tech_alloc", "install_days", "training_days") if role == "Technician"
+                else ("eng_alloc", "eng_days", "eng_training_days")
+            )
+            demands = [
+                CrewDemand(s.model, s.qty, line.days[days_key], line.days[training_key],
+                           qualifications.qualified(s.model, role), getattr(line, alloc_key))
+                for s, line in zip(selections, lines) if getattr(line, alloc_key)
+            ]
+            if len({d.model for d in demands}) < 2:
+                continue
+            res = pack_crews(demands, window)
+            crew_packing[role] = res
+            if res.used_fallback:
+                continue
+            assignments = [a for a in assignments if a.role != role] + [
+                Assignment(m.label, role, i, m.onsite_days, m.onsite_days * rate, dict(m.work))
+                for i, m in enumerate(res.crew, 1)
+            ]
+            rows = [r for r in machine_rows if r[key]]
+            total_key = "tech_total" if role == "Technician" else "eng_total"
+            for r, n in zip(rows, line_headcounts([(r["model"], r[total_key]) for r in rows], res.crew)):
+                r[key] = n
+            loads = [m.onsite_days for m in res.crew]
+            if role == "Technician":
+                tech_all = loads
+            else:
+                eng_all = loads
+
+    quote = _priced(tech_all, eng_all, assignments, rates, tech_day_rate, eng_day_rate)
+    quote.meta.update({
+        "machine_rows": machine_rows,
+        "window": window,
+        "crew_groups": crew_groups(machine_rows, qualifications),
+        "crew_packing": crew_packing,
+        "lines_recomputed": recomputed,
+    })
+    return quote
+
+
+def price_resources(people: Sequence[Tuple[str, int]], rates: RateCard, hours_per_day: int = HOURS_PER_DAY) -> PricedQuote:
+    """Price explicitly staffed visits: one (role, onsite days) pair per person.
+
+    Used for reactive service, where the customer books people rather than machines.
+    """
+    tech_day_rate = rates.tech_hourly * hours_per_day
+    eng_day_rate = rates.eng_hourly * hours_per_day
+    assignments: List[Assignment] = []
+    counts = {"Technician": 0, "Engineer": 0}
+    for role, onsite_days in people:
+        counts[role] += 1
+        rate = tech_day_rate if role == "Technician" else eng_day_rate
+        assignments.append(Assignment("", role, counts[role], int(onsite_days), int(onsite_days) * rate))
+    tech_all = [a.onsite_days for a in assignments if a.role == "Technician"]
+    eng_all = [a.onsite_days for a in assignments if a.role == "Engineer"]
+    return _priced(tech_all, eng_all, assignments, rates, tech_day_rate, eng_day_rate)
+
+
+def _priced(tech_all: List[int], eng_all: List[int], assignments: List[Assignment], rates: RateCard,
+            tech_day_rate: float, eng_day_rate: float) -> PricedQuote:
+    """Role totals and travel expenses for a staffed quote."""
+    tech = RoleTotals(len(tech_all), sum(tech_all), sorted(tech_all, reverse=True), tech_day_rate, float(sum(tech_all)) * tech_day_rate)
+    eng = RoleTotals(len(eng_all), sum(eng_all), sorted(eng_all, reverse=True), eng_day_rate, float(sum(eng_all)) * eng_day_rate)
+
+    trip_days_by_person = [a.onsite_days + TRAVEL_DAYS_PER_PERSON for a in assignments]
+    n_people = len(trip_days_by_person)
+    total_trip_days = sum(trip_days_by_person)
+    total_hotel_nights = sum(max(d - 1, 0) for d in trip_days_by_person)
+
+    exp_lines: List[ExpenseLine] = []
+
+    def add_exp(name, qty, unit, detail):
+        exp_lines.append(ExpenseLine(name, float(qty), float(unit), float(qty) * float(unit), detail))
+
+    add_exp("Airfare", n_people, OVERRIDE_AIRFARE_PER_PERSON, f"{n_people} person(s) × {money(OVERRIDE_AIRFARE_PER_PERSON)}")
+    add_exp("Baggage", total_trip_days, OVERRIDE_BAGGAGE_PER_DAY_PER_PERSON, f"{int(total_trip_days)} day(s) × {money(OVERRIDE_BAGGAGE_PER_DAY_PER_PERSON)}")
+    add_exp("Car Rental", total_trip_days, rates.car_rental, f"{int(total_trip_days)} day(s) × {money(rates.car_rental)}")
+    add_exp("Parking", total_trip_days, rates.parking, f"{int(total_trip_days)} day(s) × {money(rates.parking)}")
+    add_exp("Hotel", total_hotel_nights, rates.hotel, f"{int(total_hotel_nights)} night(s) × {money(rates.hotel)}")
+    add_exp("Per Diem", total_trip_days, rates.per_diem, f"{int(total_trip_days)} day(s) × {money(rates.per_diem)}")
+    add_exp("Pre/Post Trip Prep", n_people, rates.prep, f"{n_people} person(s) × {money(rates.prep)}")
+    travel_hours = TRAVEL_HOURS_PER_PERSON * n_people
+    add_exp("Travel Time", travel_hours, rates.travel_time, f"{travel_hours} hr(s) × {money(rates.travel_time)}/hr")
+
+    exp_total = sum(l.extended for l in exp_lines)
+    max_onsite = max([a.onsite_days for a in assignments], default=0)
+    grand_total = exp_total + tech.labor_cost + eng.labor_cost
+
+    meta = {
+        "machine_rows": [],
+        "assignments": assignments,
+        "max_onsite": max_onsite,
+        "n_people": n_people,
+        "total_trip_days": total_trip_days,
+        "exp_total": exp_total,
+        "grand_total": grand_total,
+    }
+    return PricedQuote(tech, eng, exp_lines, meta)
@@ -0,0 +1,133 @@
+"""Machine qualification index ("Machine Qualifications for PCP Quoting.xlsx").
+
+Each resource (Tech 1, Eng 2, ...) is a bit position. For every model we keep a
+bitmask of the resources qualified on it, both overall and per resource class
+(Technician / Engineer), so "who can commission model X" is a dict lookup and
+"can these machines share a person" is a bitwise AND.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from core.snapshot import load_snapshot, save_snapshot, source_key
+
+
+QUALIFICATIONS_SHEET = "Machine Qualifications"
+QUALIFICATIONS_SNAPSHOT_KIND = "qualifications"
+QUALIFICATIONS_SNAPSHOT_VERSION = 1
+
+
+def _norm(model: str) -> str:
+    return str(model).strip().upper()
+
+
+class QualificationIndex:
+    def __init__(self, models: list[str], resources: list[tuple[str, str, dict[str, str]]]):
+        self.models = list(models)
+        self.resources = [(cls, name) for cls, name, _ in resources]
+        self.levels = [dict(skills) for _, _, skills in resources]
+        self.by_model: dict[str, int] = {}
+        self.by_class: dict[str, dict[str, int]] = {}
+        self.resource_skills: list[int] = []
+        model_bit = {_norm(m): i for i, m in enumerate(self.models)}
+
+        for r, (cls, _name, skills) in enumerate(resources):
+            bit = 1 << r
+            skill_mask = 0
+            per_class = self.by_class.setdefault(cls, {})
+            for model in skills:
+                key = _norm(model)
+                self.by_model[key] = self.by_model.get(key, 0) | bit
+                per_class[key] = per_class.get(key, 0) | bit
+                if key in model_bit:
+                    skill_mask |= 1 << model_bit[key]
+            self.resource_skills.append(skill_mask)
+
+    @classmethod
+    def empty(cls) -> "QualificationIndex":
+        return cls([], [])
+
+    def __bool__(self) -> bool:
+        return bool(self.resources)
+
+    def qualified(self, model: str, resource_class: str | None = None) -> int:
+        """Bitmask of resources qualified on `model` (optionally within one class)."""
+        table = self.by_model if resource_class is None else self.by_class.get(resource_class, {})
+        return table.get(_norm(model), 0)
+
+    def resource_names(self, mask: int) -> list[str]:
+        names = []
+        r = 0
+        while mask:
+            if mask & 1:
+                names.append(self.resources[r][1])
+            mask >>= 1
+            r += 1
+        return names
+
+    def who_can_commission(self, model: str, resource_class: str | None = None) -> list[str]:
+        return self.resource_names(self.qualified(model, resource_class))
+
+    def share_groups(self, models: list[str], resource_class: str) -> list[tuple[list[str], int]]:
+        """Group models so each group has at least one resource qualified on all of them.
+
+        Models are taken in order and join the first group whose common mask they overlap;
+        models nobody is qualified on stay on their own. Returns (models, common_mask) pairs.
+        """
+        groups: list[tuple[list[str], int]] = []
+        for model in models:
+            mask = self.qualified(model, resource_class)
+            for i, (members, common) in enumerate(groups):
+                if common & mask:
+                    groups[i] = (members + [model], common & mask)
+                    break
+            else:
+                groups.append(([model], mask))
+        return groups
+
+
+def parse_qualifications(path: Path) -> dict[str, list]:
+    """Read the qualification matrix into plain rows (the snapshot payload)."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if QUALIFICATIONS_SHEET not in wb.sheetnames:
+            raise ValueError(f"Missing sheet: '{QUALIFICATIONS_SHEET}'")
+        models: list[str] = []
+        model_cols: list[tuple[int, str]] = []
+        resources: list[tuple[str, str, dict[str, str]]] = []
+        for row in wb[QUALIFICATIONS_SHEET].iter_rows(values_only=True):
+            if not row:
+                continue
+            if not model_cols:
+                if str(row[0]).strip().lower() == "resource type":
+                    model_cols = [(c, str(v).strip()) for c, v in enumerate(row) if c >= 2 and v is not None and str(v).strip()]
+                    models = [m for _, m in model_cols]
+                continue
+            cls = str(row[0]).strip() if row[0] is not None else ""
+            name = str(row[1]).strip() if len(row) > 1 and row[1] is not None else ""
+            if not cls or not name:
+                continue
+            skills = {}
+            for c, model in model_cols:
+                v = row[c] if c < len(row) else None
+                if v is not None and str(v).strip():
+                    skills[model] = str(v).strip()
+            resources.append((cls, name, skills))
+    finally:
+        wb.close()
+    return {"models": models, "resources": resources}
+
+
+def load_qualifications(path: Path | None) -> QualificationIndex:
+    """Build the index from the on-disk snapshot when fresh, else parse and refresh it."""
+    if path is None or not Path(path).exists():
+        return QualificationIndex.empty()
+    key = source_key(path)
+    payload = load_snapshot(QUALIFICATIONS_SNAPSHOT_KIND, key, QUALIFICATIONS_SNAPSHOT_VERSION)
+    if payload is None:
+        payload = parse_qualifications(path)
+        save_snapshot(QUALIFICATIONS_SNAPSHOT_KIND, key, QUALIFICATIONS_SNAPSHOT_VERSION, payload)
+    return QualificationIndex(payload["models"], payload["resources"])
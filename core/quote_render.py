@@ -0,0 +1,97 @@
+"""Shared pieces for the printed quote documents.
+
+Assets are read and base64-encoded once per file version (path, size, mtime),
+and each quote layout is compiled once into a QuoteTemplate: the literal HTML
+and CSS are split around `$name` fields at import time, so rendering a quote is
+a single join of precomputed text and the values taken from the calc result.
+Repeating rows are built as lists and joined by the caller before filling.
+"""
+
+from __future__ import annotations
+
+import base64
+import functools
+import os
+from datetime import date, timedelta
+from pathlib import Path
+from string import Template
+from typing import Any
+
+
+QUOTE_VALID_DAYS = 30
+
+
+class QuoteTemplate:
+    """A layout with `$name` / `${name}` fields (`$$` is a literal dollar sign), parsed once.
+
+    Fields given as `constants` (colours, business-rule numbers) are folded into the
+    literal text at compile time; the rest are filled by render().
+    """
+
+    def __init__(self, source: str, **constants: Any):
+        self.source = source
+        literals: list[str] = []
+        fields: list[str] = []
+        text, pos = [], 0
+        for m in Template.pattern.finditer(source):
+            text.append(source[pos:m.start()])
+            pos = m.end()
+            if m.group("escaped") is not None:
+                text.append("$")
+                continue
+            name = m.group("named") or m.group("braced")
+            if name is None:
+                raise ValueError(f"Invalid template field at offset {m.start()}: {source[m.start():m.start() + 20]!r}")
+            if name in constants:
+                text.append(str(constants[name]))
+                continue
+            literals.append("".join(text))
+            fields.append(name)
+            text = []
+        text.append(source[pos:])
+        literals.append("".join(text))
+        self._literals = literals
+        self.fields = tuple(fields)
+
+    def render(self, **values: Any) -> str:
+        parts = [self._literals[0]]
+        for name, literal in zip(self.fields, self._literals[1:]):
+            parts.append(str(values[name]))
+            parts.append(literal)
+        return "".join(parts)
+
+
+def quote_dates(today: date | None = None) -> tuple[str, str]:
+    """(quote date, valid-through date) as "June 3, 2025"."""
+    today = today or date.today()
+    validity = today + timedelta(days=QUOTE_VALID_DAYS)
+    return f"{today:%B} {today.day}, {today:%Y}", f"{validity:%B} {validity.day}, {validity:%Y}"
+
+
+@functools.lru_cache(maxsize=16)
+def _encoded(path: str, size: int, mtime_ns: int) -> str:
+    return base64.b64encode(Path(path).read_bytes()).decode("ascii")
+
+
+def data_uri(path: Path | str | None, mime: str = "image/png") -> str:
+    """`data:` URI for the file's current contents ("" if it is missing or unreadable)."""
+    if not path:
+        return ""
+    try:
+        st = os.stat(path)
+        return f"data:{mime};base64,{_encoded(os.fspath(path), st.st_size, st.st_mtime_ns)}"
+    except OSError:
+        return ""
+
+
+def logo_img(path: Path | str | None, height: int = 36, style: bool = True) -> str:
+    """Inline `<img>` for the quote header ("" without a logo)."""
+    uri = data_uri(path)
+    if not uri:
+        return ""
+    css = f' style="height:{height}px;"' if style else ""
+    return f'<img src="{uri}" height="{height}"{css} />'
+
+
+def clear_asset_cache() -> None:
+    _encoded.cache_clear()
@@ -0,0 +1,59 @@
+"""Rate lookup index built once per loaded workbook.
+
+Lookup rules match the original ExcelData.get_rate: an exact (case-insensitive,
+trimmed) description wins, otherwise the first rate row, in sheet order, whose
+description contains the key. Keys the pricing code is known to use are resolved
+up front so missing or ambiguous ones are reported once, at load time.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable
+
+
+log = logging.getLogger(__name__)
+
+
+def canonical_rate_key(key: str) -> str:
+    return str(key).lower().strip()
+
+
+class RateResolver:
+    def __init__(self, rates: dict[str, dict[str, object]], expected_keys: Iterable[str] = ()):
+        # Sheet order is preserved by the rates dict; it is the substring tie-breaker.
+        self._rows = [(k, float(v["unit_price"]), str(v["description"])) for k, v in rates.items()]
+        self._exact = {k: (price, desc) for k, price, desc in self._rows}
+        self._memo: dict[str, tuple[float, str] | None] = {}
+        self.issues: list[str] = []
+
+        for key in expected_keys:
+            k = canonical_rate_key(key)
+            matches = self._matches(k)
+            if not matches:
+                self.issues.append(f"Rate not found for '{key}'")
+            elif k not in self._exact and len(matches) > 1:
+                names = ", ".join(f"'{desc}'" for _, _, desc in matches)
+                self.issues.append(f"Rate '{key}' is ambiguous ({names}); using '{matches[0][2]}'")
+            self._memo[key] = self._pick(k, matches)
+        for msg in self.issues:
+            log.warning(msg)
+
+    def _matches(self, k: str) -> list[tuple[str, float, str]]:
+        return [row for row in self._rows if k in row[0]]
+
+    def _pick(self, k: str, matches: list[tuple[str, float, str]]) -> tuple[float, str] | None:
+        if k in self._exact:
+            return self._exact[k]
+        return (matches[0][1], matches[0][2]) if matches else None
+
+    def resolve(self, key: str) -> tuple[float, str]:
+        try:
+            hit = self._memo[key]
+        except KeyError:
+            k = canonical_rate_key(key)
+            hit = self._exact.get(k) or self._pick(k, self._matches(k))
+            self._memo[key] = hit
+        if hit is None:
+            raise KeyError(f"Rate not found for '{key}'")
+        return hit
@@ -0,0 +1,103 @@
+"""Persistent snapshots of parsed workbook data.
+
+A snapshot is a pickled payload of plain Python values stored under the user's
+profile. It is keyed on the source file's resolved path, size, mtime and content
+hash, so any edit to the workbook makes the snapshot stale and the caller falls
+back to a full parse.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+SNAPSHOT_FORMAT = 1
+_HASH_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class SourceKey:
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+def snapshot_dir() -> Path:
+    """Return the per-user snapshot directory (QUOTE_PRO_CACHE_DIR overrides it)."""
+    env = os.environ.get("QUOTE_PRO_CACHE_DIR", "").strip()
+    if env:
+        return Path(env).expanduser()
+    local = os.environ.get("LOCALAPPDATA", "").strip()
+    if local:
+        return Path(local) / "PearsonQuotePro" / "cache"
+    return Path.home() / ".pearson_quote_pro" / "cache"
+
+
+def source_key(path: Path) -> SourceKey:
+    path = Path(path).resolve()
+    st = path.stat()
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return SourceKey(str(path), int(st.st_size), int(st.st_mtime_ns), h.hexdigest())
+
+
+def _snapshot_file(kind: str, resolved_path: str) -> Path:
+    name = hashlib.sha1(resolved_path.encode("utf-8")).hexdigest()[:16]
+    return snapshot_dir() / f"{kind}_{name}.snap"
+
+
+def load_snapshot(kind: str, key: SourceKey, version: int) -> Any | None:
+    """Return the stored payload for `key`, or None when missing or stale."""
+    try:
+        blob = _snapshot_file(kind, key.path).read_bytes()
+        stored = pickle.loads(blob)
+    except Exception:
+        return None
+    if not isinstance(stored, dict):
+        return None
+    if stored.get("format") != SNAPSHOT_FORMAT or stored.get("version") != version:
+        return None
+    if stored.get("key") != key:
+        return None
+    return stored.get("payload")
+
+
+def save_snapshot(kind: str, key: SourceKey, version: int, payload: Any) -> None:
+    """Write the payload atomically; failures are ignored (the cache is best-effort)."""
+    target = _snapshot_file(kind, key.path)
+    blob = pickle.dumps(
+        {"format": SNAPSHOT_FORMAT, "version": version, "key": key, "payload": payload},
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=target.stem, suffix=".tmp", dir=str(target.parent))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, target)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+    except Exception:
+        pass
+
+
+def clear_snapshot(kind: str, path: Path) -> None:
+    """Remove any snapshot stored for `path` (used by benchmarks and reloads)."""
+    try:
+        _snapshot_file(kind, str(Path(path).resolve())).unlink()
+    except OSError:
+        pass
@@ -0,0 +1,131 @@
+"""Span timing for startup and recalc phases.
+
+`with span("recalc.calc"):` (or `@traced("...")`) records how long a phase took
+when timing is on, and costs one flag check when it is off. Timing starts off
+unless QUOTE_PRO_TRACE is set (so startup phases can be captured) and can be
+toggled from the diagnostics panel. Each phase keeps its recent durations for
+percentiles, and recent spans can be written as a Chrome trace (chrome://tracing
+or ui.perfetto.dev) for support to collect from slow machines.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable
+
+
+MAX_EVENTS = 20_000   # spans kept for trace export
+MAX_SAMPLES = 512     # durations kept per phase for percentiles
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (q in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[min(len(sorted_values), int(rank)) - 1]
+
+
+class _Span:
+    __slots__ = ("_recorder", "_name", "_start")
+
+    def __init__(self, recorder: SpanRecorder, name: str):
+        self._recorder = recorder
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self._recorder.record(self._name, self._start, time.perf_counter_ns() - self._start)
+        return False
+
+
+class SpanRecorder:
+    def __init__(self, enabled: bool = False, max_events: int = MAX_EVENTS, max_samples: int = MAX_SAMPLES):
+        self.enabled = enabled
+        self._max_samples = max_samples
+        self._events: deque[tuple[str, int, int, int]] = deque(maxlen=max_events)  # name, start, duration, thread
+        self._samples: dict[str, deque[int]] = {}
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()  # workbooks load on worker threads
+
+    def span(self, name: str):
+        """Context manager timing `name` (a shared no-op while disabled)."""
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def record(self, name: str, start_ns: int, duration_ns: int) -> None:
+        with self._lock:
+            self._events.append((name, start_ns, duration_ns, threading.get_ident()))
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self._max_samples)
+            samples.append(duration_ns)
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._samples.clear()
+            self._counts.clear()
+
+    def stats(self) -> list[tuple[str, int, float, float, float, float]]:
+        """(phase, count, p50, p90, p99, max) per phase in milliseconds, sorted by phase."""
+        with self._lock:
+            snapshot = {name: sorted(s) for name, s in self._samples.items()}
+            counts = dict(self._counts)
+        rows = []
+        for name in sorted(snapshot):
+            ms = [ns / 1e6 for ns in snapshot[name]]
+            rows.append((name, counts[name], percentile(ms, 50), percentile(ms, 90), percentile(ms, 99), ms[-1]))
+        return rows
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Recorded spans in the Chrome trace event format (complete "X" events, microseconds)."""
+        with self._lock:
+            events = list(self._events)
+        pid = os.getpid()
+        threads = {tid: i for i, tid in enumerate(dict.fromkeys(tid for *_, tid in events))}
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {"name": name, "cat": name.split(".", 1)[0], "ph": "X", "ts": start / 1000.0,
+                 "dur": duration / 1000.0, "pid": pid, "tid": threads[tid]}
+                for name, start, duration, tid in events
+            ],
+        }
+
+    def export_chrome_trace(self, path: Path | str) -> int:
+        """Write the trace JSON to `path`; returns the number of spans written."""
+        trace = self.chrome_trace()
+        Path(path).write_text(json.dumps(trace), encoding="utf-8")
+        return len(trace["traceEvents"])
+
+
+SPANS = SpanRecorder(enabled=os.environ.get("QUOTE_PRO_TRACE", "").strip() not in ("", "0"))
+
+
+def span(name: str):
+    return SPANS.span(name)
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of span() for whole functions."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not SPANS.enabled:
+                return fn(*args, **kwargs)
+            with _Span(SPANS, name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
@@ -0,0 +1,148 @@
+"""Price one quote under every install window in a single vectorised pass.
+
+Per line and role, headcount and busiest-person load come from the closed form of
+chunk_allocate_by_machine, evaluated for all windows at once (lines x windows
+arrays). Total onsite days do not depend on the window, so labor is shared by
+every window. Expenses are linear in headcount, trip days and hotel nights, so
+each window's grand total only needs its headcount.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.model_table import LineBatch
+from core.pricing import (
+    OVERRIDE_AIRFARE_PER_PERSON, OVERRIDE_BAGGAGE_PER_DAY_PER_PERSON, TRAVEL_DAYS_PER_PERSON, TRAVEL_HOURS_PER_PERSON,
+    RateCard,
+)
+
+
+@dataclass(frozen=True)
+class SweepCosts:
+    """Cost coefficients that turn headcount and days into dollars (same rules as calc)."""
+    tech_day_rate: float
+    eng_day_rate: float
+    per_person: float         # airfare, pre/post trip prep, travel time
+    per_trip_day: float       # baggage, car rental, parking, per diem
+    per_hotel_night: float
+    travel_days_per_person: int
+
+
+def sweep_costs(rates: RateCard) -> SweepCosts:
+    """The expense rules of core.pricing.price_quote, collapsed into per-unit coefficients."""
+    return SweepCosts(
+        tech_day_rate=rates.tech_day_rate,
+        eng_day_rate=rates.eng_day_rate,
+        per_person=OVERRIDE_AIRFARE_PER_PERSON + rates.prep + TRAVEL_HOURS_PER_PERSON * rates.travel_time,
+        per_trip_day=OVERRIDE_BAGGAGE_PER_DAY_PER_PERSON + rates.car_rental + rates.parking + rates.per_diem,
+        per_hotel_night=rates.hotel,
+        travel_days_per_person=TRAVEL_DAYS_PER_PERSON,
+    )
+
+
+@dataclass
+class SweepResult:
+    """Arrays aligned with `windows`; entries for infeasible windows are meaningless."""
+    windows: np.ndarray
+    feasible: np.ndarray
+    tech_headcount: np.ndarray
+    eng_headcount: np.ndarray
+    n_people: np.ndarray
+    max_onsite: np.ndarray
+    labor: np.ndarray
+    expenses: np.ndarray
+    grand_total: np.ndarray
+
+    def best(self) -> int | None:
+        """Index of the cheapest feasible window (the shorter one on a tie), if any."""
+        idx = np.flatnonzero(self.feasible)
+        if not idx.size:
+            return None
+        return int(idx[np.argmin(self.grand_total[idx])])  # argmin keeps the first (shortest) tie
+
+    def index_of(self, window: int) -> int | None:
+        hit = np.flatnonzero(self.windows == window)
+        return int(hit[0]) if hit.size else None
+
+
+def _ceil_div(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return -(-a // b)
+
+
+def allocation_shape(install: np.ndarray, qty: np.ndarray, training: np.ndarray,
+                     windows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(headcount, busiest load) of chunk_allocate_by_machine for every line x window."""
+    ipm = np.asarray(install, dtype=np.int64)[:, None]
+    q = np.asarray(qty, dtype=np.int64)[:, None]
+    t = np.asarray(training, dtype=np.int64)[:, None]
+    w = np.asarray(windows, dtype=np.int64)[None, :]
+
+    # Whole machines split evenly, training topping people up to the window.
+    mpp = w // np.maximum(ipm, 1)
+    h_closed = np.maximum(np.maximum(1, _ceil_div(q, np.maximum(mpp, 1))), _ceil_div(q * ipm + t, w))
+    closed_ok = (mpp > 0) & (h_closed <= q)
+    busiest_install = _ceil_div(q, np.maximum(h_closed, 1)) * ipm
+    max_closed = np.minimum(w, busiest_install + t)
+
+    # Best-effort fallback: one machine per person, training spread evenly.
+    max_fallback = ipm + _ceil_div(t, np.maximum(q, 1))
+
+    # No install work: training only, balanced across ceil(training / window) people.
+    h_train = np.where(t > 0, _ceil_div(t, w), 0)
+    max_train = np.where(h_train > 0, _ceil_div(t, np.maximum(h_train, 1)), 0)
+
+    install_work = (q > 0) & (ipm > 0)
+    headcount = np.where(install_work, np.where(closed_ok, h_closed, q), h_train)
+    busiest = np.where(install_work, np.where(closed_ok, max_closed, max_fallback), max_train)
+    return headcount, busiest
+
+
+def sweep_windows(batch: LineBatch, windows, costs: SweepCosts) -> SweepResult:
+    """Headcount, labor, expenses and grand total of the quote in `batch` for each window."""
+    windows = np.asarray(list(windows), dtype=np.int64)
+    w = windows[None, :]
+
+    feasible = (
+        (batch.install_days + batch.single_training)[:, None] <= w
+    ) & (
+        (batch.eng_days <= 0)[:, None] | ((batch.eng_days + batch.single_eng_training)[:, None] <= w)
+    )
+    feasible = feasible.all(axis=0)
+
+    tech_active = (batch.tech_total > 0)[:, None]
+    eng_active = (batch.eng_total > 0)[:, None]
+    tech_h, tech_max = allocation_shape(batch.install_days, batch.qty, batch.training_days, windows)
+    eng_h, eng_max = allocation_shape(batch.eng_days, batch.qty, batch.eng_training_days, windows)
+    tech_h = np.where(tech_active, tech_h, 0)
+    eng_h = np.where(eng_active, eng_h, 0)
+    busiest = np.maximum(np.where(tech_active, tech_max, 0), np.where(eng_active, eng_max, 0))
+
+    tech_headcount = tech_h.sum(axis=0)
+    eng_headcount = eng_h.sum(axis=0)
+    n_people = tech_headcount + eng_headcount
+    max_onsite = busiest.max(axis=0) if busiest.size else np.zeros_like(windows)
+
+    # Every allocated day is onsite work, whatever the window.
+    tech_days = int(batch.tech_total.sum())
+    eng_days = int(batch.eng_total.sum())
+    onsite = tech_days + eng_days
+    labor = np.full(windows.shape, tech_days * costs.tech_day_rate + eng_days * costs.eng_day_rate, dtype=float)
+
+    trip_days = onsite + costs.travel_days_per_person * n_people
+    hotel_nights = trip_days - n_people  # one night fewer than trip days per person
+    expenses = costs.per_person * n_people + costs.per_trip_day * trip_days + costs.per_hotel_night * hotel_nights
+
+    return SweepResult(
+        windows=windows,
+        feasible=feasible,
+        tech_headcount=tech_headcount,
+        eng_headcount=eng_headcount,
+        n_people=n_people,
+        max_onsite=max_onsite,
+        labor=labor,
+        expenses=expenses.astype(float),
+        grand_total=labor + expenses,
+    )
@@ -0,0 +1,45 @@
+"""Differences between two loaded versions of the rates workbook."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class WorkbookDiff:
+    added_models: list[str] = field(default_factory=list)
+    removed_models: list[str] = field(default_factory=list)
+    changed_models: list[str] = field(default_factory=list)
+    changed_rates: list[str] = field(default_factory=list)
+    requirements_changed: bool = False
+
+    @property
+    def model_names_changed(self) -> bool:
+        return bool(self.added_models or self.removed_models)
+
+    @property
+    def affects_pricing(self) -> bool:
+        return bool(self.model_names_changed or self.changed_models or self.changed_rates)
+
+    def is_empty(self) -> bool:
+        return not (self.affects_pricing or self.requirements_changed)
+
+
+def _fields(model: Any) -> Any:
+    # Compare models by value: data loaded by two executions of the PCP module holds
+    # instances of two distinct (but identical) ModelInfo classes, which never compare equal.
+    return vars(model) if hasattr(model, "__dict__") else model
+
+
+def diff_workbooks(old: Any, new: Any) -> WorkbookDiff:
+    """Compare the models, rates and requirements of two ExcelData-like objects."""
+    old_models, new_models = old.models, new.models
+    old_rates, new_rates = old.rates, new.rates
+    return WorkbookDiff(
+        added_models=sorted(k for k in new_models if k not in old_models),
+        removed_models=sorted(k for k in old_models if k not in new_models),
+        changed_models=sorted(k for k in new_models if k in old_models and _fields(new_models[k]) != _fields(old_models[k])),
+        changed_rates=sorted(k for k in set(old_rates) | set(new_rates) if old_rates.get(k) != new_rates.get(k)),
+        requirements_changed=list(old.requirements) != list(new.requirements),
+    )
@@ -0,0 +1,76 @@
+"""Process-wide, reference-counted registry of loaded workbooks.
+
+Every PCP window acquires its workbook data here instead of parsing the file
+itself, so three tabs on the same workbook share one parsed copy. Windows that
+subscribe are told when another window publishes a different workbook.
+"""
+
+from __future__ import annotations
+
+import weakref
+from pathlib import Path
+from typing import Any, Callable
+
+
+def _key(path: Path | str) -> str:
+    return str(Path(path).resolve())
+
+
+class WorkbookRegistry:
+    def __init__(self):
+        self._data: dict[str, Any] = {}
+        self._refs: dict[str, int] = {}
+        self._subscribers: list[weakref.ReferenceType] = []
+        self.active_path: Path | None = None
+
+    def acquire(self, path: Path | str, loader: Callable[[Path], Any], reload: bool = False) -> Any:
+        """Return the shared data for `path`, loading it on first use (or when `reload`)."""
+        key = _key(path)
+        if reload or key not in self._data:
+            self._data[key] = loader(Path(key))
+        self._refs[key] = self._refs.get(key, 0) + 1
+        return self._data[key]
+
+    def adopt(self, path: Path | str, data: Any) -> None:
+        """Install data loaded elsewhere (e.g. on a worker thread) without taking a reference."""
+        self._data[_key(path)] = data
+
+    def peek(self, path: Path | str) -> Any | None:
+        """Return the loaded data for `path` without loading or taking a reference."""
+        return self._data.get(_key(path))
+
+    def release(self, path: Path | str) -> None:
+        """Drop one reference; the data is forgotten once nobody holds it."""
+        key = _key(path)
+        n = self._refs.get(key, 0) - 1
+        if n > 0:
+            self._refs[key] = n
+            return
+        self._refs.pop(key, None)
+        self._data.pop(key, None)
+
+    def refcount(self, path: Path | str) -> int:
+        return self._refs.get(_key(path), 0)
+
+    def loaded_paths(self) -> list[str]:
+        return list(self._data)
+
+    def subscribe(self, callback: Callable[[Any], None]) -> None:
+        """Register `callback(data)` for published workbooks (held weakly)."""
+        ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else weakref.ref(callback)
+        self._subscribers.append(ref)
+
+    def unsubscribe(self, callback: Callable[[Any], None]) -> None:
+        self._subscribers = [r for r in self._subscribers if r() is not None and r() != callback]
+
+    def publish(self, path: Path | str, data: Any) -> None:
+        """Make `data` the active workbook and hand it to every live subscriber."""
+        self.active_path = Path(_key(path))
+        for ref in list(self._subscribers):
+            cb = ref()
+            if cb is not None:
+                cb(data)
+        self._subscribers = [r for r in self._subscribers if r() is not None]
+
+
+WORKBOOKS = WorkbookRegistry()
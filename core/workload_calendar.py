@@ -0,0 +1,89 @@
+"""Day-by-day travel/onsite schedule for a quote's assignments, as interval arrays.
+
+Each person travels in, works a contiguous onsite block, then travels out, so a
+row is four day indices rather than one cell per day. The horizon grows to fit
+the longest stay, and both the on-screen calendar and the printed quote read
+the same WorkloadSchedule.
+"""
+
+from __future__ import annotations
+
+import html
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from core.pricing import Assignment
+
+
+MIN_HORIZON_DAYS = 14
+# Engineers on these models arrive a day after the technicians (shared engineers only when all
+# of their models are late ones, since they can start on the others first).
+LATE_ENGINEER_MODELS = frozenset({"RPC-PH", "RPC-OU"})
+
+TRAVEL, ONSITE, IDLE = "T", "O", ""
+DAY_COLORS = {TRAVEL: "#d9e8ff", ONSITE: "#d7f4df"}
+_HTML_CLASS = {TRAVEL: "travel", ONSITE: "onsite", IDLE: ""}
+_HTML_CELL = {c: f"<td class='{cls}'>{c}</td>" for c, cls in _HTML_CLASS.items()}
+
+
+@dataclass
+class WorkloadSchedule:
+    horizon: int
+    labels: list[str]
+    groups: list[str]
+    travel_in: array     # day index of inbound travel
+    onsite_start: array  # first onsite day
+    onsite_end: array    # last onsite day (inclusive)
+    travel_out: array    # day index of outbound travel
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def code(self, row: int, day: int) -> str:
+        if day == self.travel_in[row] or day == self.travel_out[row]:
+            return TRAVEL
+        if self.onsite_start[row] <= day <= self.onsite_end[row]:
+            return ONSITE
+        return IDLE
+
+    def row_key(self, row: int) -> tuple:
+        return (self.labels[row], self.groups[row], self.travel_in[row], self.onsite_start[row],
+                self.onsite_end[row], self.travel_out[row])
+
+    def html_table(self) -> str:
+        """The schedule as a printable table (classes `travel` / `onsite` colour the days)."""
+        head = "".join([f"<th>D{d}</th>" for d in range(1, self.horizon + 1)])
+        rows = [
+            f"<tr><td>{html.escape(self.labels[r])}</td><td>{html.escape(self.groups[r])}</td>{self._html_days(r)}</tr>"
+            for r in range(len(self))
+        ]
+        return (f"<table class='grid'><tr><th style='width:18%'>Resource</th><th style='width:8%'>Group</th>{head}</tr>"
+                f"{''.join(rows)}</table>")
+
+    def _html_days(self, row: int) -> str:
+        # A row is idle, travel, onsite block, travel, idle: repeat each run's cell instead of testing every day.
+        t_in, start, end, t_out = self.travel_in[row], self.onsite_start[row], self.onsite_end[row], self.travel_out[row]
+        if not (0 <= t_in < start <= end + 1 == t_out < self.horizon):
+            return "".join([_HTML_CELL[self.code(row, d)] for d in range(self.horizon)])
+        return (_HTML_CELL[IDLE] * t_in + _HTML_CELL[TRAVEL] + _HTML_CELL[IDLE] * (start - t_in - 1)
+                + _HTML_CELL[ONSITE] * (end - start + 1) + _HTML_CELL[TRAVEL] + _HTML_CELL[IDLE] * (self.horizon - t_out - 1))
+
+
+def schedule_assignments(assignments: Sequence[Assignment], group_of: Callable[[str], str],
+                         min_horizon: int = MIN_HORIZON_DAYS) -> WorkloadSchedule:
+    n = len(assignments)
+    travel_in, onsite_start = array("i", bytes(4 * n)), array("i", bytes(4 * n))
+    onsite_end, travel_out = array("i", bytes(4 * n)), array("i", bytes(4 * n))
+    labels, groups = [], []
+    for r, a in enumerate(assignments):
+        labels.append(f"{a.role[:1]}{a.person_num} - {a.model}")
+        # A person shared across models belongs to each of their models' groups.
+        groups.append(" + ".join(dict.fromkeys(group_of(m) for m in a.models)))
+        late = a.role == "Engineer" and all(m in LATE_ENGINEER_MODELS for m in a.models)
+        travel_in[r] = 1 if late else 0
+        onsite_start[r] = travel_in[r] + 1
+        onsite_end[r] = onsite_start[r] + int(a.onsite_days) - 1
+        travel_out[r] = onsite_end[r] + 1
+    horizon = max(min_horizon, max(travel_out, default=0) + 1)
+    return WorkloadSchedule(horizon, labels, groups, travel_in, onsite_start, onsite_end, travel_out)
@@ -1,11 +1,15 @@
-import sys, math
+import sys
+import functools
 from PySide6.QtGui import QDesktopServices
 from PySide6.QtCore import QUrl
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple, Dict as TDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Dict as TDict
 
+from core.spans import SPANS, span, traced
 
+
+@traced("startup.resolve_excel_path")
 def resolve_excel_path(expected_name: str = "Tech days and quote rates.xlsx") -> Path | None:
     """Find the default Excel workbook inside assets without prompting the user unless missing."""
     assets = resolve_assets_dir()
@@ -38,6 +42,26 @@ def resolve_excel_path(expected_name: str = "Tech days and quote rates.xlsx") ->
 
 
 
+def resolve_qualifications_path(workbook: Path | None = None,
+                                expected_name: str = "Machine Qualifications for PCP Quoting.xlsx") -> Path | None:
+    """Find the machine qualification workbook next to the rates workbook, else in assets."""
+    folders = [Path(workbook).resolve().parent] if workbook else []
+    folders.append(resolve_assets_dir())
+    for folder in folders:
+        try:
+            exact = folder / expected_name
+            if exact.exists():
+                return exact.resolve()
+            for f in folder.glob("*.xlsx"):
+                if "qualification" in f.name.lower():
+                    return f.resolve()
+        except Exception:
+            pass
+    return None
+
+
+
+@traced("startup.resolve_assets_dir")
 def resolve_assets_dir() -> Path:
     """Return the assets directory for dev + PyInstaller (onefile/onedir).
 
@@ -62,116 +86,71 @@ def resolve_assets_dir() -> Path:
     return (Path(__file__).resolve().parent / "assets").resolve()
 
 
-import numpy as np
-import openpyxl
-
-from PySide6.QtCore import Qt, QSize
+# numpy (core.model_table / core.window_sweep), openpyxl and Qt print support are imported
+# where first used, so a window can open and paint before any of them load.
+from core.allocation import (
+    ALLOCATION_CACHE_SIZE, allocate_cached, allocation_cache_stats, balanced_allocate, chunk_allocate_by_machine,
+    clear_allocation_cache,
+)
+from core.crew_packing import PackResult
+from core.pricing import (
+    PRICING_RATE_KEYS, TRAINING_MACHINES_PER_DAY, TRAVEL_DAYS_PER_PERSON, Assignment, ExpenseLine, LineSelection, RateCard, RoleTotals, money, price_quote,
+)
+from core.qualifications import QualificationIndex, load_qualifications
+from core.quote_render import QuoteTemplate, logo_img, quote_dates
+from core.rates import RateResolver
+from core.snapshot import load_snapshot, save_snapshot, source_key
+from core.workbook_diff import WorkbookDiff, diff_workbooks
+from core.workbook_registry import WORKBOOKS
+from ui import workbook_loader
+from ui.charts import CostCurveChart, WorkloadChart
+from ui.recalc_scheduler import RecalcScheduler
+from ui.table_model import RowTableModel
+from ui.workbook_loader import LoadCancelled, WorkbookLoadJob
+
+if TYPE_CHECKING:
+    from core.window_sweep import SweepResult
+
+from PySide6.QtCore import Qt, QSize, QTimer
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QFileDialog, QMessageBox,
     QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpinBox,
     QComboBox, QCheckBox, QFrame, QScrollArea, QSplitter,
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QSizePolicy
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QAbstractItemView, QSizePolicy,
+    QProgressDialog, QDialog
 )
-from PySide6.QtPrintSupport import QPrinter, QPrintPreviewDialog
-from PySide6.QtGui import QTextDocument
-from PySide6.QtGui import QPageSize, QFont, QPainter, QColor
-from PySide6.QtCharts import QChart, QChartView, QHorizontalBarSeries, QHorizontalStackedBarSeries, QBarSet, QValueAxis, QBarCategoryAxis
-import base64
+from PySide6.QtGui import QFont, QColor, QKeySequence, QShortcut
 
 APP_TITLE = "Pearson Commissioning Pro"
 
-# Business rules
-TRAINING_MACHINES_PER_DAY = 3  # 1 training day per 3 machines (ceil)
+TABLE_ROW_HEIGHT = 30
+
+# Business rules (pricing rules live in core.pricing)
 DEFAULT_INSTALL_WINDOW = 7
 MIN_INSTALL_WINDOW = 3
 MAX_INSTALL_WINDOW = 14
-TRAVEL_DAYS_PER_PERSON = 2  # travel-in + travel-out
-
-# Requested overrides
-OVERRIDE_AIRFARE_PER_PERSON = 1500.0
-OVERRIDE_BAGGAGE_PER_DAY_PER_PERSON = 150.0
 
 ASSETS_DIR = resolve_assets_dir()
-DEFAULT_EXCEL = resolve_excel_path() or (ASSETS_DIR / "Tech days and quote rates.xlsx")
 LOGO_PATH = ASSETS_DIR / "Pearson Logo.png"
 
 
-def ceil_int(x: float) -> int:
-    return int(math.ceil(float(x)))
-
+@functools.lru_cache(maxsize=None)
+def default_excel_path() -> Path:
+    """The bundled rates workbook (resolved on first use; may glob the assets folder)."""
+    return resolve_excel_path() or (ASSETS_DIR / "Tech days and quote rates.xlsx")
 
-def balanced_allocate(total_days: int, headcount: int) -> List[int]:
-    """Balance integer days to minimize the maximum assigned days."""
-    if headcount <= 0:
-        return []
-    loads = [0] * headcount
-    for _ in range(int(total_days)):
-        i = int(np.argmin(loads))
-        loads[i] += 1
-    loads.sort(reverse=True)
-    return loads
 
+def __getattr__(name: str):
+    # DEFAULT_EXCEL stays importable without resolving it when the module loads.
+    if name == "DEFAULT_EXCEL":
+        return default_excel_path()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+# Bump when ExcelData parsing changes so stale on-disk snapshots are ignored.
+EXCEL_SNAPSHOT_KIND = "rates"
+EXCEL_SNAPSHOT_VERSION = 1
 
 
-def chunk_allocate_by_machine(install_days_per_machine: int, qty: int, training_days: int, window: int) -> List[int]:
-    """Allocate work using whole-machine install chunks + whole-day training chunks.
-
-    Install days are assigned per machine (no fractional splitting). Training days are 1-day chunks.
-    We choose the *minimum* headcount that keeps every person's onsite days <= window.
-
-    Training assignment heuristic:
-      - Prefer assigning training to the currently *most-loaded* person that can still accept a day
-        without exceeding the window (keeps extra people from traveling and mirrors reality).
-      - If none can accept, fall back to the least-loaded person (best-effort).
-    Returns a list of total onsite days per person (sorted descending).
-    """
-    install_days_per_machine = int(install_days_per_machine or 0)
-    qty = int(qty or 0)
-    training_days = int(training_days or 0)
-    window = int(window or 0)
-
-    if window <= 0:
-        return []
-    if qty <= 0 and training_days <= 0:
-        return []
-
-    # If there is no install work, allocate training only.
-    if qty <= 0 or install_days_per_machine <= 0:
-        headcount = ceil_int(training_days / window) if training_days > 0 else 0
-        loads = balanced_allocate(training_days, headcount) if headcount > 0 else []
-        return loads
-
-    max_headcount = max(1, qty)  # at most one machine per person
-    for headcount in range(1, max_headcount + 1):
-        # Distribute whole machines as evenly as possible.
-        base_n = qty // headcount
-        rem = qty % headcount
-        machine_counts = [base_n + (1 if i < rem else 0) for i in range(headcount)]
-        loads = [c * install_days_per_machine for c in machine_counts]
-
-        # Assign training days as 1-day chunks.
-        for _ in range(training_days):
-            # Prefer adding to the most-loaded person who can still accept 1 day within window.
-            candidates = [i for i, d in enumerate(loads) if d + 1 <= window]
-            if candidates:
-                i = max(candidates, key=lambda j: loads[j])
-            else:
-                i = int(np.argmin(loads))
-            loads[i] += 1
-
-        if max(loads) <= window:
-            loads.sort(reverse=True)
-            return loads
-
-    # Best-effort fallback (should generally be prevented by validation).
-    loads = [install_days_per_machine] * qty
-    for _ in range(training_days):
-        i = int(np.argmin(loads))
-        loads[i] += 1
-    loads.sort(reverse=True)
-    return loads
-
 @dataclass
 class ModelInfo:
     item: str
@@ -180,61 +159,99 @@ class ModelInfo:
     training_applicable: bool = True
 
 
-@dataclass
-class LineSelection:
-    model: str
-    qty: int
-    training_required: bool
-
-
-@dataclass
-class RoleTotals:
-    headcount: int
-    total_onsite_days: int
-    onsite_days_by_person: List[int]
-    day_rate: float
-    labor_cost: float
-
-
-@dataclass
-class ExpenseLine:
-    description: str
-    quantity: float
-    unit_price: float
-    extended: float
-    details: str
-
-
-@dataclass
-class Assignment:
-    model: str
-    role: str  # "Technician" or "Engineer"
-    person_num: int
-    onsite_days: int
-    cost: float
+def _row_value(row: tuple, col: int):
+    """Value at 0-based `col` of a read-only row tuple (short rows read as empty)."""
+    return row[col] if col < len(row) else None
 
 
 class ExcelData:
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, progress=None, should_cancel=None):
         self.path = path
         self.models: Dict[str, ModelInfo] = {}
         self.rates: Dict[str, Dict[str, object]] = {}
         self.requirements: List[str] = []
+        self.qualifications = QualificationIndex.empty()
+        self._progress = progress
+        self._should_cancel = should_cancel
         self._load()
 
-    def _load(self):
-        wb = openpyxl.load_workbook(self.path, data_only=True)
+    def _step(self, message: str):
+        """Report progress and honour cancellation between load phases."""
+        if self._should_cancel is not None and self._should_cancel():
+            raise LoadCancelled(str(self.path))
+        if self._progress is not None:
+            self._progress(message)
 
-        # Models: Instal days by Model
-        if "Instal days by Model" not in wb.sheetnames:
-            raise ValueError("Missing sheet: 'Instal days by Model'")
-        ws = wb["Instal days by Model"]
+    @traced("workbook.load")
+    def _load(self):
+        """Load from the on-disk snapshot when it matches the workbook, else parse and refresh it."""
+        self._step(f"Checking {Path(self.path).name}…")
+        try:
+            key = source_key(self.path)
+        except OSError:
+            key = None
+        payload = load_snapshot(EXCEL_SNAPSHOT_KIND, key, EXCEL_SNAPSHOT_VERSION) if key is not None else None
+        if payload is None:
+            payload = self._parse()
+            self._step("Saving workbook snapshot…")
+            if key is not None:
+                save_snapshot(EXCEL_SNAPSHOT_KIND, key, EXCEL_SNAPSHOT_VERSION, payload)
+        self._apply_snapshot(payload)
+
+        self._step("Reading machine qualifications…")
+        try:
+            self.qualifications = load_qualifications(resolve_qualifications_path(self.path))
+        except Exception:
+            # Qualifications only refine crew grouping; pricing works without them.
+            self.qualifications = QualificationIndex.empty()
 
-        headers = {
-            str(ws.cell(1, c).value).strip(): c
-            for c in range(1, ws.max_column + 1)
-            if ws.cell(1, c).value is not None
+    def _apply_snapshot(self, payload: TDict[str, list]):
+        self.models = {
+            item: ModelInfo(item=item, tech_install_days_per_machine=tech_i, eng_days_per_machine=eng_i, training_applicable=train_app)
+            for item, tech_i, eng_i, train_app in payload["models"]
         }
+        self.rates = {
+            desc_s.lower(): {"description": desc_s, "unit_price": unit_f, "notes": notes}
+            for desc_s, unit_f, notes in payload["rates"]
+        }
+        self.requirements = list(payload["requirements"])
+        self.rate_resolver = RateResolver(self.rates, PRICING_RATE_KEYS)
+        from core.model_table import ModelTable
+
+        self.model_table = ModelTable(self.models)
+
+    @traced("workbook.parse")
+    def _parse(self) -> TDict[str, list]:
+        """Stream the three sheets we use (read-only, row iterators) into plain rows (the snapshot payload)."""
+        import openpyxl
+
+        self._step("Opening workbook…")
+        wb = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            if "Instal days by Model" not in wb.sheetnames:
+                raise ValueError("Missing sheet: 'Instal days by Model'")
+            self._step("Reading models…")
+            models = self._read_models(wb["Instal days by Model"].iter_rows(values_only=True))
+
+            if "Service Rates" not in wb.sheetnames:
+                raise ValueError("Missing sheet: 'Service Rates'")
+            self._step("Reading service rates…")
+            rates = self._read_rates(wb["Service Rates"].iter_rows(values_only=True))
+
+            requirements: List[str] = []
+            if "Requirements and Assumptions" in wb.sheetnames:
+                self._step("Reading requirements…")
+                requirements = self._read_requirements(wb["Requirements and Assumptions"].iter_rows(values_only=True))
+        finally:
+            wb.close()
+
+        return {"models": models, "rates": rates, "requirements": requirements}
+
+    @staticmethod
+    def _read_models(rows) -> List[tuple]:
+        """Models: Instal days by Model (header on the first row)."""
+        first = next(rows, None) or ()
+        headers = {str(v).strip(): c for c, v in enumerate(first) if v is not None}
 
         def find_col(pred):
             for k, c in headers.items():
@@ -262,15 +279,16 @@ class ExcelData:
                 return False
             return default
 
-        for r in range(2, ws.max_row + 1):
-            item = ws.cell(r, col_item).value
+        models = []
+        for row in rows:
+            item = _row_value(row, col_item)
             if item is None:
                 continue
             item = str(item).strip()
             if not item:
                 continue
-            tech = ws.cell(r, col_tech).value or 0
-            eng = ws.cell(r, col_eng).value or 0
+            tech = _row_value(row, col_tech) or 0
+            eng = _row_value(row, col_eng) or 0
             try:
                 tech_i = int(float(tech))
             except Exception:
@@ -279,63 +297,74 @@ class ExcelData:
                 eng_i = int(float(eng))
             except Exception:
                 eng_i = 0
-            train_app = _as_bool(ws.cell(r, col_train_app).value, default=True) if col_train_app is not None else True
-            self.models[item] = ModelInfo(item=item, tech_install_days_per_machine=tech_i, eng_days_per_machine=eng_i, training_applicable=train_app)
-
-        # Rates: Service Rates
-        if "Service Rates" not in wb.sheetnames:
-            raise ValueError("Missing sheet: 'Service Rates'")
-        ws = wb["Service Rates"]
-
-        header_row = None
-        for r in range(1, 15):
-            if str(ws.cell(r, 2).value).strip().lower() == "item" and str(ws.cell(r, 3).value).strip().lower() == "description":
-                header_row = r
-                break
-        if header_row is None:
-            header_row = 3
-
-        for r in range(header_row + 1, ws.max_row + 1):
-            desc = ws.cell(r, 3).value
+            train_app = _as_bool(_row_value(row, col_train_app), default=True) if col_train_app is not None else True
+            models.append((item, tech_i, eng_i, train_app))
+        return models
+
+    @staticmethod
+    def _read_rates(rows) -> List[tuple]:
+        """Rates: Service Rates (Item/Description header within the first 14 rows, else row 3)."""
+        def rate_row(row):
+            desc = _row_value(row, 2)
             if desc is None:
-                continue
+                return None
             desc_s = str(desc).strip()
             if not desc_s:
-                continue
-            unit = ws.cell(r, 6).value
-            notes = ws.cell(r, 7).value
+                return None
+            unit = _row_value(row, 5)
+            notes = _row_value(row, 6)
             try:
                 unit_f = float(unit)
             except Exception:
-                continue
-            self.rates[desc_s.lower()] = {
-                "description": desc_s,
-                "unit_price": unit_f,
-                "notes": str(notes).strip() if notes is not None else ""
-            }
-
-        # Requirements & Assumptions
-        if "Requirements and Assumptions" in wb.sheetnames:
-            ws = wb["Requirements and Assumptions"]
-            out = []
-            for r in range(1, ws.max_row + 1):
-                v = ws.cell(r, 3).value
-                if v is None:
+                return None
+            return (desc_s, unit_f, str(notes).strip() if notes is not None else "")
+
+        rates = []
+        header_row = None
+        pending = []  # rows seen while the header row is still undecided (at most 14)
+        for r, row in enumerate(rows, 1):
+            if header_row is None:
+                if r < 15:
+                    if str(_row_value(row, 1)).strip().lower() == "item" and str(_row_value(row, 2)).strip().lower() == "description":
+                        header_row = r
+                        pending = []
+                    else:
+                        pending.append((r, row))
                     continue
-                s = str(v).strip()
-                if s and not s.lower().startswith("assumptions and requirements"):
-                    out.append(s)
-            self.requirements = out
+                header_row = 3
+                rates.extend(x for x in (rate_row(pr) for pn, pr in pending if pn > header_row) if x)
+                pending = []
+            x = rate_row(row)
+            if x:
+                rates.append(x)
+        if header_row is None:
+            rates.extend(x for x in (rate_row(pr) for pn, pr in pending if pn > 3) if x)
+        return rates
+
+    @staticmethod
+    def _read_requirements(rows) -> List[str]:
+        out = []
+        for row in rows:
+            v = _row_value(row, 2)
+            if v is None:
+                continue
+            s = str(v).strip()
+            if s and not s.lower().startswith("assumptions and requirements"):
+                out.append(s)
+        return out
 
     def get_rate(self, key: str) -> Tuple[float, str]:
-        k = key.lower().strip()
-        if k in self.rates:
-            rv = self.rates[k]
-            return float(rv["unit_price"]), str(rv["description"])
-        for rk, rv in self.rates.items():
-            if k in rk:
-                return float(rv["unit_price"]), str(rv["description"])
-        raise KeyError(f"Rate not found for '{key}'")
+        return self.rate_resolver.resolve(key)
+
+    @property
+    def rate_issues(self) -> List[str]:
+        """Missing/ambiguous pricing rates found when the workbook was loaded."""
+        return self.rate_resolver.issues
+
+
+def load_workbook_async(path: Path, reload: bool = False) -> WorkbookLoadJob:
+    """Start (or join any tab's in-flight) background ExcelData load of `path`."""
+    return workbook_loader.load_workbook_async(path, ExcelData, reload=reload)
 
 
 class MachineLine(QFrame):
@@ -379,7 +408,38 @@ class MachineLine(QFrame):
         row.addWidget(self.btn_delete)
 
         self._model_changed()
-    def _model_changed(self, *_):
+    def set_models(self, models: List[str]):
+        """Replace the model list, keeping the current pick when it still exists."""
+        cur = self.cmb_model.currentText()
+        self.cmb_model.blockSignals(True)
+        self.cmb_model.clear()
+        self.cmb_model.addItem("— Select —")
+        self.cmb_model.addItems(models)
+        self.cmb_model.setCurrentIndex(models.index(cur) + 1 if cur in models else -1)
+        self.cmb_model.blockSignals(False)
+
+    def apply_model_changes(self, models: List[str], added: List[str], removed: List[str]) -> bool:
+        """Patch the model list in place (no signals). Returns True if this line's pick was removed."""
+        cur = self.cmb_model.currentText()
+        self.cmb_model.blockSignals(True)
+        for name in removed:
+            i = self.cmb_model.findText(name)
+            if i > 0:
+                self.cmb_model.removeItem(i)
+        # `models` is the new sorted list; inserting in that order keeps every index valid.
+        for name in sorted(added, key=models.index):
+            self.cmb_model.insertItem(models.index(name) + 1, name)
+        lost = cur in removed
+        if lost:
+            self.cmb_model.setCurrentIndex(-1)
+        self.cmb_model.blockSignals(False)
+        if lost:
+            self.sync_training(emit=False)
+        return lost
+
+    def sync_training(self, emit: bool = True):
+        """Show/hide the training checkbox for the current model's applicability."""
+        self.chk_training.blockSignals(not emit)
         model = self.cmb_model.currentText().strip()
         if model == "— Select —":
             model = ""
@@ -395,6 +455,10 @@ class MachineLine(QFrame):
                 self.chk_training.show()
                 if not self.chk_training.isChecked():
                     self.chk_training.setChecked(True)
+        self.chk_training.blockSignals(False)
+
+    def _model_changed(self, *_):
+        self.sync_training()
         self.on_change()
 
     def _changed(self, *_):
@@ -411,7 +475,8 @@ class MachineLine(QFrame):
         return LineSelection(
             model=model,
             qty=int(self.spin_qty.value()) if model else 0,
-            training_required=(bool(self.chk_training.isChecked()) if self.chk_training.isVisible() else False)
+            # isHidden(), not isVisible(): tabs that are not on screen recalc too and must price the same.
+            training_required=(bool(self.chk_training.isChecked()) if not self.chk_training.isHidden() else False)
         )
 
 
@@ -470,11 +535,13 @@ class Section(QFrame):
         t = QLabel(title)
         t.setObjectName("sectionTitle")
         title_box.addWidget(t)
+        self.subtitle: QLabel | None = None
         if subtitle:
             s = QLabel(subtitle)
             s.setObjectName("sectionSub")
             s.setWordWrap(True)
             title_box.addWidget(s)
+            self.subtitle = s
         head.addLayout(title_box, 1)
         lay.addLayout(head)
 
@@ -485,22 +552,275 @@ class Section(QFrame):
         lay.addWidget(self.content)
 
 
-def money(x: float) -> str:
-    return f"${x:,.0f}"
+def diagnostics_rows(window=None) -> List[Tuple[str, str]]:
+    """(metric, value) rows for the diagnostics view (plus `window`'s recalc counters, if given)."""
+    st = allocation_cache_stats()
+    lookups = st["hits"] + st["misses"]
+    rows = [
+        ("Allocation cache hits", f"{st['hits']:,}"),
+        ("Allocation cache misses", f"{st['misses']:,}"),
+        ("Allocation cache hit rate", f"{st['hits'] / lookups:.1%}" if lookups else "—"),
+        ("Allocation cache entries", f"{st['size']:,} / {st['max_size']:,}"),
+        ("Phase timing", "recording" if SPANS.enabled else "off"),
+    ]
+    scheduler = getattr(window, "_recalc_scheduler", None)
+    if scheduler is not None:
+        rc = scheduler.stats()
+        rows += [
+            ("Recalcs requested", f"{rc['requested']:,}"),
+            ("Recalcs run (scheduled)", f"{rc['runs']:,}"),
+            ("Recalcs coalesced", f"{rc['coalesced']:,}"),
+        ]
+    return rows
+
+
+class DiagnosticsDialog(QDialog):
+    """Internal counters and phase timings for support and performance checks (Ctrl+Shift+D; not in any menu)."""
+    REFRESH_MS = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(620, 560)
+        lay = QVBoxLayout(self)
+        self.tbl = QTableWidget(0, 2)
+        self.tbl.setHorizontalHeaderLabels(["Metric", "Value"])
+        self.tbl.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tbl.verticalHeader().setVisible(False)
+        self.tbl.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        lay.addWidget(self.tbl)
+
+        # Phase timings: percentiles over each phase's recent spans, exportable as a Chrome trace.
+        controls = QHBoxLayout()
+        self.chk_timing = QCheckBox("Record phase timings")
+        self.chk_timing.setChecked(SPANS.enabled)
+        self.chk_timing.toggled.connect(self._set_timing)
+        controls.addWidget(self.chk_timing)
+        controls.addStretch(1)
+        btn_clear = QPushButton("Clear")
+        btn_clear.clicked.connect(lambda: (SPANS.clear(), self.refresh()))
+        controls.addWidget(btn_clear)
+        btn_export = QPushButton("Export Chrome trace…")
+        btn_export.setToolTip("Save recorded phases as JSON for chrome://tracing or ui.perfetto.dev.")
+        btn_export.clicked.connect(lambda: self.export_trace())
+        controls.addWidget(btn_export)
+        lay.addLayout(controls)
+        self.tbl_spans = QTableWidget(0, 6)
+        self.tbl_spans.setHorizontalHeaderLabels(["Phase", "Count", "p50 ms", "p90 ms", "p99 ms", "Max ms"])
+        self.tbl_spans.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tbl_spans.verticalHeader().setVisible(False)
+        self.tbl_spans.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        lay.addWidget(self.tbl_spans)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+        self.refresh()
+
+    def _set_timing(self, on: bool):
+        SPANS.enabled = on
+        self.refresh()
+
+    def refresh(self):
+        self._fill(self.tbl, diagnostics_rows(self.parent()))
+        self._fill(self.tbl_spans, [
+            (name, f"{count:,}", f"{p50:.2f}", f"{p90:.2f}", f"{p99:.2f}", f"{top:.2f}")
+            for name, count, p50, p90, p99, top in SPANS.stats()
+        ])
+
+    @staticmethod
+    def _fill(tbl: QTableWidget, rows: List[tuple]):
+        tbl.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                it = QTableWidgetItem(value)
+                if c > 0:
+                    it.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                tbl.setItem(r, c, it)
+
+    def export_trace(self, path: str | None = None) -> int:
+        """Write recorded spans as a Chrome trace (asks where when `path` is None); returns spans written."""
+        if path is None:
+            path, _ = QFileDialog.getSaveFileName(
+                self, "Export Chrome trace", str(Path.home() / "quote_pro_trace.json"), "Chrome trace (*.json)"
+            )
+            if not path:
+                return 0
+        try:
+            n = SPANS.export_chrome_trace(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Export failed", str(e))
+            return 0
+        return n
+
+
+def crew_packing_summary(role: str, res: PackResult) -> str:
+    """One line on how a role's shared crew compares with dedicated crews and the lower bound."""
+    if res.used_fallback:
+        if res.optimal:
+            why = "already the minimum"
+        elif res.timed_out:
+            why = "no smaller shared crew found within the time limit"
+        else:
+            why = "no smaller shared crew found"
+        return f"{role}s: {res.dedicated_headcount} dedicated ({why})."
+    bound = "optimal" if res.optimal else f"lower bound {res.lower_bound}, at most {res.gap} above it"
+    return f"{role}s: {res.headcount} shared instead of {res.dedicated_headcount} dedicated ({bound})."
+
+
+def machine_row_cells(r: TDict[str, object]) -> Tuple[str, str, str, str, str, str]:
+    """Model, qty, tech days, eng days and headcounts as shown in the breakdown table and the printed quote.
+
+    Training display rules:
+    - If training is not applicable for this model, hide all training UI/labels.
+    - If applicable but user unchecked training, show “(training excluded)”.
+    """
+    if not r.get("training_applicable", True):
+        tech_disp = str(r["tech_total"])
+    else:
+        if r.get("training_required", True):
+            tech_disp = f"{r['tech_total']} (incl. {r['training_days']} Train)" if r.get("training_days", 0) > 0 else str(r["tech_total"])
+        else:
+            tech_disp = f"{r['tech_total']} (training excluded)"
+
+    if r["eng_total"] == 0:
+        eng_disp = "—"
+    elif not r.get("training_applicable", True):
+        eng_disp = str(r["eng_total"])
+    else:
+        eng_tp = r.get("eng_training_potential", 0)
+        eng_td = r.get("eng_training_days", 0)
+        if r.get("training_required", True):
+            eng_disp = f"{r['eng_total']} (incl. {eng_td} Train)" if (eng_tp > 0 and eng_td > 0) else str(r["eng_total"])
+        else:
+            eng_disp = f"{r['eng_total']} (training excluded)" if eng_tp > 0 else str(r["eng_total"])
+
+    return (str(r["model"]), str(r["qty"]), tech_disp, eng_disp,
+            str(r["tech_headcount"]) if r["tech_headcount"] else "—",
+            str(r["eng_headcount"]) if r["eng_headcount"] else "—")
+
+
+def quote_machine_row(r: TDict[str, object]) -> str:
+    """One Machine Breakdown row of the printed quote."""
+    model, qty, tech_disp, eng_disp, tech_hc, eng_hc = machine_row_cells(r)
+    return f"""<tr>
+                <td>{model}</td>
+                <td style="text-align:center;">{qty}</td>
+                <td>{tech_disp}</td>
+                <td style="text-align:center;">{eng_disp}</td>
+                <td style="text-align:center;">{tech_hc}</td>
+                <td style="text-align:center;">{eng_hc}</td>
+            </tr>"""
+
+
+# Printed quote layout, parsed once; build_quote_html fills it from the calc result.
+QUOTE_TEMPLATE = QuoteTemplate("""<html><head><meta charset="utf-8" />
+<style>
+    body { font-family: Arial, Helvetica, sans-serif; font-size: 10pt; color: #0F172A; }
+    .topbar { display:flex; align-items:flex-start; justify-content:space-between; border-bottom: 3px solid #F05A28; padding-bottom: 10px; margin-bottom: 14px; }
+    .logo { text-align:right; }
+    .title { font-size: 18pt; font-weight: 800; color: #4c4b4c; margin: 0; }
+    .subtitle { margin: 4px 0 0 0; color: #6D6E71; }
+    .grid { width: 100%; border-collapse: collapse; margin-top: 10px; }
+    .grid th { background: #343551; color: white; text-align: left; padding: 8px; border-bottom: 1px solid #E2E8F0; }
+    .grid td { padding: 8px; border-bottom: 1px solid #E2E8F0; }
+    .box { border: 1px solid #E6E8EB; border-radius: 10px; padding: 10px; background: rgba(103,144,160,0.18); }
+    .two { display: table; width: 100%; }
+    .two > div { display: table-cell; width: 50%; vertical-align: top; padding-right: 10px; }
+    h3 { color: #4c4b4c; margin: 18px 0 8px 0; }
+    .right { text-align: right; }
+    .muted { color: #6D6E71; }
+    .total { font-size: 16pt; font-weight: 900; color: #4c4b4c; }
+</style></head><body>
+    <div class="topbar">
+        <div>
+            <p class="title">Commissioning Budget Quote</p>
+            <p class="subtitle muted">Service Estimate</p>
+        </div>
+        <div class="logo">$logo_html</div>
+    </div>
+
+    <div class="two">
+        <div class="box">
+            <b>DATE</b><br/>$date_str<br/><br/>
+            <b>TOTAL PERSONNEL</b><br/>$headcount ($tech_headcount Tech, $eng_headcount Eng)
+        </div>
+        <div class="box">
+            <b>QUOTE VALIDITY</b><br/>$valid_str<br/><br/>
+            <b>ESTIMATED DURATION</b><br/>$max_onsite days onsite + $travel_days travel days
+        </div>
+    </div>
+    <div class="section-spacer"></div>
+
+    <h3>Machine Breakdown</h3>
+    <table class="grid">
+        <tr><th>Model</th><th style="text-align:center;">Qty</th><th>Tech Days</th><th style="text-align:center;">Eng Days</th>
+            <th style="text-align:center;">Technicians</th><th style="text-align:center;">Engineers</th></tr>
+        $machine_rows
+    </table>
+
+    <h3>Labor Costs</h3>
+    <table class="grid">
+        <tr><th>Item</th><th class="right">Extended</th></tr>
+        <tr><td>Tech. Regular Time ($tech_days days × $tech_day_rate/day)</td><td class="right">$tech_labor</td></tr>
+        <tr><td>Eng. Regular Time ($eng_days days × $eng_day_rate/day)</td><td class="right">$eng_labor</td></tr>
+        <tr><td><b>Labor Subtotal</b></td><td class="right"><b>$labor_sub</b></td></tr>
+    </table>
+
+    <h3>Estimated Expenses</h3>
+    <div class="muted">Includes $trip_days total trip day(s) across personnel (onsite + travel days).</div>
+    <table class="grid">
+        <tr><th>Expense</th><th>Details</th><th class="right">Amount</th></tr>
+        $exp_rows
+        <tr><td><b>Expenses Subtotal</b></td><td>—</td><td class="right"><b>$exp_total</b></td></tr>
+    </table>
+
+    <h3>Estimated Total</h3>
+    <div class="box">
+        <span class="total">$grand_total</span><br/>
+        <span class="muted">Labor ($labor_sub) + Expenses ($exp_total)</span>
+    </div>
+
+    <h3>Terms & Conditions</h3>
+    <ul>
+        <li><b>Pricing & Quote Expiration:</b> Prices shown reflect an estimate of days and expenses. Any additional time will be billed at the rates shown. Quote valid for 30 days.</li>
+        <li><b>Customer Install Window:</b> No individual technician or engineer is assigned more than $window onsite days per trip.</li>
+        <li><b>Training:</b> Training days are calculated at 1 day per $training_per_day machines of the same model type. Training can be excluded per machine if not required (customer request only).</li>
+        <li><b>Machine-Specific Skills:</b> $skills_term</li>
+        <li><b>Travel Days:</b> Expenses include $travel_days travel days (1 day travel-in + 1 day travel-out) in addition to onsite work days.</li>
+    </ul>
+    $req_html
+</body></html>""", travel_days=TRAVEL_DAYS_PER_PERSON, training_per_day=TRAINING_MACHINES_PER_DAY)
 
 
 class MainWindow(QMainWindow):
+    @traced("window.init")
     def __init__(self):
         super().__init__()
         self.setWindowTitle(APP_TITLE)
         self.resize(1920, 1200)
 
-        if not DEFAULT_EXCEL or not Path(DEFAULT_EXCEL).exists():
+        # All tabs share one parsed workbook per path; start from whichever was published last.
+        excel_path = WORKBOOKS.active_path or default_excel_path()
+        if not excel_path or not Path(excel_path).exists():
             raise FileNotFoundError("Missing required workbook: Tech days and quote rates.xlsx")
-        self.data = ExcelData(Path(DEFAULT_EXCEL))
-        self.models_sorted = sorted(self.data.models.keys())
-        self.training_app_map = {k: bool(v.training_applicable) for k, v in self.data.models.items()}
+        # Widgets are built first; the workbook fills in model pickers/rates when it arrives.
+        self.data: ExcelData | None = None
+        self._workbook_path = Path(excel_path)
+        self._load_error: str | None = None
+        self.models_sorted: List[str] = []
+        self.training_app_map: Dict[str, bool] = {}
         self.lines: List[MachineLine] = []
+        # Input changes only mark the window dirty; bursts collapse into one recalc.
+        self._recalc_scheduler = RecalcScheduler(lambda: self.recalc(), parent=self)
+        # Per-line pricing results, reused by recalcs until a line's inputs change.
+        self._line_cache: dict = {}
+        # (tech, eng, exp_lines, meta) priced by the last successful recalc; every view reads this.
+        self.last_quote: Optional[tuple] = None
+        # Quote state handed to restore_quote_state before the workbook arrived.
+        self._pending_quote_state: Optional[dict] = None
+        WORKBOOKS.subscribe(self._on_workbook_published)
 
         central_container = QWidget()
         root = QVBoxLayout(central_container)
@@ -524,6 +844,15 @@ class MainWindow(QMainWindow):
         self.lbl_title.setObjectName("appTitle")
         h.addWidget(self.lbl_title)
         h.addStretch(1)
+        self.lbl_loading = QLabel("")
+        self.lbl_loading.setObjectName("loadingNote")
+        self.lbl_loading.hide()
+        h.addWidget(self.lbl_loading)
+        self.btn_retry_load = QPushButton("Retry")
+        self.btn_retry_load.setToolTip("Try loading the rates workbook again.")
+        self.btn_retry_load.clicked.connect(self.retry_workbook_load)
+        self.btn_retry_load.hide()
+        h.addWidget(self.btn_retry_load)
         btn_load = QPushButton("Load Excel…")
         btn_load.setToolTip("Load a different Excel workbook (will replace the bundled rates/models for this session).")
         btn_load.clicked.connect(self.open_excel)
@@ -553,7 +882,7 @@ class MainWindow(QMainWindow):
 
         left_l.addWidget(QLabel(
             "Add machines to estimate commissioning requirements.\\n"
-            "Each machine type requires dedicated personnel (no sharing across types)."
+            "Each machine type requires dedicated personnel unless crew sharing is enabled below."
         ))
 
         win_box = QFrame()
@@ -564,12 +893,21 @@ class MainWindow(QMainWindow):
         self.spin_window = QSpinBox()
         self.spin_window.setRange(MIN_INSTALL_WINDOW, MAX_INSTALL_WINDOW)
         self.spin_window.setValue(DEFAULT_INSTALL_WINDOW)
-        self.spin_window.valueChanged.connect(self.recalc)
+        self.spin_window.valueChanged.connect(self.schedule_recalc)
         win_l.addStretch(1)
         win_l.addWidget(self.spin_window)
         win_l.addWidget(QLabel("days"))
         left_l.addWidget(win_box)
 
+        self.chk_share_crews = QCheckBox("Share qualified personnel across machine types")
+        self.chk_share_crews.setToolTip(
+            "Let one technician or engineer cover several models when the qualification matrix allows it.\n"
+            "Needs the machine qualifications workbook."
+        )
+        self.chk_share_crews.setEnabled(False)
+        self.chk_share_crews.toggled.connect(self.schedule_recalc)
+        left_l.addWidget(self.chk_share_crews)
+
         self.scroll = QScrollArea()
         self.scroll.setWidgetResizable(True)
         container = QWidget()
@@ -633,25 +971,47 @@ class MainWindow(QMainWindow):
         self.alert.hide()
         right_l.addWidget(self.alert)
 
-        self.tbl_breakdown = self.make_table(["Model", "Qty", "Tech Days", "Eng Days", "Technicians", "Engineers"])
-        self.tbl_assign = self.make_table(["Machine Type", "Role", "Person #", "Assigned Days", "Cost"])
-        self.tbl_labor = self.make_table(["Role", "Daily Rate", "Total Days", "Personnel", "Total Cost"])
-        self.tbl_exp = self.make_table(["Expense", "Details", "Amount"])
+        # Workbook problems found at load time; unlike the alert, this survives recalcs.
+        self.lbl_workbook_issues = QLabel("")
+        self.lbl_workbook_issues.setObjectName("workbookIssues")
+        self.lbl_workbook_issues.setWordWrap(True)
+        self.lbl_workbook_issues.hide()
+        right_l.addWidget(self.lbl_workbook_issues)
+
+        self.tbl_breakdown = self.make_table(
+            ["Model", "Qty", "Tech Days", "Eng Days", "Technicians", "Engineers"],
+            align={1: Qt.AlignCenter, 4: Qt.AlignCenter, 5: Qt.AlignCenter},
+            # Rows end with a "training required" flag that highlights the tech days.
+            foreground=lambda c, row: QColor(Qt.darkYellow) if c == 2 and row[-1] else None,
+        )
+        self.tbl_assign = self.make_table(
+            ["Machine Type", "Role", "Person #", "Assigned Days", "Cost"],
+            align={2: Qt.AlignCenter, 3: Qt.AlignCenter, 4: Qt.AlignRight | Qt.AlignVCenter},
+        )
+        self.tbl_labor = self.make_table(
+            ["Role", "Daily Rate", "Total Days", "Personnel", "Total Cost"],
+            align={2: Qt.AlignCenter, 3: Qt.AlignCenter, 4: Qt.AlignRight | Qt.AlignVCenter},
+        )
+        self.tbl_exp = self.make_table(["Expense", "Details", "Amount"], align={2: Qt.AlignRight | Qt.AlignVCenter})
         self.tbl_exp.setMinimumHeight(0)
 
         sec_breakdown = Section("Machine Breakdown", "Days and personnel required per machine model", "🧩")
         sec_breakdown.content_layout.addWidget(self.tbl_breakdown)
-
-        sec_assign = Section("Personnel Assignments", "Each machine type has dedicated personnel.", "👥")
+        self.lbl_crew_groups = QLabel("")
+        self.lbl_crew_groups.setObjectName("sectionSub")
+        self.lbl_crew_groups.setWordWrap(True)
+        self.lbl_crew_groups.hide()
+        sec_breakdown.content_layout.addWidget(self.lbl_crew_groups)
+
+        sec_assign = Section("Personnel Assignments", "Each machine type is priced with dedicated personnel.", "👥")
+        self.sec_assign = sec_assign
         sec_assign.content_layout.addWidget(self.tbl_assign)
 
         sec_labor = Section("Labor Costs", "Labor costs by role at daily rates (8 hours/day).", "🛠")
         sec_labor.content_layout.addWidget(self.tbl_labor)
 
         # Workload bar chart (bonus visual)
-        self.chart = QChart()
-        self.chart_view = QChartView(self.chart)
-        self.chart_view.setRenderHint(QPainter.Antialiasing)
+        self.chart_view = WorkloadChart()
         self.chart_view.setMinimumHeight(300)
         sec_chart = Section("Workload", "Days onsite per person (T=Tech, E=Engineer).", "📊")
         sec_chart.content_layout.addWidget(self.chart_view)
@@ -659,6 +1019,23 @@ class MainWindow(QMainWindow):
         # Left side: put chart under Machine Configuration so the right-side widgets stay readable
         left_l.addWidget(sec_chart)
 
+        # Install window options: the quote priced under every window, cheapest highlighted
+        self._sweep: "SweepResult | None" = None
+        self._sweep_key: Optional[tuple] = None  # inputs self._sweep was priced from
+        self.sweep_chart = CostCurveChart((MIN_INSTALL_WINDOW, MAX_INSTALL_WINDOW), "Install window (days)")
+        self.sweep_chart.setMinimumHeight(240)
+        self.lbl_sweep = QLabel("")
+        self.lbl_sweep.setObjectName("sectionSub")
+        self.lbl_sweep.setWordWrap(True)
+        self.btn_use_best_window = QPushButton("Use cheapest window")
+        self.btn_use_best_window.clicked.connect(self.use_best_window)
+        self.btn_use_best_window.setEnabled(False)
+        sec_sweep = Section("Install Window Options", "Estimated total cost for every customer install window.", "📈")
+        sec_sweep.content_layout.addWidget(self.sweep_chart)
+        sec_sweep.content_layout.addWidget(self.lbl_sweep)
+        sec_sweep.content_layout.addWidget(self.btn_use_best_window)
+        left_l.addWidget(sec_sweep)
+
         right_l.addWidget(sec_breakdown)
         right_l.addWidget(sec_assign)
         right_l.addWidget(sec_labor)
@@ -704,11 +1081,35 @@ class MainWindow(QMainWindow):
         self._is_stacked = False
         self._apply_responsive_layout()
 
-    def make_table(self, headers: List[str]) -> QTableWidget:
-        tbl = QTableWidget(0, len(headers))
-        tbl.setHorizontalHeaderLabels(headers)
+        self._diagnostics: DiagnosticsDialog | None = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.show_diagnostics)
+
+        self._attach_workbook(Path(excel_path))
+
+    def schedule_recalc(self, *_):
+        """Recalc on a following event-loop turn, folding in any other changes made meanwhile."""
+        self._recalc_scheduler.request()
+
+    def flush_recalc(self):
+        """Apply a scheduled recalc now (before acting on the displayed results)."""
+        self._recalc_scheduler.flush()
+
+    def show_diagnostics(self):
+        if self._diagnostics is None:
+            self._diagnostics = DiagnosticsDialog(self)
+        self._diagnostics.refresh()
+        self._diagnostics.show()
+        self._diagnostics.raise_()
+
+    def make_table(self, headers: List[str], align=None, foreground=None, background=None) -> QTableView:
+        """Results table backed by a RowTableModel (fill it with set_table_rows)."""
+        tbl = QTableView()
+        tbl.setModel(RowTableModel(headers, align=align, foreground=foreground, background=background, parent=tbl))
         tbl.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         tbl.verticalHeader().setVisible(False)
+        # Fixed row heights: no per-row size hints to compute however many rows there are.
+        tbl.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        tbl.verticalHeader().setDefaultSectionSize(TABLE_ROW_HEIGHT)
         tbl.setEditTriggers(QAbstractItemView.NoEditTriggers)
         tbl.setSelectionBehavior(QAbstractItemView.SelectRows)
         tbl.setSelectionMode(QAbstractItemView.SingleSelection)
@@ -718,6 +1119,7 @@ class MainWindow(QMainWindow):
         tbl.setMinimumHeight(120)
         return tbl
 
+    @traced("window.apply_theme")
     def apply_theme(self):
         # Pearson-ish palette (navy + orange + neutral)
         blue = "#4B4F54"   # charcoal gray (logo text)
@@ -727,6 +1129,7 @@ class MainWindow(QMainWindow):
         css = """
         QFrame#header { background: __BLUE__; color: white; border: none; }
         QLabel#appTitle { color: white; font-size: 20px; font-weight: 800; }
+        QLabel#loadingNote { color: white; font-size: 12px; padding-right: 8px; }
         QFrame#panel { background: white; border: 1px solid #E6E8EB; border-radius: 14px; }
         QLabel#panelTitle { font-size: 16px; font-weight: 800; color: #0F172A; }
         QFrame#softBox { background: #FFF7EA; border: 1px solid #F0D8A8; border-radius: 12px; }
@@ -756,7 +1159,7 @@ class MainWindow(QMainWindow):
         QLabel#sectionIcon { background: #EEF2F7; border-radius: 10px; font-size: 14px; }
         QLabel#sectionTitle { font-size: 15px; font-weight: 900; color: #0F172A; }
         QLabel#sectionSub { font-size: 12px; color: __NEUTRAL__; }
-        QTableWidget#table {
+        QTableView#table {
             background: #FFFFFF;
             border: 1px solid #EEF0F2;
             border-radius: 12px;
@@ -781,6 +1184,13 @@ class MainWindow(QMainWindow):
             padding: 10px;
             border-radius: 12px;
         }
+        QLabel#workbookIssues {
+            background: #FFF7EA;
+            border: 1px solid #F0D8A8;
+            color: #7C2D12;
+            padding: 10px;
+            border-radius: 12px;
+        }
         QFrame#machineLine { background: #FFFFFF; border: 1px solid #E6E8EB; border-radius: 12px; }
         """
 
@@ -788,31 +1198,74 @@ class MainWindow(QMainWindow):
         self.setStyleSheet(css)
 
     def reset_views(self):
+        self.last_quote = None
         self.card_tech.set_value("0", "0 total days")
         self.card_eng.set_value("0", "0 total days")
         self.card_window.set_value(f"{self.spin_window.value()}", "")
         self.card_total.set_value("—", "labor + expenses")
         self.lbl_total_val.setText("—")
         for tbl in [self.tbl_breakdown, self.tbl_assign, self.tbl_labor, self.tbl_exp]:
-            tbl.setRowCount(0)
+            self.set_table_rows(tbl, [])
         self.lbl_exp_hdr.setText("")
+        self.lbl_crew_groups.hide()
         self.btn_print.setEnabled(False)
         self.alert.hide()
         self.alert.setText("")
-        if hasattr(self, 'chart'):
-            try:
-                self.chart.removeAllSeries()
-                self.chart.setTitle('Workload (onsite days)')
-            except Exception:
-                pass
+        if self.data is None and self._load_error is not None:
+            # A failed load stays visible until a workbook arrives, even with no machines added.
+            self.alert.setText(f"Excel load error: {self._load_error}")
+            self.alert.show()
+        if hasattr(self, "chart_view"):
+            self.chart_view.clear()
+        self._show_window_sweep(None)  # recalc re-shows it; only the display is cleared here
 
     def add_line(self):
+        self._append_line()
+        self.recalc()
+
+    def _append_line(self) -> MachineLine:
         if self.empty_hint is not None:
             self.empty_hint.hide()
-        ln = MachineLine(self.models_sorted, self.training_app_map, on_change=self.recalc, on_delete=self.delete_line)
+        ln = MachineLine(self.models_sorted, self.training_app_map, on_change=self.schedule_recalc, on_delete=self.delete_line)
         self.lines.append(ln)
         self.lines_layout.addWidget(ln)
-        self.recalc()
+        return ln
+
+    def quote_state(self) -> dict:
+        """The user's inputs as plain values (see restore_quote_state)."""
+        if self._pending_quote_state is not None:
+            return self._pending_quote_state
+        return {
+            "window": int(self.spin_window.value()),
+            "share_crews": self.chk_share_crews.isChecked(),
+            # The checkbox itself, not value(): value() treats a hidden (not applicable) checkbox as unchecked.
+            "lines": [(ln.cmb_model.currentText() if ln.cmb_model.currentIndex() > 0 else "",
+                       int(ln.spin_qty.value()), ln.chk_training.isChecked()) for ln in self.lines],
+        }
+
+    def restore_quote_state(self, state: dict):
+        """Rebuild the inputs saved by quote_state and recalc once (deferred until the workbook loads)."""
+        if self.data is None:
+            self._pending_quote_state = state
+            return
+        self._pending_quote_state = None
+        for ln in list(self.lines):
+            self.lines.remove(ln)
+            ln.setParent(None)
+            ln.deleteLater()
+        self.spin_window.setValue(state["window"])
+        self.chk_share_crews.setChecked(state["share_crews"] and self.chk_share_crews.isEnabled())
+        for model, qty, training in state["lines"]:
+            ln = self._append_line()
+            if model:
+                ln.cmb_model.setCurrentText(model)
+            ln.spin_qty.setValue(qty)
+            ln.chk_training.setChecked(training)
+        if self.lines:
+            self.recalc()
+        else:
+            self.empty_hint.show()
+            self.reset_views()
 
     def delete_line(self, ln: MachineLine):
         self.lines.remove(ln)
@@ -841,153 +1294,177 @@ class MainWindow(QMainWindow):
         fp, _ = QFileDialog.getOpenFileName(self, "Select Excel file", "", "Excel (*.xlsx)")
         if not fp:
             return
-        try:
-            self.data = ExcelData(Path(fp))
-            self.models_sorted = sorted(self.data.models.keys())
-            for ln in self.lines:
-                cur = ln.cmb_model.currentText()
-                ln.cmb_model.blockSignals(True)
-                ln.cmb_model.clear()
-                ln.cmb_model.addItems(self.models_sorted)
-                if cur in self.models_sorted:
-                    ln.cmb_model.setCurrentIndex(self.models_sorted.index(cur))
-                ln.cmb_model.blockSignals(False)
+        job = load_workbook_async(Path(fp), reload=True)
+        dlg = QProgressDialog(f"Loading {Path(fp).name}…", "Cancel", 0, 0, self)
+        dlg.setWindowTitle("Load Excel")
+        dlg.setWindowModality(Qt.WindowModal)
+        dlg.setMinimumDuration(250)
+        dlg.canceled.connect(job.cancel)
+        job.progress.connect(dlg.setLabelText)
+        for sig in (job.loaded, job.failed):
+            sig.connect(dlg.reset)
+            sig.connect(dlg.deleteLater)
+        dlg.canceled.connect(dlg.deleteLater)
+        job.failed.connect(self._on_excel_load_failed)
+        # Loaded data is published through WORKBOOKS, which reaches this window as a subscriber.
+
+    def _on_excel_load_failed(self, message: str):
+        QMessageBox.critical(self, "Excel load error", message)
+
+    def _attach_workbook(self, path: Path):
+        """Use already-loaded shared data for `path`, or load it in the background."""
+        self._workbook_path = Path(path)
+        data = WORKBOOKS.peek(path)
+        if data is not None:
+            self._set_workbook(data)
+            return
+        self._load_error = None
+        self.btn_retry_load.hide()
+        self._set_workbook_loading(True)
+        job = load_workbook_async(path)
+        job.failed.connect(self._on_startup_load_failed)
+
+    def _on_startup_load_failed(self, message: str):
+        # Ignore late failures once another load (e.g. "Load Excel…" in any tab) has succeeded.
+        if self.data is not None:
+            return
+        self._set_workbook_loading(False)
+        self._load_error = message or "unknown error"
+        self.btn_retry_load.show()
+        self.recalc()
+
+    def retry_workbook_load(self):
+        self._attach_workbook(self._workbook_path)
+
+    def _set_workbook_loading(self, loading: bool):
+        self.lbl_loading.setText("Loading rates workbook…" if loading else "")
+        self.lbl_loading.setVisible(loading)
+
+    def _on_workbook_published(self, data: ExcelData):
+        if data is not self.data:
+            self._set_workbook(data)
+
+    def _set_workbook(self, data: ExcelData):
+        """Switch this window to shared workbook data, touching only what the change affects."""
+        old = self.data
+        self.data = WORKBOOKS.acquire(data.path, ExcelData)
+        if old is not None:
+            WORKBOOKS.release(old.path)
+        self._set_workbook_loading(False)
+        self._load_error = None
+        self.btn_retry_load.hide()
+        self._show_workbook_issues()
+        self.chk_share_crews.setEnabled(bool(self.data.qualifications))
+        diff = diff_workbooks(old, self.data) if old is not None else None
+        self.models_sorted = sorted(self.data.models.keys())
+        # MachineLines hold a reference to this map, so update it in place.
+        self.training_app_map.clear()
+        self.training_app_map.update({k: bool(v.training_applicable) for k, v in self.data.models.items()})
+        if diff is None:
+            self._refresh_line_models()
+        else:
+            self._apply_workbook_diff(diff, old)
+        if self._pending_quote_state is not None:
+            self.restore_quote_state(self._pending_quote_state)
+        elif diff is None or not diff.is_empty():
             self.recalc()
-        except Exception as e:
-            QMessageBox.critical(self, "Excel load error", str(e))
+
+    def _show_workbook_issues(self):
+        """List missing/ambiguous pricing rates of the current workbook (hidden when there are none)."""
+        issues = self.data.rate_issues if self.data is not None else []
+        self.lbl_workbook_issues.setText(
+            f"Check {Path(self.data.path).name}:\n" + "\n".join(f"• {msg}" for msg in issues) if issues else ""
+        )
+        self.lbl_workbook_issues.setVisible(bool(issues))
+
+    def _refresh_line_models(self):
+        for ln in self.lines:
+            ln.set_models(self.models_sorted)
+
+    def _apply_workbook_diff(self, diff: WorkbookDiff, old: ExcelData):
+        """Patch only the model pickers/training toggles affected by a workbook change."""
+        flipped = {
+            k for k in diff.changed_models
+            if old.models[k].training_applicable != self.data.models[k].training_applicable
+        }
+        for ln in self.lines:
+            if diff.model_names_changed:
+                ln.apply_model_changes(self.models_sorted, diff.added_models, diff.removed_models)
+            if flipped and ln.value().model in flipped:
+                ln.sync_training(emit=False)
+
+    def release_workbook(self):
+        """Give up this window's reference to the shared workbook."""
+        WORKBOOKS.unsubscribe(self._on_workbook_published)
+        if getattr(self, "data", None) is not None:
+            WORKBOOKS.release(self.data.path)
+            self.data = None
 
     def calc(self):
-        selections = [ln.value() for ln in self.lines]
-        selections = [s for s in selections if s.qty > 0 and s.model and s.model in self.data.models]
+        if self.data is None:
+            if self._load_error is not None:
+                raise ValueError(
+                    f"Excel load error: {self._load_error}\n"
+                    "Click “Retry” or use “Load Excel…” to choose another workbook."
+                )
+            raise ValueError("Rates workbook is still loading…")
+        selections = self._priced_selections()
         if not selections:
             raise ValueError("No machines selected. Click “Add Machine” to begin.")
+        quote = price_quote(
+            selections,
+            int(self.spin_window.value()),
+            self.data.models,
+            RateCard.from_lookup(self.data.get_rate),
+            self.data.qualifications,
+            share_crews=self.crew_sharing_enabled(),
+            line_cache=self._line_cache,
+        )
+        return quote.astuple()
 
-        window = int(self.spin_window.value())
+    def crew_sharing_enabled(self) -> bool:
+        return self.chk_share_crews.isChecked() and self.data is not None and bool(self.data.qualifications)
 
-        tech_hr, _ = self.data.get_rate("tech. regular time")
-        eng_hr, _ = self.data.get_rate("eng. regular time")
-        hours_per_day = 8
-        tech_day_rate = tech_hr * hours_per_day
-        eng_day_rate = eng_hr * hours_per_day
-
-        machine_rows = []
-        assignments: List[Assignment] = []
-        tech_all: List[int] = []
-        eng_all: List[int] = []
-
-        for s in selections:
-            mi = self.data.models[s.model]
-            base_training = ceil_int(s.qty / TRAINING_MACHINES_PER_DAY) if mi.training_applicable else 0
-            training_days = base_training if s.training_required else 0
-
-            tech_install_total = mi.tech_install_days_per_machine * s.qty
-            tech_total = tech_install_total + training_days
-            eng_training_potential = base_training if (mi.eng_days_per_machine > 0) else 0
-            eng_training_days = eng_training_potential if s.training_required else 0
-            eng_total = (mi.eng_days_per_machine * s.qty) + eng_training_days
-
-            single_training = 1 if (s.training_required and mi.training_applicable) else 0
-            if mi.tech_install_days_per_machine + single_training > window:
-                raise ValueError(f"{s.model}: Install ({mi.tech_install_days_per_machine}) + Training ({single_training}) exceeds the Customer Install Window ({window}).")
-            if mi.eng_days_per_machine > 0:
-                single_eng_training = 1 if (s.training_required and mi.eng_days_per_machine > 0) else 0
-                if mi.eng_days_per_machine + single_eng_training > window:
-                    raise ValueError(
-                        f"{s.model}: Engineer ({mi.eng_days_per_machine}) + Training ({single_eng_training}) exceeds the Customer Install Window ({window})."
-                    )
-
-            tech_headcount = 0
-            eng_headcount = 0
-
-            if tech_total > 0:
-                tech_alloc = chunk_allocate_by_machine(mi.tech_install_days_per_machine, s.qty, training_days, window)
-                tech_headcount = len(tech_alloc)
-                tech_all.extend(tech_alloc)
-                for i, d in enumerate(tech_alloc, 1):
-                    assignments.append(Assignment(s.model, "Technician", i, d, d * tech_day_rate))
-
-            if eng_total > 0:
-                eng_alloc = chunk_allocate_by_machine(mi.eng_days_per_machine, s.qty, eng_training_days, window)
-                eng_headcount = len(eng_alloc)
-                eng_all.extend(eng_alloc)
-                for i, d in enumerate(eng_alloc, 1):
-                    assignments.append(Assignment(s.model, "Engineer", i, d, d * eng_day_rate))
-
-            machine_rows.append({
-                "model": s.model,
-                "qty": s.qty,
-                "training_days": training_days,
-                "training_potential": base_training,
-                "training_required": s.training_required,
-                "training_applicable": bool(mi.training_applicable),
-                "eng_training_days": eng_training_days,
-                "eng_training_potential": eng_training_potential,
-                "tech_total": tech_total,
-                "eng_total": eng_total,
-                "tech_headcount": tech_headcount,
-                "eng_headcount": eng_headcount
-            })
-
-        tech = RoleTotals(len(tech_all), sum(tech_all), sorted(tech_all, reverse=True), tech_day_rate, float(sum(tech_all)) * tech_day_rate)
-        eng = RoleTotals(len(eng_all), sum(eng_all), sorted(eng_all, reverse=True), eng_day_rate, float(sum(eng_all)) * eng_day_rate)
-
-        trip_days_by_person = [a.onsite_days + TRAVEL_DAYS_PER_PERSON for a in assignments]
-        n_people = len(trip_days_by_person)
-        total_trip_days = sum(trip_days_by_person)
-        total_hotel_nights = sum(max(d - 1, 0) for d in trip_days_by_person)
-
-        exp_lines: List[ExpenseLine] = []
-
-        def add_exp(name, qty, unit, detail):
-            exp_lines.append(ExpenseLine(name, float(qty), float(unit), float(qty) * float(unit), detail))
-
-        add_exp("Airfare", n_people, OVERRIDE_AIRFARE_PER_PERSON, f"{n_people} person(s) × {money(OVERRIDE_AIRFARE_PER_PERSON)}")
-        add_exp("Baggage", total_trip_days, OVERRIDE_BAGGAGE_PER_DAY_PER_PERSON, f"{int(total_trip_days)} day(s) × {money(OVERRIDE_BAGGAGE_PER_DAY_PER_PERSON)}")
-
-        parking, _ = self.data.get_rate("parking")
-        car, _ = self.data.get_rate("car rental")
-        hotel, _ = self.data.get_rate("hotel")
-        per_diem, _ = self.data.get_rate("per diem weekday")
-        prep, _ = self.data.get_rate("pre/post trip prep")
-        travel_time_rate, _ = self.data.get_rate("travel time")
-
-        add_exp("Car Rental", total_trip_days, car, f"{int(total_trip_days)} day(s) × {money(car)}")
-        add_exp("Parking", total_trip_days, parking, f"{int(total_trip_days)} day(s) × {money(parking)}")
-        add_exp("Hotel", total_hotel_nights, hotel, f"{int(total_hotel_nights)} night(s) × {money(hotel)}")
-        add_exp("Per Diem", total_trip_days, per_diem, f"{int(total_trip_days)} day(s) × {money(per_diem)}")
-        add_exp("Pre/Post Trip Prep", n_people, prep, f"{n_people} person(s) × {money(prep)}")
-        travel_hours = 16 * n_people
-        add_exp("Travel Time", travel_hours, travel_time_rate, f"{travel_hours} hr(s) × {money(travel_time_rate)}/hr")
-
-        exp_total = sum(l.extended for l in exp_lines)
-        max_onsite = max([a.onsite_days for a in assignments], default=0)
-        grand_total = exp_total + tech.labor_cost + eng.labor_cost
-
-        meta = {
-            "machine_rows": machine_rows,
-            "assignments": assignments,
-            "window": window,
-            "max_onsite": max_onsite,
-            "n_people": n_people,
-            "total_trip_days": total_trip_days,
-            "exp_total": exp_total,
-            "grand_total": grand_total
-        }
-        return tech, eng, exp_lines, meta
+    def _priced_selections(self) -> List[LineSelection]:
+        selections = [ln.value() for ln in self.lines]
+        return [s for s in selections if s.qty > 0 and s.model and s.model in self.data.models]
 
+    def sweep(self) -> "SweepResult | None":
+        """Price the current quote under every install window (None when there is nothing to price)."""
+        if self.data is None:
+            return None
+        selections = self._priced_selections()
+        if not selections:
+            return None
+        from core.model_table import compute_lines
+        from core.window_sweep import sweep_costs, sweep_windows
+
+        batch = compute_lines(
+            self.data.model_table,
+            [s.model for s in selections],
+            [s.qty for s in selections],
+            [s.training_required for s in selections],
+            MIN_INSTALL_WINDOW,  # feasibility is re-checked per window by the sweep
+            TRAINING_MACHINES_PER_DAY,
+        )
+        costs = sweep_costs(RateCard.from_lookup(self.data.get_rate))
+        return sweep_windows(batch, range(MIN_INSTALL_WINDOW, MAX_INSTALL_WINDOW + 1), costs)
+
+    @staticmethod
+    def set_table_rows(tbl: QTableView, rows: List[tuple]) -> int:
+        """Show `rows` in a results table; only cells that differ are repainted. Returns that count."""
+        return tbl.model().set_rows(rows)
 
     def _autosize_table_height(self, tbl, visible_rows=None, max_height=520):
         """Resize table height to fit contents (optionally cap by visible row count) to avoid inner scrolling."""
         try:
-            tbl.resizeRowsToContents()
             header_h = tbl.horizontalHeader().height()
             frame = tbl.frameWidth() * 2
             total = header_h + frame + 12
-            n = tbl.rowCount()
+            n = tbl.model().rowCount()
             if visible_rows is not None:
                 n = min(n, int(visible_rows))
-            for r in range(n):
-                total += tbl.rowHeight(r)
+            total += n * tbl.verticalHeader().defaultSectionSize()  # rows have a fixed height
             total = min(total, max_height)
             tbl.setMinimumHeight(total)
             tbl.setMaximumHeight(total)
@@ -997,112 +1474,21 @@ class MainWindow(QMainWindow):
 
     
     
+    @traced("recalc.chart")
     def update_workload_chart(self, tech: RoleTotals, eng: RoleTotals):
-        """Polished horizontal stacked bar chart of onsite + travel days by person."""
-        labels: List[str] = []
-        tech_vals: List[int] = []
-        eng_vals: List[int] = []
-
-        for d in tech.onsite_days_by_person:
-            labels.append(f"T{len(tech_vals)+1}")
-            tech_vals.append(int(d))
-
-        for d in eng.onsite_days_by_person:
-            labels.append(f"E{len(eng_vals)+1}")
-            eng_vals.append(int(d))
-
-        self.chart.removeAllSeries()
-        self.chart.setTitle("Workload (days)")
-        self.chart.setBackgroundRoundness(8)
-        self.chart.setAnimationOptions(QChart.SeriesAnimations)
-
-        if len(labels) == 0:
-            return
-
-        # Colors (match UI theme)
-        tech_color = QColor("#e04426")  # Tech bar
-        eng_color = QColor("#6790a0")   # Engineer bar
-        tech_travel = QColor(tech_color); tech_travel.setAlpha(110)
-        eng_travel = QColor(eng_color); eng_travel.setAlpha(110)
-
-        series = QHorizontalStackedBarSeries()
-
-        set_tech_on = QBarSet("Tech")
-        set_tech_tr = QBarSet("Tech travel")
-        set_eng_on = QBarSet("Eng")
-        set_eng_tr = QBarSet("Eng travel")
-
-        set_tech_on.setColor(tech_color)
-        set_tech_tr.setColor(tech_travel)
-        set_eng_on.setColor(eng_color)
-        set_eng_tr.setColor(eng_travel)
-
-        n = len(labels)
-        # Build arrays aligned to labels: first tech people then engineer people
-        for i in range(n):
-            is_tech = labels[i].startswith("T")
-            if is_tech:
-                v = tech_vals[int(labels[i][1:]) - 1]
-                set_tech_on.append(float(v))
-                set_tech_tr.append(float(TRAVEL_DAYS_PER_PERSON) if v > 0 else 0.0)
-                set_eng_on.append(0.0)
-                set_eng_tr.append(0.0)
-            else:
-                v = eng_vals[int(labels[i][1:]) - 1]
-                set_tech_on.append(0.0)
-                set_tech_tr.append(0.0)
-                set_eng_on.append(float(v))
-                set_eng_tr.append(float(TRAVEL_DAYS_PER_PERSON) if v > 0 else 0.0)
-
-        series.append(set_tech_on)
-        series.append(set_tech_tr)
-        series.append(set_eng_on)
-        series.append(set_eng_tr)
-
-        self.chart.addSeries(series)
-
-        axis_y = QBarCategoryAxis()
-        axis_y.append(labels)
-
-        totals = []
-        for i in range(n):
-            if labels[i].startswith("T"):
-                v = tech_vals[int(labels[i][1:]) - 1]
-            else:
-                v = eng_vals[int(labels[i][1:]) - 1]
-            totals.append(v + (TRAVEL_DAYS_PER_PERSON if v > 0 else 0))
-        max_v = max(totals) if totals else 1
-
-        axis_x = QValueAxis()
-        axis_x.setRange(0, max(1, int(max_v)))
-        axis_x.setLabelFormat("%d")
-        axis_x.setTickCount(min(10, max(2, int(max_v) + 1)))
-
-        for ax in list(self.chart.axes()):
-            self.chart.removeAxis(ax)
-
-        self.chart.addAxis(axis_y, Qt.AlignLeft)
-        self.chart.addAxis(axis_x, Qt.AlignBottom)
-        series.attachAxis(axis_y)
-        series.attachAxis(axis_x)
-
-        # Labels/legend polish
-        try:
-            series.setLabelsVisible(True)
-            series.setLabelsPosition(series.LabelsInsideEnd)
-            series.setLabelsFormat("@value")
-        except Exception:
-            pass
-
-        self.chart.legend().setVisible(True)
-        self.chart.legend().setAlignment(Qt.AlignBottom)
+        """Horizontal stacked bars of onsite + travel days by person, updated in place."""
+        self.chart_view.set_workload(tech.onsite_days_by_person, eng.onsite_days_by_person, TRAVEL_DAYS_PER_PERSON)
 
+    @traced("recalc")
     def recalc(self):
+        self._recalc_scheduler.cancel()  # this recalc covers any scheduled one
         if len(self.lines) == 0:
             self.reset_views()
             return
         try:
-            tech, eng, exp_lines, meta = self.calc()
+            with span("recalc.calc"):
+                self.last_quote = self.calc()
+            tech, eng, exp_lines, meta = self.last_quote
             self.alert.hide()
 
             self.card_tech.set_value(str(tech.headcount), f"{tech.total_onsite_days} total days")
@@ -1113,98 +1499,48 @@ class MainWindow(QMainWindow):
             self.update_workload_chart(tech, eng)
             self.lbl_total_val.setText(money(meta["grand_total"]))
 
-            rows = meta["machine_rows"]
-            self.tbl_breakdown.setRowCount(len(rows))
-            for r_i, r in enumerate(rows):
-                # Training display rules:
-                # - If training is not applicable for this model, hide all training UI/labels.
-                # - If applicable but user unchecked training, show “(training excluded)”.
-                if not r.get("training_applicable", True):
-                    tech_disp = str(r["tech_total"])
-                else:
-                    if r.get("training_required", True):
-                        tech_disp = f"{r['tech_total']} (incl. {r['training_days']} Train)" if r.get("training_days", 0) > 0 else str(r["tech_total"])
-                    else:
-                        tech_disp = f"{r['tech_total']} (training excluded)"
-
-                if r["eng_total"] == 0:
-                    eng_disp = "—"
-                elif not r.get("training_applicable", True):
-                    eng_disp = str(r["eng_total"])
-                else:
-                    eng_tp = r.get("eng_training_potential", 0)
-                    eng_td = r.get("eng_training_days", 0)
-                    if r.get("training_required", True):
-                        eng_disp = f"{r['eng_total']} (incl. {eng_td} Train)" if (eng_tp > 0 and eng_td > 0) else str(r["eng_total"])
-                    else:
-                        eng_disp = f"{r['eng_total']} (training excluded)" if eng_tp > 0 else str(r["eng_total"])
-
-                vals = [r["model"], str(r["qty"]), tech_disp, eng_disp,
-                        "—" if r["tech_headcount"] == 0 else str(r["tech_headcount"]),
-                        "—" if r["eng_headcount"] == 0 else str(r["eng_headcount"])]
-                for c, v in enumerate(vals):
-                    it = QTableWidgetItem(v)
-                    if c in [1, 4, 5]:
-                        it.setTextAlignment(Qt.AlignCenter)
-                    if c == 2 and r["training_required"]:
-                        it.setForeground(Qt.darkYellow)
-                    self.tbl_breakdown.setItem(r_i, c, it)
-
-            assigns: List[Assignment] = meta["assignments"]
-            self.tbl_assign.setRowCount(len(assigns))
-            for i, a in enumerate(assigns):
-                vals = [a.model, a.role, str(a.person_num), str(a.onsite_days), money(a.cost)]
-                for c, v in enumerate(vals):
-                    it = QTableWidgetItem(v)
-                    if c in [2, 3]:
-                        it.setTextAlignment(Qt.AlignCenter)
-                    if c == 4:
-                        it.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                    self.tbl_assign.setItem(i, c, it)
-
-            self.tbl_labor.setRowCount(3)
-            labor_rows = [
-                ("Technician", money(tech.day_rate) + "/day", str(tech.total_onsite_days), str(tech.headcount), money(tech.labor_cost)),
-                ("Engineer", money(eng.day_rate) + "/day", str(eng.total_onsite_days), str(eng.headcount), money(eng.labor_cost)),
-            ]
-            for r_i, row in enumerate(labor_rows):
-                for c, v in enumerate(row):
-                    it = QTableWidgetItem(v)
-                    if c in [2, 3]:
-                        it.setTextAlignment(Qt.AlignCenter)
-                    if c == 4:
-                        it.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                    self.tbl_labor.setItem(r_i, c, it)
-
-
-            # Subtotal row
-            labor_subtotal = tech.labor_cost + eng.labor_cost
-            self.tbl_labor.setItem(2, 0, QTableWidgetItem("Subtotal"))
-            self.tbl_labor.setItem(2, 1, QTableWidgetItem(""))
-            self.tbl_labor.setItem(2, 2, QTableWidgetItem(""))
-            self.tbl_labor.setItem(2, 3, QTableWidgetItem(""))
-            it = QTableWidgetItem(money(labor_subtotal))
-            it.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.tbl_labor.setItem(2, 4, it)
-
-            self.lbl_exp_hdr.setText(
-                f"Expenses are calculated using person-days, including {TRAVEL_DAYS_PER_PERSON} travel days per person."
+            packing = meta.get("crew_packing") or {}
+            groups = meta.get("crew_groups") or []
+            if packing:
+                self.lbl_crew_groups.setText("Shared crews (qualified personnel across models):\n" + "\n".join(
+                    crew_packing_summary(role, res) for role, res in packing.items()
+                ))
+            else:
+                self.lbl_crew_groups.setText("These models could share qualified personnel (not applied to pricing):\n" + "\n".join(
+                    f"{g['role']}s: {' + '.join(g['models'])} ({', '.join(g['resources'])})" for g in groups
+                ))
+            self.lbl_crew_groups.setVisible(bool(packing or groups))
+            shared = any(not res.used_fallback for res in packing.values())
+            self.sec_assign.subtitle.setText(
+                "Qualified personnel are shared across machine types." if shared
+                else "Each machine type is priced with dedicated personnel."
             )
-            self.tbl_exp.setRowCount(len(exp_lines) + 1)
-            for i, l in enumerate(exp_lines):
-                vals = [l.description, l.details, money(l.extended)]
-                for c, v in enumerate(vals):
-                    it = QTableWidgetItem(v)
-                    if c == 2:
-                        it.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                    self.tbl_exp.setItem(i, c, it)
-
-            sub_row = len(exp_lines)
-            self.tbl_exp.setItem(sub_row, 0, QTableWidgetItem("Expenses Subtotal"))
-            self.tbl_exp.setItem(sub_row, 1, QTableWidgetItem("—"))
-            it = QTableWidgetItem(money(meta["exp_total"]))
-            it.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            self.tbl_exp.setItem(sub_row, 2, it)
+
+            with span("recalc.tables"):
+                breakdown_rows = [machine_row_cells(r) + (bool(r["training_required"]),) for r in meta["machine_rows"]]
+                self.set_table_rows(self.tbl_breakdown, breakdown_rows)
+
+                assigns: List[Assignment] = meta["assignments"]
+                self.set_table_rows(
+                    self.tbl_assign,
+                    [(a.model, a.role, str(a.person_num), str(a.onsite_days), money(a.cost)) for a in assigns],
+                )
+
+                labor_subtotal = tech.labor_cost + eng.labor_cost
+                self.set_table_rows(self.tbl_labor, [
+                    ("Technician", money(tech.day_rate) + "/day", str(tech.total_onsite_days), str(tech.headcount), money(tech.labor_cost)),
+                    ("Engineer", money(eng.day_rate) + "/day", str(eng.total_onsite_days), str(eng.headcount), money(eng.labor_cost)),
+                    ("Subtotal", "", "", "", money(labor_subtotal)),
+                ])
+
+                self.lbl_exp_hdr.setText(
+                    f"Expenses are calculated using person-days, including {TRAVEL_DAYS_PER_PERSON} travel days per person."
+                )
+                self.set_table_rows(
+                    self.tbl_exp,
+                    [(l.description, l.details, money(l.extended)) for l in exp_lines]
+                    + [("Expenses Subtotal", "—", money(meta["exp_total"]))],
+                )
 
             self.btn_print.setEnabled(True)
 
@@ -1212,156 +1548,122 @@ class MainWindow(QMainWindow):
             self.reset_views()
             self.alert.setText(str(e))
             self.alert.show()
+        # Other windows may still fit when the selected one does not, so sweep on failures too.
+        self.update_window_sweep()
 
-    def build_quote_html(self, tech: RoleTotals, eng: RoleTotals, exp_lines: List[ExpenseLine], meta: TDict[str, object]) -> str:
-        from datetime import date, timedelta
-        today = date.today()
-        validity = today + timedelta(days=30)
-        date_str = f"{today:%B} {today.day}, {today:%Y}"
-        valid_str = f"{validity:%B} {validity.day}, {validity:%Y}"
-
-        logo_html = ""
-        if LOGO_PATH.exists():
+    @traced("recalc.sweep")
+    def update_window_sweep(self):
+        """Redraw the cost-per-window curve in place and highlight the cheapest window.
+
+        The sweep is only re-priced when the priced lines, the workbook or the window bounds
+        change; picking another window just moves the marker.
+        """
+        key = self._sweep_inputs()
+        if key != self._sweep_key:
             try:
-                b = LOGO_PATH.read_bytes()
-                b64 = base64.b64encode(b).decode("ascii")
-                logo_html = f'<img src="data:image/png;base64,{b64}" height="36" style="height:36px;" />'
+                self._sweep = self.sweep()
             except Exception:
-                logo_html = ""
+                self._sweep = None
+            self._sweep_key = key
+        self._show_window_sweep(self._sweep)
 
-        mr = []
-        for r in meta["machine_rows"]:
-            if not r.get("training_applicable", True):
-                tech_disp = str(r["tech_total"])
-            else:
-                if r.get("training_required", True):
-                    tech_disp = f"{r['tech_total']} (incl. {r['training_days']} Train)" if r.get("training_days", 0) > 0 else str(r["tech_total"])
-                else:
-                    tech_disp = f"{r['tech_total']} (training excluded)"
-
-            if r["eng_total"] == 0:
-                eng_disp = "—"
-            elif not r.get("training_applicable", True):
-                eng_disp = str(r["eng_total"])
-            else:
-                eng_tp = r.get("eng_training_potential", 0)
-                eng_td = r.get("eng_training_days", 0)
-                if r.get("training_required", True):
-                    eng_disp = f"{r['eng_total']} (incl. {eng_td} Train)" if (eng_tp > 0 and eng_td > 0) else str(r["eng_total"])
-                else:
-                    eng_disp = f"{r['eng_total']} (training excluded)" if eng_tp > 0 else str(r["eng_total"])
-
-            mr.append(f"""<tr>
-                <td>{r['model']}</td>
-                <td style="text-align:center;">{r['qty']}</td>
-                <td>{tech_disp}</td>
-                <td style="text-align:center;">{eng_disp}</td>
-                <td style="text-align:center;">{r['tech_headcount'] if r['tech_headcount'] else "—"}</td>
-                <td style="text-align:center;">{r['eng_headcount'] if r['eng_headcount'] else "—"}</td>
-            </tr>""")
+    def _sweep_inputs(self) -> Optional[tuple]:
+        if self.data is None:
+            return None
+        return (self.data, tuple(self._priced_selections()), MIN_INSTALL_WINDOW, MAX_INSTALL_WINDOW)
 
-        exp_rows = []
-        for l in exp_lines:
-            exp_rows.append(f"""<tr>
+    def _show_window_sweep(self, res: "SweepResult | None"):
+        if res is None or not res.feasible.any():
+            self.sweep_chart.clear()
+            self.lbl_sweep.setText("No install window fits this quote." if res is not None else "")
+            self.btn_use_best_window.setEnabled(False)
+            return
+
+        points = [(float(w), float(t)) for w, t, ok in zip(res.windows, res.grand_total, res.feasible) if ok]
+        best = res.best()
+        window = int(self.spin_window.value())
+        cur = res.index_of(window)
+        self.sweep_chart.set_curve(
+            points,
+            current=(float(window), float(res.grand_total[cur])) if cur is not None and res.feasible[cur] else None,
+            best=(float(res.windows[best]), float(res.grand_total[best])),
+        )
+
+        text = (
+            f"Cheapest: {int(res.windows[best])}-day window, {money(res.grand_total[best])} "
+            f"({int(res.n_people[best])} people, up to {int(res.max_onsite[best])} days onsite)."
+        )
+        if cur is not None and res.feasible[cur] and cur != best:
+            text += f" Selected {window}-day window: {money(res.grand_total[cur])}."
+        if self.crew_sharing_enabled():
+            text += " Window options are priced with dedicated personnel per machine type."
+        self.lbl_sweep.setText(text)
+        self.btn_use_best_window.setEnabled(cur != best)
+
+    def use_best_window(self):
+        if self._sweep is not None and self._sweep.best() is not None:
+            self.spin_window.setValue(int(self._sweep.windows[self._sweep.best()]))
+            self.recalc()
+
+    def build_quote_html(self, tech: RoleTotals, eng: RoleTotals, exp_lines: List[ExpenseLine], meta: TDict[str, object]) -> str:
+        date_str, valid_str = quote_dates()
+        labor_sub = tech.labor_cost + eng.labor_cost
+        exp_rows = [f"""<tr>
                 <td>{l.description}</td>
                 <td>{l.details}</td>
                 <td style="text-align:right;">{money(l.extended)}</td>
-            </tr>""")
-
-        labor_sub = tech.labor_cost + eng.labor_cost
+            </tr>""" for l in exp_lines]
 
         req_html = ""
         if self.data.requirements:
             li = "".join([f"<li>{x}</li>" for x in self.data.requirements])
             req_html = f"<h3>Requirements & Assumptions</h3><ul>{li}</ul>"
 
-        html = f"""<html><head><meta charset="utf-8" />
-        <style>
-            body {{ font-family: Arial, Helvetica, sans-serif; font-size: 10pt; color: #0F172A; }}
-            .topbar {{ display:flex; align-items:flex-start; justify-content:space-between; border-bottom: 3px solid #F05A28; padding-bottom: 10px; margin-bottom: 14px; }}
-            .logo {{ text-align:right; }}
-            .title {{ font-size: 18pt; font-weight: 800; color: #4c4b4c; margin: 0; }}
-            .subtitle {{ margin: 4px 0 0 0; color: #6D6E71; }}
-            .grid {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
-            .grid th {{ background: #343551; color: white; text-align: left; padding: 8px; border-bottom: 1px solid #E2E8F0; }}
-            .grid td {{ padding: 8px; border-bottom: 1px solid #E2E8F0; }}
-            .box {{ border: 1px solid #E6E8EB; border-radius: 10px; padding: 10px; background: rgba(103,144,160,0.18); }}
-            .two {{ display: table; width: 100%; }}
-            .two > div {{ display: table-cell; width: 50%; vertical-align: top; padding-right: 10px; }}
-            h3 {{ color: #4c4b4c; margin: 18px 0 8px 0; }}
-            .right {{ text-align: right; }}
-            .muted {{ color: #6D6E71; }}
-            .total {{ font-size: 16pt; font-weight: 900; color: #4c4b4c; }}
-        </style></head><body>
-            <div class="topbar">
-                <div>
-                    <p class="title">Commissioning Budget Quote</p>
-                    <p class="subtitle muted">Service Estimate</p>
-                </div>
-                <div class="logo">{logo_html}</div>
-            </div>
-
-            <div class="two">
-                <div class="box">
-                    <b>DATE</b><br/>{date_str}<br/><br/>
-                    <b>TOTAL PERSONNEL</b><br/>{tech.headcount + eng.headcount} ({tech.headcount} Tech, {eng.headcount} Eng)
-                </div>
-                <div class="box">
-                    <b>QUOTE VALIDITY</b><br/>{valid_str}<br/><br/>
-                    <b>ESTIMATED DURATION</b><br/>{meta["max_onsite"]} days onsite + {TRAVEL_DAYS_PER_PERSON} travel days
-                </div>
-            </div>
-            <div class="section-spacer"></div>
-
-            <h3>Machine Breakdown</h3>
-            <table class="grid">
-                <tr><th>Model</th><th style="text-align:center;">Qty</th><th>Tech Days</th><th style="text-align:center;">Eng Days</th>
-                    <th style="text-align:center;">Technicians</th><th style="text-align:center;">Engineers</th></tr>
-                {''.join(mr)}
-            </table>
-
-            <h3>Labor Costs</h3>
-            <table class="grid">
-                <tr><th>Item</th><th class="right">Extended</th></tr>
-                <tr><td>Tech. Regular Time ({tech.total_onsite_days} days × {money(tech.day_rate)}/day)</td><td class="right">{money(tech.labor_cost)}</td></tr>
-                <tr><td>Eng. Regular Time ({eng.total_onsite_days} days × {money(eng.day_rate)}/day)</td><td class="right">{money(eng.labor_cost)}</td></tr>
-                <tr><td><b>Labor Subtotal</b></td><td class="right"><b>{money(labor_sub)}</b></td></tr>
-            </table>
-
-            <h3>Estimated Expenses</h3>
-            <div class="muted">Includes {int(meta["total_trip_days"])} total trip day(s) across personnel (onsite + travel days).</div>
-            <table class="grid">
-                <tr><th>Expense</th><th>Details</th><th class="right">Amount</th></tr>
-                {''.join(exp_rows)}
-                <tr><td><b>Expenses Subtotal</b></td><td>—</td><td class="right"><b>{money(meta["exp_total"])}</b></td></tr>
-            </table>
-
-            <h3>Estimated Total</h3>
-            <div class="box">
-                <span class="total">{money(meta["grand_total"])}</span><br/>
-                <span class="muted">Labor ({money(labor_sub)}) + Expenses ({money(meta["exp_total"])})</span>
-            </div>
-
-            <h3>Terms & Conditions</h3>
-            <ul>
-                <li><b>Pricing & Quote Expiration:</b> Prices shown reflect an estimate of days and expenses. Any additional time will be billed at the rates shown. Quote valid for 30 days.</li>
-                <li><b>Customer Install Window:</b> No individual technician or engineer is assigned more than {meta["window"]} onsite days per trip.</li>
-                <li><b>Training:</b> Training days are calculated at 1 day per {TRAINING_MACHINES_PER_DAY} machines of the same model type. Training can be excluded per machine if not required (customer request only).</li>
-                <li><b>Machine-Specific Skills:</b> Each machine type requires technicians with specialized skills. Personnel are not shared across different machine types.</li>
-                <li><b>Travel Days:</b> Expenses include {TRAVEL_DAYS_PER_PERSON} travel days (1 day travel-in + 1 day travel-out) in addition to onsite work days.</li>
-            </ul>
-            {req_html}
-        </body></html>"""
-        return html
+        if any(not res.used_fallback for res in (meta.get("crew_packing") or {}).values()):
+            skills_term = ("Each machine type requires technicians with specialized skills. Personnel qualified on "
+                           "several machine types may be shared across those types.")
+        else:
+            skills_term = ("Each machine type requires technicians with specialized skills. Personnel are not shared "
+                           "across different machine types.")
+
+        return QUOTE_TEMPLATE.render(
+            logo_html=logo_img(LOGO_PATH),
+            date_str=date_str,
+            valid_str=valid_str,
+            headcount=tech.headcount + eng.headcount,
+            tech_headcount=tech.headcount,
+            eng_headcount=eng.headcount,
+            max_onsite=meta["max_onsite"],
+            machine_rows="".join([quote_machine_row(r) for r in meta["machine_rows"]]),
+            tech_days=tech.total_onsite_days,
+            tech_day_rate=money(tech.day_rate),
+            tech_labor=money(tech.labor_cost),
+            eng_days=eng.total_onsite_days,
+            eng_day_rate=money(eng.day_rate),
+            eng_labor=money(eng.labor_cost),
+            labor_sub=money(labor_sub),
+            trip_days=int(meta["total_trip_days"]),
+            exp_rows="".join(exp_rows),
+            exp_total=money(meta["exp_total"]),
+            grand_total=money(meta["grand_total"]),
+            window=meta["window"],
+            skills_term=skills_term,
+            req_html=req_html,
+        )
 
     def print_quote_preview(self):
+        self.flush_recalc()
         try:
-            tech, eng, exp_lines, meta = self.calc()
+            # Print what the window shows; windows that don't keep a quote price one now.
+            tech, eng, exp_lines, meta = self.last_quote or self.calc()
         except Exception as e:
             QMessageBox.critical(self, "Cannot print", str(e))
             return
 
         try:
+            from PySide6.QtGui import QPageSize, QTextDocument
+            from PySide6.QtPrintSupport import QPrinter, QPrintPreviewDialog
+
             html = self.build_quote_html(tech, eng, exp_lines, meta)
             doc = QTextDocument()
             doc.setHtml(html)
@@ -1480,7 +1782,7 @@ class MainWindow(QMainWindow):
         self._apply_responsive_layout()
         self._apply_scale()
     def closeEvent(self, event):
-
+        self.release_workbook()
         event.accept()
 
 
@@ -0,0 +1,96 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parents[1]
+if str(REPO) not in sys.path:
+    sys.path.insert(0, str(REPO))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point snapshot storage at a fresh temporary directory."""
+    d = tmp_path / "cache"
+    monkeypatch.setenv("QUOTE_PRO_CACHE_DIR", str(d))
+    return d
+
+
+def write_rates_workbook(path: Path, models=None, rates=None, requirements=("Site power available",)) -> Path:
+    """Write a minimal rates workbook with the three sheets ExcelData reads."""
+    import openpyxl
+
+    models = models if models is not None else [("A-100", 2, 1, True), ("B-200", 3, 0, False)]
+    rates = rates if rates is not None else [
+        ("Tech. Regular Time", 100.0), ("Eng. Regular Time", 150.0), ("Parking", 20.0),
+        ("Car Rental", 80.0), ("Hotel", 140.0), ("Per Diem Weekday", 60.0),
+        ("Pre/Post Trip Prep", 200.0), ("Travel Time", 90.0),
+    ]
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Instal days by Model"
+    ws.append(["Item", "Technician Days Required", "Field Engineer Days Required", "Training Required"])
+    for row in models:
+        ws.append(list(row))
+    sr = wb.create_sheet("Service Rates")
+    sr.append([None, "Service Rates"])
+    sr.append([])
+    sr.append([None, "Item", "Description", None, None, "Unit Price", "Notes"])
+    for i, (desc, price) in enumerate(rates, 1):
+        sr.append([None, i, desc, None, None, price, ""])
+    rq = wb.create_sheet("Requirements and Assumptions")
+    rq.append([None, None, "Assumptions and Requirements"])
+    for r in requirements:
+        rq.append([None, None, r])
+    wb.save(path)
+    return path
+
+
+@pytest.fixture
+def rates_workbook(tmp_path, cache_dir):
+    return write_rates_workbook(tmp_path / "Tech days and quote rates.xlsx")
+
+
+@pytest.fixture
+def qapp():
+    pytest.importorskip("PySide6")
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def wait_until(predicate, timeout_ms: int = 10000) -> bool:
+    """Run the Qt event loop until `predicate()` is true (or the timeout passes)."""
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    if predicate():
+        return True
+    loop = QEventLoop()
+    poll = QTimer()
+    poll.timeout.connect(lambda: predicate() and loop.quit())
+    poll.start(10)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    poll.stop()
+    return bool(predicate())
+
+
+@pytest.fixture
+def fresh_workbooks(qapp, cache_dir):
+    """Start from an empty shared-workbook registry and no in-flight loads or watch."""
+    from ui import workbook_loader
+    from core.workbook_registry import WORKBOOKS
+
+    def reset():
+        WORKBOOKS.__init__()
+        workbook_loader._LOAD_JOBS.clear()
+        if workbook_loader._WATCHER is not None:
+            workbook_loader._WATCHER.deleteLater()
+            workbook_loader._WATCHER = None
+
+    reset()
+    yield WORKBOOKS
+    reset()
@@ -0,0 +1,121 @@
+"""chunk_allocate_by_machine against the original one-day-at-a-time heuristic."""
+
+import math
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from legacy_pcp.pcp_v1_1 import balanced_allocate, chunk_allocate_by_machine
+
+
+def _reference_balanced_allocate(total_days, headcount):
+    """The shipped one-day-at-a-time balancer.
+
+    `int(np.argmin(loads))` is written as `loads.index(min(loads))` here and below:
+    both pick the first least-loaded person, without the NumPy dependency.
+    """
+    if headcount <= 0:
+        return []
+    loads = [0] * headcount
+    for _ in range(int(total_days)):
+        i = loads.index(min(loads))
+        loads[i] += 1
+    loads.sort(reverse=True)
+    return loads
+
+
+def _reference_chunk_allocate(install_days_per_machine, qty, training_days, window):
+    """The headcount search as it shipped before the closed form (the oracle; only the argmin spelling differs)."""
+    install_days_per_machine = int(install_days_per_machine or 0)
+    qty = int(qty or 0)
+    training_days = int(training_days or 0)
+    window = int(window or 0)
+
+    if window <= 0:
+        return []
+    if qty <= 0 and training_days <= 0:
+        return []
+
+    if qty <= 0 or install_days_per_machine <= 0:
+        headcount = int(math.ceil(training_days / window)) if training_days > 0 else 0
+        return _reference_balanced_allocate(training_days, headcount) if headcount > 0 else []
+
+    max_headcount = max(1, qty)
+    for headcount in range(1, max_headcount + 1):
+        base_n = qty // headcount
+        rem = qty % headcount
+        machine_counts = [base_n + (1 if i < rem else 0) for i in range(headcount)]
+        loads = [c * install_days_per_machine for c in machine_counts]
+        for _ in range(training_days):
+            candidates = [i for i, d in enumerate(loads) if d + 1 <= window]
+            if candidates:
+                i = max(candidates, key=lambda j: loads[j])
+            else:
+                i = loads.index(min(loads))
+            loads[i] += 1
+        if max(loads) <= window:
+            loads.sort(reverse=True)
+            return loads
+
+    loads = [install_days_per_machine] * qty
+    for _ in range(training_days):
+        i = loads.index(min(loads))
+        loads[i] += 1
+    loads.sort(reverse=True)
+    return loads
+
+
+def _assert_grid(install_days, qtys, trainings):
+    for window in range(0, 15):  # every window the UI allows, plus the 0 guard
+        for qty in qtys:
+            for training in trainings(qty):
+                expected = _reference_chunk_allocate(install_days, qty, training, window)
+                got = chunk_allocate_by_machine(install_days, qty, training, window)
+                assert got == expected, (install_days, qty, training, window)
+
+
+@pytest.mark.parametrize("install_days", range(0, 8))
+def test_matches_reference_for_quote_training(install_days):
+    # calc() only ever passes 0 or ceil(qty / 3) training days.
+    _assert_grid(install_days, range(0, 61), lambda qty: sorted({0, -(-qty // 3)}))
+
+
+@pytest.mark.parametrize("install_days", range(0, 8))
+def test_matches_reference_for_any_training(install_days):
+    # Arbitrary training loads, including ones the slack cannot absorb (fallback path).
+    _assert_grid(install_days, range(0, 16), lambda qty: range(0, 31))
+
+
+@pytest.mark.parametrize("args", [
+    (2, 999, 333, 14),
+    (3, 400, 134, 14),
+    (20, 999, 0, 14),     # install chunk larger than the window -> fallback
+    (1, 120, 900, 7),     # training far beyond the available slack -> fallback
+    (0, 0, 40, 7),        # training only
+])
+def test_large_lines_match_reference(args):
+    assert chunk_allocate_by_machine(*args) == _reference_chunk_allocate(*args)
+
+
+def test_qty_999_allocates_in_microseconds():
+    n = 2000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        chunk_allocate_by_machine(3, 999, 333, 14)
+    per_call = (time.perf_counter() - t0) / n
+    assert per_call < 1e-3, f"{per_call * 1e6:.0f} µs per call"
+
+
+def test_balanced_allocate_matches_reference():
+    for headcount in range(-1, 30):
+        for total in range(-2, 200):
+            assert balanced_allocate(total, headcount) == _reference_balanced_allocate(total, headcount), (total, headcount)
+
+
+def test_balanced_allocate_large():
+    loads = balanced_allocate(10_000, 500)
+    assert loads == [20] * 500
+    loads = balanced_allocate(9_999, 499)
+    assert sum(loads) == 9_999 and max(loads) - min(loads) == 1 and loads == sorted(loads, reverse=True)
@@ -0,0 +1,54 @@
+"""Painted charts: data is replaced in place and large crews still render quickly."""
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from conftest import REPO
+from ui.charts import CostCurveChart, WorkloadChart, nice_step
+
+
+def test_nice_step_picks_round_intervals():
+    assert [nice_step(span, 8) for span in (7, 16, 35, 90, 1200)] == [1, 2, 5, 20, 200]
+
+
+def test_workload_updates_in_place(qapp):
+    chart = WorkloadChart()
+    chart.set_workload([5, 3], [4], travel_days=2)
+    labels = chart.labels
+    assert (chart.labels, chart.onsite, chart.travel, chart.max_total()) == (["T1", "T2", "E1"], [5, 3, 4], [2, 2, 2], 7)
+    chart.set_workload([6, 0], [4], travel_days=2)
+    assert chart.labels is labels  # same crew shape: labels are reused
+    assert chart.travel == [2, 0, 2]
+    chart.clear()
+    assert chart.labels == [] and chart.max_total() == 0
+
+
+def test_hundreds_of_people_render_quickly(qapp):
+    chart = WorkloadChart()
+    chart.resize(600, 400)
+    chart.set_workload([i % 14 + 1 for i in range(400)], [i % 9 + 1 for i in range(200)], travel_days=2)
+    t0 = time.perf_counter()
+    image = chart.grab()
+    assert time.perf_counter() - t0 < 1.0
+    assert not image.isNull()
+
+
+def test_cost_curve_pads_its_range(qapp):
+    chart = CostCurveChart((3, 14), "Install window (days)")
+    chart.resize(400, 240)
+    chart.set_curve([(3, 1000.0), (4, 900.0), (5, 950.0)], current=(3, 1000.0), best=(4, 900.0))
+    assert chart.y_range() == pytest.approx((880.0, 1020.0))  # 2% of the high end beats 10% of the span
+    assert not chart.grab().isNull()
+    chart.clear()
+    assert chart.points == [] and chart.best is None
+
+
+def test_window_module_does_not_import_qtcharts():
+    code = "import sys, legacy_pcp.pcp_v1_1; print('PySide6.QtCharts' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,125 @@
+"""Shared-crew packing: valid crews, never worse than dedicated crews, bounded search time."""
+
+import random
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from core.crew_packing import CrewDemand, lower_bound, pack_crews
+from legacy_pcp import pcp_v1_1 as pcp
+
+
+def demand(model, qty, per_machine, qualified, window, training=None):
+    training = -(-qty // pcp.TRAINING_MACHINES_PER_DAY) if training is None else training
+    return CrewDemand(model, qty, per_machine, training, qualified,
+                      tuple(pcp.chunk_allocate_by_machine(per_machine, qty, training, window)))
+
+
+def assert_valid(demands, res, window):
+    days = Counter()
+    for d in demands:
+        days[d.model] += d.machines * d.days_per_machine + d.training_days
+    assert Counter({m: sum(p.work.get(m, 0) for p in res.crew) for m in days}) == days
+    qualified = {d.model: d.qualified for d in demands}
+    for person in res.crew:
+        assert 0 < person.onsite_days <= window
+        assert person.onsite_days == sum(person.work.values())
+        if len(person.work) > 1:
+            common = -1
+            for m in person.work:
+                common &= qualified[m]
+            assert common, person.work
+    assert res.lower_bound <= res.headcount <= res.dedicated_headcount
+
+
+def test_models_with_a_common_resource_share_people():
+    window = 7
+    demands = [demand("A", 1, 3, 0b01, window, 1), demand("B", 1, 3, 0b11, window, 0)]
+    res = pack_crews(demands, window)
+    assert_valid(demands, res, window)
+    assert (res.dedicated_headcount, res.headcount) == (2, 1)
+    assert res.optimal and not res.used_fallback
+    assert res.crew[0].label == "A + B"
+
+
+def test_models_nobody_covers_together_keep_dedicated_crews():
+    window = 7
+    demands = [demand("A", 1, 3, 0b01, window), demand("B", 1, 3, 0b10, window), demand("C", 2, 2, 0, window)]
+    res = pack_crews(demands, window)
+    assert res.used_fallback and res.optimal
+    assert res.headcount == res.lower_bound == 3
+    assert [p.work for p in res.crew] == [{"A": 4}, {"B": 4}, {"C": 5}]
+
+
+def test_lower_bound_counts_chunks_too_big_to_pair():
+    window = 7
+    assert lower_bound([demand("A", 3, 4, 1, window, 0), demand("B", 1, 1, 1, window, 0)], window) == 3
+
+
+def test_tight_time_budget_falls_back_to_dedicated_crews():
+    rng = random.Random(3)
+    window = 9
+    demands = [demand(f"M{i}", rng.randint(1, 12), rng.randint(1, 4), 0b111, window) for i in range(40)]
+    res = pack_crews(demands, window, time_budget_s=0.0)
+    assert res.timed_out and res.used_fallback
+    assert res.headcount == res.dedicated_headcount == sum(len(d.dedicated) for d in demands)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_large_quote_packs_within_the_time_budget(seed):
+    rng = random.Random(seed)
+    window = rng.randint(5, 14)
+    per_machine = {f"M{i}": rng.randint(1, min(5, window - 1)) for i in range(30)}
+    masks = {m: rng.getrandbits(6) for m in per_machine}
+    demands = []
+    for _ in range(200):
+        m = rng.choice(list(per_machine))
+        demands.append(demand(m, rng.randint(1, 19), per_machine[m], masks[m], window))
+    assert sum(d.machines for d in demands) >= 1500
+
+    res = pack_crews(demands, window, time_budget_s=0.25)
+    assert res.elapsed_s < 1.0
+    assert_valid(demands, res, window)
+    assert res.headcount < res.dedicated_headcount
+    assert res.gap <= max(2, res.lower_bound // 50)
+
+
+@pytest.fixture
+def window(fresh_workbooks):
+    from conftest import wait_until
+
+    fresh_workbooks.active_path = pcp.DEFAULT_EXCEL
+    w = pcp.MainWindow()
+    assert wait_until(lambda: w.data is not None)
+    yield w
+    w.release_workbook()
+    w.deleteLater()
+
+
+def test_window_prices_shared_crews_when_enabled(window):
+    quals = window.data.qualifications
+    if not quals:
+        pytest.skip("no qualification workbook")
+    techs = [m for m in window.models_sorted if quals.qualified(m, "Technician")]
+    a, b = next((a, b) for a in techs for b in techs
+                if a < b and quals.qualified(a, "Technician") & quals.qualified(b, "Technician"))
+    for model in (a, b):
+        window.add_line()
+        window.lines[-1].cmb_model.setCurrentText(model)
+        window.lines[-1].spin_qty.setValue(1)
+    window.spin_window.setValue(14)
+
+    tech_dedicated, _eng, _exp, meta = window.calc()
+    assert meta["crew_packing"] == {}
+
+    assert window.chk_share_crews.isEnabled()
+    window.chk_share_crews.setChecked(True)
+    window.flush_recalc()
+    tech_shared, _eng, _exp, meta = window.calc()
+    res = meta["crew_packing"]["Technician"]
+    assert tech_shared.total_onsite_days == tech_dedicated.total_onsite_days
+    assert tech_shared.headcount == res.headcount <= tech_dedicated.headcount
+    assert "Shared crews" in window.lbl_crew_groups.text()
+    assert "Technicians:" in window.lbl_crew_groups.text()
@@ -0,0 +1,62 @@
+"""CTOMainWindow: one pricing pass per recalc feeds the tables, calendar and print."""
+
+import time
+
+import pytest
+
+from conftest import wait_until
+
+pytest.importorskip("PySide6")
+
+from app.cto_pcp import CTOMainWindow
+from core.pricing import Assignment
+from core.workload_calendar import DAY_COLORS, TRAVEL
+
+
+@pytest.fixture
+def window(rates_workbook, fresh_workbooks):
+    fresh_workbooks.active_path = rates_workbook
+    w = CTOMainWindow()
+    assert wait_until(lambda: w.data is not None)
+    yield w
+    w.release_workbook()
+    w.deleteLater()
+
+
+def test_recalc_prices_once_and_shares_the_result(window, monkeypatch):
+    window.add_line()
+    window.lines[-1].cmb_model.setCurrentText("B-200")
+    window.lines[-1].spin_qty.setValue(3)
+    window.flush_recalc()
+
+    calls = []
+    calc = window.calc
+    monkeypatch.setattr(window, "calc", lambda: calls.append(1) or calc())
+    window.recalc()
+    assert len(calls) == 1
+
+    assigns = window.last_quote[3]["assignments"]
+    calendar = window.tbl_calendar.model()
+    assert calendar.rowCount() == window.tbl_assign.model().rowCount() == len(assigns)
+    assert calendar.data(calendar.index(0, 0)) == f"{assigns[0].role[:1]}{assigns[0].person_num} - {assigns[0].model}"
+    assert calendar.schedule.html_table() in window.build_quote_html(*window.last_quote)
+
+    window.delete_line(window.lines[0])
+    assert window.last_quote is None and calendar.rowCount() == 0
+
+
+def test_printed_quote_with_a_thousand_assignments_renders_in_milliseconds(window):
+    window.add_line()
+    window.lines[-1].cmb_model.setCurrentText("B-200")
+    window.flush_recalc()
+    window.quote_fields["Customer Name"].setText("Acme $1")
+    tech, eng, exp_lines, meta = window.last_quote
+    crew = [Assignment("B-200", "Technician", i, 5 + i % 30, 0.0) for i in range(1, 1001)]
+    meta = dict(meta, assignments=crew)
+
+    window.build_quote_html(tech, eng, exp_lines, meta)
+    t0 = time.perf_counter()
+    html = window.build_quote_html(tech, eng, exp_lines, meta)
+    assert time.perf_counter() - t0 < 0.1
+    assert html.count("<td>T") >= 1000 and "<td>Acme $1</td>" in html
+    assert "Workload Calendar (36-Day)" in html and f"background:{DAY_COLORS[TRAVEL]}" in html
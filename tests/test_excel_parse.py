@@ -0,0 +1,145 @@
+"""Streaming sheet readers against the original cell-by-cell parser."""
+
+import openpyxl
+import pytest
+
+from conftest import write_rates_workbook
+
+pytest.importorskip("PySide6")
+
+from legacy_pcp.pcp_v1_1 import ExcelData
+
+
+def _reference_rates(ws):
+    """Service Rates as parsed before read-only streaming (kept verbatim as the oracle)."""
+    rates = []
+    header_row = None
+    for r in range(1, 15):
+        if str(ws.cell(r, 2).value).strip().lower() == "item" and str(ws.cell(r, 3).value).strip().lower() == "description":
+            header_row = r
+            break
+    if header_row is None:
+        header_row = 3
+    for r in range(header_row + 1, ws.max_row + 1):
+        desc = ws.cell(r, 3).value
+        if desc is None:
+            continue
+        desc_s = str(desc).strip()
+        if not desc_s:
+            continue
+        unit = ws.cell(r, 6).value
+        notes = ws.cell(r, 7).value
+        try:
+            unit_f = float(unit)
+        except Exception:
+            continue
+        rates.append((desc_s, unit_f, str(notes).strip() if notes is not None else ""))
+    return rates
+
+
+def _reference_models(ws):
+    headers = {str(ws.cell(1, c).value).strip(): c for c in range(1, ws.max_column + 1) if ws.cell(1, c).value is not None}
+
+    def find_col(pred):
+        for k, c in headers.items():
+            if pred(k.lower()):
+                return c
+        return None
+
+    col_item = find_col(lambda s: s in ["item", "model", "machine", "machine type"])
+    col_tech = find_col(lambda s: "technician" in s and "day" in s)
+    col_eng = find_col(lambda s: ("engineer" in s and "day" in s) or ("field engineer" in s and "day" in s))
+    col_train_app = find_col(lambda s: ("training required" in s))
+
+    def as_bool(v, default=True):
+        if v is None:
+            return default
+        if isinstance(v, bool):
+            return v
+        s = str(v).strip().lower()
+        if s in ("true", "t", "yes", "y", "1"):
+            return True
+        if s in ("false", "f", "no", "n", "0"):
+            return False
+        return default
+
+    models = []
+    for r in range(2, ws.max_row + 1):
+        item = ws.cell(r, col_item).value
+        if item is None or not str(item).strip():
+            continue
+        tech = ws.cell(r, col_tech).value or 0
+        eng = ws.cell(r, col_eng).value or 0
+        try:
+            tech_i = int(float(tech))
+        except Exception:
+            tech_i = 0
+        try:
+            eng_i = int(float(eng))
+        except Exception:
+            eng_i = 0
+        train_app = as_bool(ws.cell(r, col_train_app).value) if col_train_app is not None else True
+        models.append((str(item).strip(), tech_i, eng_i, train_app))
+    return models
+
+
+def _rates_sheet(path, header_at):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Service Rates"
+    for r in range(1, 20):
+        if r == header_at:
+            ws.append([None, "Item", "Description", None, None, "Unit Price", "Notes"])
+        else:
+            # Rows before any header still look like rate rows, so the cut-off row matters.
+            ws.append([None, r, f"Pre {r}", None, None, r * 1.5, None])
+    ws.append([None, 99, "Hotel", None, None, 140, "per night"])
+    ws.append([None, 100, "  ", None, None, 1])          # blank description
+    ws.append([None, 101, "Parking", None, None, "n/a"])  # non-numeric price
+    ws.append([None, 102, "Short"])                       # short row, no price
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize("header_at", [1, 5, 14, None, 16])  # None / 16: not found -> row-3 fallback
+def test_rates_match_reference(tmp_path, header_at):
+    path = _rates_sheet(tmp_path / "rates.xlsx", header_at)
+    expected = _reference_rates(openpyxl.load_workbook(path, data_only=True)["Service Rates"])
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        got = ExcelData._read_rates(wb["Service Rates"].iter_rows(values_only=True))
+    finally:
+        wb.close()
+    assert got == expected
+
+
+def test_rates_fallback_on_sheet_shorter_than_header_search():
+    rows = [(None, "Service Rates"), (), (None, "x", "Header-ish"), (None, 1, "Hotel", None, None, 140.0), (None, 2, "Car")]
+    assert ExcelData._read_rates(iter(rows)) == [("Hotel", 140.0, "")]
+
+
+def test_rates_short_rows_read_as_empty():
+    rows = [(None, "Item", "Description"), (None, 1, "Hotel", None, None, 140.0), (None, 2), (), (None, 3, "Parking", None, None, 20, " lot ")]
+    assert ExcelData._read_rates(iter(rows)) == [("Hotel", 140.0, ""), ("Parking", 20.0, "lot")]
+
+
+def test_models_match_reference(tmp_path):
+    path = write_rates_workbook(tmp_path / "m.xlsx", models=[
+        ("A-100", 2, 1, True), ("B-200", "3", None, "no"), (None, 1, 1, True), ("  ", 1, 1, True),
+        ("C-300", "x", 2.9, "maybe"), ("D-400", 4, 0, None),
+    ])
+    expected = _reference_models(openpyxl.load_workbook(path, data_only=True)["Instal days by Model"])
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        got = ExcelData._read_models(wb["Instal days by Model"].iter_rows(values_only=True))
+    finally:
+        wb.close()
+    assert got == expected
+    assert [m[0] for m in got] == ["A-100", "B-200", "C-300", "D-400"]
+
+
+def test_models_short_rows_and_missing_header():
+    rows = [("Item", "Technician Days", "Engineer Days", "Training Required"), ("A", 2), ("B", 1, 1, "n")]
+    assert ExcelData._read_models(iter(rows)) == [("A", 2, 0, True), ("B", 1, 1, False)]
+    with pytest.raises(ValueError):
+        ExcelData._read_models(iter([("Name", "Days")]))
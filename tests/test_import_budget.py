@@ -0,0 +1,37 @@
+"""Startup import budget for the PCP window module, measured with `python -X importtime`."""
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPO
+
+pytest.importorskip("PySide6")
+
+# Loaded on first use (sweep, workbook parse, print), never by importing the window module.
+DEFERRED = ("numpy", "openpyxl", "PySide6.QtPrintSupport", "PySide6.QtCharts")
+QT_PACKAGES = ("PySide6", "shiboken6", "shibokensupport")
+MAX_NON_QT_MODULES = 200   # 137 when this budget was set; numpy alone adds well over 100
+MAX_IMPORT_SECONDS = 2.0   # whole import including Qt; catches gross regressions only
+
+
+def import_times(module: str) -> dict[str, tuple[int, int]]:
+    """{module: (self_us, cumulative_us)} for a fresh interpreter importing `module`."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=REPO, capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line.split(":", 1)[1].split("|"))
+        times[name] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def test_window_module_import_stays_within_budget():
+    times = import_times("legacy_pcp.pcp_v1_1")
+    assert [m for m in DEFERRED if m in times] == []
+    non_qt = [m for m in times if m.split(".")[0] not in QT_PACKAGES]
+    assert len(non_qt) <= MAX_NON_QT_MODULES, sorted(non_qt)
+    assert times["legacy_pcp.pcp_v1_1"][1] / 1e6 < MAX_IMPORT_SECONDS
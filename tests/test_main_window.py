@@ -0,0 +1,200 @@
+"""MainWindow behaviour around workbook loading."""
+
+import pytest
+
+from conftest import wait_until, write_rates_workbook
+
+pytest.importorskip("PySide6")
+
+from legacy_pcp import pcp_v1_1 as pcp
+
+
+DEARER_TECH_RATES = [
+    ("Tech. Regular Time", 130.0), ("Eng. Regular Time", 150.0), ("Parking", 20.0), ("Car Rental", 80.0),
+    ("Hotel", 140.0), ("Per Diem Weekday", 60.0), ("Pre/Post Trip Prep", 200.0), ("Travel Time", 90.0),
+]
+
+
+@pytest.fixture
+def open_window(fresh_workbooks):
+    windows = []
+
+    def make(path):
+        fresh_workbooks.active_path = path
+        w = pcp.MainWindow()
+        windows.append(w)
+        return w
+
+    yield make
+    for w in windows:
+        w.release_workbook()
+        w.deleteLater()
+
+
+def test_rate_issues_are_shown_in_the_window(tmp_path, open_window):
+    path = write_rates_workbook(tmp_path / "rates.xlsx", rates=[("Tech. Regular Time", 100.0), ("Hotel", 140.0)])
+    w = open_window(path)
+    assert wait_until(lambda: w.data is not None)
+    assert not w.lbl_workbook_issues.isHidden()
+    assert "Rate not found for 'parking'" in w.lbl_workbook_issues.text()
+    w.add_line()  # a recalc (and its reset_views) leaves the notice in place
+    assert not w.lbl_workbook_issues.isHidden()
+
+
+def test_clean_workbook_shows_no_issues(rates_workbook, open_window):
+    w = open_window(rates_workbook)
+    assert wait_until(lambda: w.data is not None)
+    assert w.lbl_workbook_issues.isHidden()
+
+
+def test_failed_load_keeps_its_error_and_can_be_retried(tmp_path, open_window):
+    path = tmp_path / "rates.xlsx"
+    path.write_bytes(b"not a workbook")
+    w = open_window(path)
+    assert wait_until(lambda: not w.btn_retry_load.isHidden())
+    assert w.data is None
+    assert w.alert.text().startswith("Excel load error:")
+
+    w.add_line()  # recalcs report the real failure, not "still loading"
+    assert "Excel load error" in w.alert.text()
+    assert "still loading" not in w.alert.text()
+
+    write_rates_workbook(path)
+    w.retry_workbook_load()
+    assert wait_until(lambda: w.data is not None)
+    assert w.btn_retry_load.isHidden()
+    assert "Excel load error" not in w.alert.text()
+
+
+def test_steady_state_recalcs_reuse_cached_results(rates_workbook, open_window):
+    w = open_window(rates_workbook)
+    assert wait_until(lambda: w.data is not None)
+    w.add_line()
+    w.lines[0].cmb_model.setCurrentText("A-100")
+    w.lines[0].spin_qty.setValue(7)
+    w.flush_recalc()
+    before = pcp.allocation_cache_stats()
+    for _ in range(5):
+        w.recalc()
+    after = pcp.allocation_cache_stats()
+    assert after["misses"] == before["misses"]
+    assert after["hits"] == before["hits"]  # unchanged lines come from the per-line cache
+    assert w.calc()[3]["lines_recomputed"] == 0
+
+    w.show_diagnostics()
+    names = [w._diagnostics.tbl.item(r, 0).text() for r in range(w._diagnostics.tbl.rowCount())]
+    assert "Allocation cache hits" in names
+
+
+def test_allocation_cache_is_bounded_and_survives_workbook_changes(tmp_path, rates_workbook, open_window):
+    pcp.clear_allocation_cache()
+    for qty in range(pcp.ALLOCATION_CACHE_SIZE + 50):
+        assert pcp.allocate_cached(2, qty, 0, 14) == pcp.chunk_allocate_by_machine(2, qty, 0, 14)
+    assert pcp.allocation_cache_stats()["size"] == pcp.ALLOCATION_CACHE_SIZE
+
+    # Allocations depend only on their integer inputs, so publishing another workbook keeps them.
+    w = open_window(rates_workbook)
+    assert wait_until(lambda: w.data is not None)
+    pcp.load_workbook_async(write_rates_workbook(tmp_path / "other rates.xlsx", rates=DEARER_TECH_RATES), reload=True)
+    assert wait_until(lambda: w.data.path.name == "other rates.xlsx")
+    before = pcp.allocation_cache_stats()
+    assert before["size"] == pcp.ALLOCATION_CACHE_SIZE
+    assert pcp.allocate_cached(2, pcp.ALLOCATION_CACHE_SIZE + 49, 0, 14)
+    assert pcp.allocation_cache_stats()["hits"] == before["hits"] + 1
+
+
+def test_recalc_repaints_only_cells_that_changed(rates_workbook, open_window):
+    w = open_window(rates_workbook)
+    assert wait_until(lambda: w.data is not None)
+    for qty in range(1, 31):
+        w.add_line()
+        w.lines[-1].cmb_model.setCurrentText("B-200")
+        w.lines[-1].spin_qty.setValue(qty)
+    w.spin_window.setValue(14)
+    w.flush_recalc()
+
+    breakdown, assign = w.tbl_breakdown.model(), w.tbl_assign.model()
+    repainted = []
+    breakdown.dataChanged.connect(lambda tl, br: repainted.append((tl.row(), br.row())))
+    n_assign = assign.rowCount()
+    w.lines[-1].spin_qty.setValue(29)  # last line: only its own rows move
+    w.flush_recalc()
+
+    assert repainted and all(top >= 29 for top, _ in repainted)
+    assert breakdown.text(29, 1) == "29"
+    assert assign.cells_changed <= (3 + abs(assign.rowCount() - n_assign)) * assign.columnCount()
+    assert w.calc()[3]["lines_recomputed"] == 0
+
+
+def _shown_and_background_tabs(open_window, path):
+    """Two windows on one workbook, each quoting 6 x A-100 with training; only the first is on screen."""
+    shown, background = open_window(path), open_window(path)
+    assert wait_until(lambda: shown.data is not None and background.data is not None)
+    shown.show()
+    for w in (shown, background):
+        w.add_line()
+        w.lines[0].cmb_model.setCurrentText("A-100")
+        w.lines[0].spin_qty.setValue(6)
+        w.flush_recalc()
+    assert wait_until(lambda: shown.lines[0].chk_training.isVisible())  # child widgets show on the next event-loop turn
+    assert not background.lines[0].chk_training.isVisible()
+    return shown, background
+
+
+def _assert_same_quote_with_training(shown, background):
+    assert background.last_quote[3]["machine_rows"][0]["training_days"] == 2
+    assert background.last_quote[3]["grand_total"] == shown.last_quote[3]["grand_total"]
+
+
+def test_background_tab_keeps_training_when_another_tab_publishes(tmp_path, rates_workbook, open_window):
+    shown, background = _shown_and_background_tabs(open_window, rates_workbook)
+    _assert_same_quote_with_training(shown, background)
+
+    other = write_rates_workbook(tmp_path / "other rates.xlsx", rates=DEARER_TECH_RATES)
+    pcp.load_workbook_async(other, reload=True)  # "Load Excel…" in the shown tab
+    assert wait_until(lambda: background.data is not None and background.data.path == other.resolve())
+    _assert_same_quote_with_training(shown, background)
+
+
+def test_background_tab_keeps_training_when_the_workbook_hot_reloads(rates_workbook, open_window):
+    from ui import workbook_loader
+
+    shown, background = _shown_and_background_tabs(open_window, rates_workbook)
+    old_data, old_total = background.data, background.last_quote[3]["grand_total"]
+
+    write_rates_workbook(rates_workbook, rates=DEARER_TECH_RATES)
+    workbook_loader._WATCHER._reload()  # what the debounced file-change signal runs
+    assert wait_until(lambda: background.data is not old_data and shown.data is background.data)
+    assert background.last_quote[3]["grand_total"] > old_total
+    _assert_same_quote_with_training(shown, background)
+
+
+def test_background_tab_prints_the_quote_it_shows(rates_workbook, open_window, monkeypatch):
+    from PySide6.QtPrintSupport import QPrintPreviewDialog  # imported by pcp only when printing
+
+    shown, background = _shown_and_background_tabs(open_window, rates_workbook)
+    printed = []
+    monkeypatch.setattr(QPrintPreviewDialog, "exec", lambda self: 0)
+    monkeypatch.setattr(background, "build_quote_html", lambda *quote: printed.append(quote) or "")
+    background.print_quote_preview()
+    assert printed and printed[0][3]["grand_total"] == shown.last_quote[3]["grand_total"]
+    assert printed[0][3]["machine_rows"][0]["training_days"] == 2
+
+
+def test_breakdown_table_shows_the_printed_quote_rows(rates_workbook, open_window):
+    w = open_window(rates_workbook)
+    assert wait_until(lambda: w.data is not None)
+    for model, training in (("A-100", True), ("A-100", False), ("B-200", True)):
+        w.add_line()
+        w.lines[-1].cmb_model.setCurrentText(model)
+        w.lines[-1].spin_qty.setValue(3)
+        w.lines[-1].chk_training.setChecked(training)
+    w.flush_recalc()
+
+    html = w.build_quote_html(*w.last_quote)
+    breakdown = w.tbl_breakdown.model()
+    for row, r in enumerate(w.last_quote[3]["machine_rows"]):
+        cells = pcp.machine_row_cells(r)
+        assert tuple(breakdown.text(row, col) for col in range(6)) == cells
+        assert pcp.quote_machine_row(r) in html
+    assert breakdown.text(1, 2).endswith("(training excluded)")
@@ -0,0 +1,63 @@
+"""The runtime factory resolves and executes the PCP module once, reusing verified cached bytecode."""
+
+import logging
+
+import pytest
+
+from conftest import REPO
+
+pytest.importorskip("PySide6")
+
+
+@pytest.fixture
+def factory(monkeypatch, cache_dir):
+    from app import pcp_factory
+
+    monkeypatch.setenv("COMMISSION_PRO_PATH", str(REPO))
+    monkeypatch.setattr(pcp_factory, "_RESOLVED", {})
+    monkeypatch.setattr(pcp_factory, "_MODULES", {})
+    return pcp_factory
+
+
+def test_module_is_resolved_and_executed_once(factory, monkeypatch, caplog):
+    found = []
+    real = factory._find_latest_pcp_module_file
+    monkeypatch.setattr(factory, "_find_latest_pcp_module_file", lambda: found.append(1) or real())
+    with caplog.at_level(logging.INFO, logger=factory.__name__):
+        first = factory.load_pcp_module()
+        assert factory.load_pcp_module() is first
+        assert factory.get_pcp_main_window_class() is first.MainWindow
+    assert len(found) == 1
+    [record] = caplog.records
+    assert "pcp_v1_1.py (version 1.1, sha256 " + first.__pcp_sha256__[:12] in record.getMessage()
+    assert "discovery" in record.getMessage() and "load" in record.getMessage()
+
+
+def test_bytecode_cache_is_reused_and_verified(factory, cache_dir):
+    path = factory._find_latest_pcp_module_file()
+    first = factory._load_module_from_file(path)
+    assert not first.__pcp_bytecode_cached__
+    [cache_file] = (cache_dir / "bytecode").iterdir()
+
+    second = factory._load_module_from_file(path)
+    assert second.__pcp_bytecode_cached__ and second.__pcp_sha256__ == first.__pcp_sha256__
+
+    # An entry whose header does not match this interpreter and source is recompiled and replaced.
+    blob = cache_file.read_bytes()
+    cache_file.write_bytes(b"\0" * 4 + blob[4:])
+    third = factory._load_module_from_file(path)
+    assert not third.__pcp_bytecode_cached__
+    assert cache_file.read_bytes() == blob
+
+
+def test_edited_source_gets_its_own_cache_entry(factory, tmp_path, monkeypatch):
+    legacy = tmp_path / "legacy_pcp"
+    legacy.mkdir()
+    src = legacy / "pcp_v9_2.py"
+    src.write_text("class MainWindow:\n    VERSION = 1\n")
+    monkeypatch.setenv("COMMISSION_PRO_PATH", str(tmp_path))
+    assert factory._load_module_from_file(src).MainWindow.VERSION == 1
+    src.write_text("class MainWindow:\n    VERSION = 2\n")
+    module = factory._load_module_from_file(src)
+    assert module.MainWindow.VERSION == 2 and not module.__pcp_bytecode_cached__
+    assert factory.load_pcp_module().MainWindow.VERSION == 2
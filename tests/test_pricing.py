@@ -0,0 +1,131 @@
+"""The headless pricing engine: hand-checked quotes, batch parity and no Qt at import."""
+
+import random
+import subprocess
+import sys
+from dataclasses import dataclass
+
+import pytest
+
+from conftest import REPO
+from core.model_table import ModelTable, compute_lines
+from core.crew_packing import CrewMember
+from core.pricing import LineSelection, RateCard, line_days, line_headcounts, price_quote, price_resources
+from core.qualifications import QualificationIndex
+
+
+@dataclass
+class Model:
+    tech_install_days_per_machine: int
+    eng_days_per_machine: int
+    training_applicable: bool = True
+
+
+MODELS = {"A-100": Model(2, 1, True), "B-200": Model(3, 0, False), "C-300": Model(6, 6, True)}
+RATES = RateCard(tech_hourly=100.0, eng_hourly=150.0, parking=20.0, car_rental=80.0, hotel=140.0,
+                 per_diem=60.0, prep=200.0, travel_time=90.0)
+
+
+def test_hand_priced_quote():
+    tech, eng, exp, meta = price_quote([LineSelection("A-100", 3, True)], 7, MODELS, RATES).astuple()
+    # Tech: 3 x 2 install + 1 training = 7 days on one person; Eng: 3 x 1 + 1 training = 4 days.
+    assert (tech.headcount, tech.onsite_days_by_person, tech.labor_cost) == (1, [7], 5600.0)
+    assert (eng.headcount, eng.onsite_days_by_person, eng.labor_cost) == (1, [4], 4800.0)
+    amounts = {l.description: l.extended for l in exp}
+    assert amounts == {
+        "Airfare": 3000.0, "Baggage": 15 * 150.0, "Car Rental": 15 * 80.0, "Parking": 15 * 20.0,
+        "Hotel": 13 * 140.0, "Per Diem": 15 * 60.0, "Pre/Post Trip Prep": 400.0, "Travel Time": 32 * 90.0,
+    }
+    assert meta["grand_total"] == 12750.0 + 10400.0
+    assert (meta["n_people"], meta["total_trip_days"], meta["max_onsite"], meta["window"]) == (2, 15, 7, 7)
+
+
+def test_line_that_cannot_fit_the_window_is_reported():
+    with pytest.raises(ValueError, match=r"C-300: Install \(6\) \+ Training \(1\) exceeds the Customer Install Window \(6\)"):
+        price_quote([LineSelection("A-100", 1, True), LineSelection("C-300", 1, True)], 6, MODELS, RATES)
+    price_quote([LineSelection("C-300", 1, False)], 6, MODELS, RATES)
+
+
+def test_line_days_match_the_batched_columns():
+    table = ModelTable(MODELS)
+    rng = random.Random(0)
+    for _ in range(50):
+        lines = [(rng.choice(list(MODELS)), rng.randint(1, 40), rng.random() < 0.5) for _ in range(6)]
+        batch = compute_lines(table, *map(list, zip(*lines)), 14, 3)
+        for i, (model, qty, req) in enumerate(lines):
+            d = line_days(MODELS[model], qty, req)
+            for key in ("training_days", "eng_training_days", "tech_total", "eng_total", "single_training", "single_eng_training"):
+                assert d[key] == int(getattr(batch, key)[i]), (model, qty, req, key)
+
+
+def test_reactive_resources_use_their_own_day_length():
+    q = price_resources([("Technician", 3), ("Engineer", 2), ("Technician", 1)], RATES, hours_per_day=10)
+    assert [(a.role, a.person_num, a.onsite_days) for a in q.meta["assignments"]] == [
+        ("Technician", 1, 3), ("Engineer", 1, 2), ("Technician", 2, 1)]
+    assert q.tech.labor_cost == 4 * 1000.0 and q.eng.labor_cost == 2 * 1500.0
+    assert q.meta["n_people"] == 3
+
+
+def test_pooled_crews_keep_per_model_work_and_per_line_headcounts():
+    quals = QualificationIndex(["A-100", "C-300"], [
+        ("Technician", "Tech 1", {"A-100": "x", "C-300": "x"}), ("Engineer", "Eng 1", {"A-100": "x", "C-300": "x"}),
+    ])
+    lines = [LineSelection("A-100", 2, False), LineSelection("A-100", 2, False), LineSelection("C-300", 1, False)]
+    q = price_quote(lines, 10, MODELS, RATES, quals, share_crews=True)
+    techs = [a for a in q.meta["assignments"] if a.role == "Technician"]
+    assert [(a.model, a.models, a.work) for a in techs] == [
+        ("C-300 + A-100", ("C-300", "A-100"), {"C-300": 6, "A-100": 4}), ("A-100", ("A-100",), {"A-100": 4})]
+    # Each A-100 line is one person's work, not the two people who touch A-100 between them.
+    assert [r["tech_headcount"] for r in q.meta["machine_rows"]] == [1, 1, 1]
+    assert price_quote(lines[:1], 10, MODELS, RATES).meta["assignments"][0].models == ("A-100",)
+
+
+def test_line_headcounts_hand_out_a_models_days_in_order():
+    crew = [CrewMember(7, {"A": 3, "B": 4}), CrewMember(7, {"A": 7}), CrewMember(2, {"A": 2})]
+    assert line_headcounts([("A", 4), ("B", 4), ("A", 8)], crew) == [2, 1, 2]
+    assert line_headcounts([("A", 12)], crew) == [3]
+
+
+def test_engine_imports_without_qt_or_numpy():
+    code = ("import sys, core.pricing; "
+            "print(sorted(m for m in ('PySide6', 'numpy', 'openpyxl') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_every_core_module_imports_without_qt():
+    # Qt helpers live in ui/; core must stay usable headless (PySide6 blocked outright here).
+    code = ("import importlib, pkgutil, sys; sys.modules['PySide6'] = None; import core; "
+            "[importlib.import_module(f'core.{m.name}') for m in pkgutil.iter_modules(core.__path__)]")
+    subprocess.run([sys.executable, "-c", code], cwd=REPO, capture_output=True, text=True, check=True)
+
+
+def test_prices_thousands_of_quotes_per_second():
+    import time
+
+    rng = random.Random(1)
+    quotes = [[LineSelection(rng.choice(["A-100", "B-200"]), rng.randint(1, 30), True) for _ in range(5)]
+              for _ in range(2000)]
+    t0 = time.perf_counter()
+    for q in quotes:
+        price_quote(q, 14, MODELS, RATES)
+    assert time.perf_counter() - t0 < 2.0
+
+
+def test_line_cache_recomputes_only_changed_lines():
+    lines = [LineSelection("A-100", q, True) for q in range(1, 21)] + [LineSelection("B-200", 4, False)]
+    cache = {}
+    first = price_quote(lines, 14, MODELS, RATES, line_cache=cache)
+    assert first.meta["lines_recomputed"] == len(lines)
+    assert len(cache) == len(lines)
+
+    lines[7] = LineSelection("A-100", 30, True)
+    second = price_quote(lines, 14, MODELS, RATES, line_cache=cache)
+    assert second.meta["lines_recomputed"] == 1
+    assert len(cache) == len(lines)  # the replaced line's entry is dropped
+    fresh = price_quote(lines, 14, MODELS, RATES)
+    fresh.meta["lines_recomputed"] = 1
+    assert second.astuple() == fresh.astuple()
+
+    # Window and rates are part of every line's key.
+    assert price_quote(lines, 13, MODELS, RATES, line_cache=cache).meta["lines_recomputed"] == len(lines)
@@ -0,0 +1,107 @@
+"""QuoteProWindow tab construction."""
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from app import quote_pro_window
+from conftest import wait_until
+
+
+def test_build_failure_is_reported_instead_of_hanging(qapp, monkeypatch):
+    shown = []
+
+    def fail():
+        raise RuntimeError("Unable to locate CommissionPro source repo")
+
+    monkeypatch.setattr(quote_pro_window, "create_pcp_main_window", fail)
+    monkeypatch.setattr(quote_pro_window.QMessageBox, "critical", lambda *a: shown.append(a[2]))
+    w = quote_pro_window.QuoteProWindow()
+    try:
+        assert wait_until(lambda: bool(shown))  # tabs are built on the first event-loop turn
+        assert shown and "Unable to locate CommissionPro" in shown[0]
+        for i in range(w.tabs.count()):
+            text = w.tabs.widget(i).text()
+            assert "unavailable" in text and "Loading" not in text
+    finally:
+        w.deleteLater()
+
+
+@pytest.fixture
+def pro_window(rates_workbook, fresh_workbooks, monkeypatch):
+    from legacy_pcp import pcp_v1_1 as pcp
+
+    fresh_workbooks.active_path = rates_workbook
+    built = []
+    monkeypatch.setattr(quote_pro_window, "create_pcp_main_window", lambda: built.append(pcp.MainWindow()) or built[-1])
+    w = quote_pro_window.QuoteProWindow(idle_ms=0)
+    w.built = built
+    yield w
+    for i in range(len(quote_pro_window.TAB_TITLES)):
+        if w.page(i) is not None:
+            w.page(i).release_workbook()
+    w.deleteLater()
+
+
+def test_only_the_shown_tab_is_built(pro_window):
+    assert wait_until(lambda: pro_window.page(0) is not None)
+    assert len(pro_window.built) == 1 and pro_window.page(1) is None and pro_window.page(2) is None
+
+    pro_window.tabs.setCurrentIndex(2)
+    assert pro_window.page(2) is not None and pro_window.page(1) is None
+    assert pro_window.tabs.widget(2) is pro_window.page(2)
+    assert len(pro_window.built) == 2
+
+
+def test_hibernated_tab_comes_back_with_its_quote(pro_window):
+    assert wait_until(lambda: pro_window.page(0) is not None)
+    cto = pro_window.page(0)
+    assert wait_until(lambda: cto.data is not None)
+    cto.add_line()
+    cto.lines[-1].cmb_model.setCurrentText("B-200")
+    cto.lines[-1].spin_qty.setValue(4)
+    cto.lines[-1].chk_training.setChecked(False)
+    cto.spin_window.setValue(9)
+    cto.flush_recalc()
+    total = cto.last_quote[3]["grand_total"]
+    state = cto.quote_state()
+
+    pro_window.tabs.setCurrentIndex(1)
+    pro_window.hibernate_tab(1)  # the shown tab never hibernates
+    assert pro_window.page(1) is not None
+    pro_window.hibernate_tab(0)
+    assert pro_window.page(0) is None and "paused" in pro_window.tabs.widget(0).text()
+
+    pro_window.tabs.setCurrentIndex(0)
+    restored = pro_window.page(0)
+    assert restored is not None and restored is not cto
+    assert restored.quote_state() == state
+    assert restored.last_quote[3]["grand_total"] == total
+
+
+def test_idle_tabs_hibernate_after_the_configured_period(pro_window):
+    assert wait_until(lambda: pro_window.page(0) is not None)
+    pro_window.idle_ms = 10
+    pro_window.tabs.setCurrentIndex(1)
+    assert wait_until(lambda: pro_window.page(0) is None)
+    assert pro_window.page(1) is not None
+
+
+def test_hibernated_tab_keeps_training_in_its_quote(pro_window):
+    assert wait_until(lambda: pro_window.page(0) is not None)
+    cto = pro_window.page(0)
+    assert wait_until(lambda: cto.data is not None)
+    cto.add_line()
+    cto.lines[-1].cmb_model.setCurrentText("A-100")
+    cto.lines[-1].spin_qty.setValue(6)
+    assert cto.lines[-1].chk_training.isChecked()
+    cto.flush_recalc()
+    tech, eng, _, meta = cto.last_quote
+    assert meta["machine_rows"][0]["training_days"] == 2
+
+    pro_window.tabs.setCurrentIndex(1)
+    pro_window.hibernate_tab(0)
+    pro_window.tabs.setCurrentIndex(0)
+    restored = pro_window.page(0)
+    assert restored.last_quote[3]["machine_rows"][0]["training_days"] == 2
+    assert restored.last_quote[3]["grand_total"] == meta["grand_total"]
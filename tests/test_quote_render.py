@@ -0,0 +1,67 @@
+"""Quote rendering: compiled layouts, assets encoded once per file version, large quotes in milliseconds."""
+
+import base64
+import os
+import time
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from core import quote_render
+from core.quote_render import QuoteTemplate, data_uri, logo_img, quote_dates
+
+
+@pytest.fixture(autouse=True)
+def fresh_assets():
+    quote_render.clear_asset_cache()
+    yield
+    quote_render.clear_asset_cache()
+
+
+def test_template_fills_fields_and_folds_constants():
+    t = QuoteTemplate("<b>$name</b> ${days}d $$ $rule { css }", rule=7)
+    assert t.fields == ("name", "days")
+    assert t.render(name="A&B $x", days=3) == "<b>A&B $x</b> 3d $ 7 { css }"
+    with pytest.raises(KeyError):
+        t.render(name="x")
+    with pytest.raises(ValueError):
+        QuoteTemplate("costs $5")
+
+
+def test_quote_dates_run_thirty_days():
+    assert quote_dates(date(2025, 6, 3)) == ("June 3, 2025", "July 3, 2025")
+
+
+def test_logo_is_read_once_per_file_version(tmp_path, monkeypatch):
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"png-1")
+    reads = []
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self) or read_bytes(self))
+
+    for _ in range(5):
+        assert logo_img(logo) == f'<img src="data:image/png;base64,{base64.b64encode(b"png-1").decode()}" height="36" style="height:36px;" />'
+    assert len(reads) == 1
+
+    logo.write_bytes(b"png-two")
+    os.utime(logo, ns=(logo.stat().st_atime_ns, logo.stat().st_mtime_ns + 1_000_000))
+    assert data_uri(logo).endswith(base64.b64encode(b"png-two").decode())
+    assert len(reads) == 2
+    assert logo_img(tmp_path / "missing.png") == "" and logo_img(None) == ""
+
+
+def test_tm_quote_with_a_thousand_lines_renders_in_milliseconds():
+    pytest.importorskip("PySide6")
+    from app.tm_quote_renderer import build_tm_quote_html
+
+    lines = [{"resource": f"Tech {i}", "days": 2.0, "hours_per_day": 8.0, "hours": 16.0, "rate_key": "ST",
+              "rate": 95.0, "cost": 1520.0} for i in range(1000)]
+    build_tm_quote_html("ETO", "Scope <b>", lines[:1], 1520.0)
+    t0 = time.perf_counter()
+    html = build_tm_quote_html("ETO", "  Install and commission  ", lines, 1_520_000.0)
+    assert time.perf_counter() - t0 < 0.05
+    assert html.count("<td>Tech ") == 1000
+    assert "<div class=\"sow\">Install and commission</div>" in html
+    assert "<td class=\"right total\">$1,520,000.00</td>" in html
+    assert "$rows" not in html and "$total" not in html
@@ -0,0 +1,52 @@
+"""RateResolver keeps the original get_rate lookup rules."""
+
+import pytest
+
+from core.rates import RateResolver
+
+
+def _rates(*rows):
+    # ExcelData keys rates by lower-cased description, in sheet order.
+    return {desc.lower(): {"description": desc, "unit_price": price, "notes": ""} for desc, price in rows}
+
+
+RATES = _rates(
+    ("Hotel Premium", 250.0),
+    ("Hotel", 140.0),
+    ("Per Diem Weekend", 80.0),
+    ("Per Diem Weekday", 60.0),
+    ("Car Rental - Compact", 70.0),
+    ("Car Rental - SUV", 95.0),
+)
+
+
+def test_exact_match_beats_earlier_substring():
+    assert RateResolver(RATES).resolve("hotel") == (140.0, "Hotel")
+    assert RateResolver(RATES).resolve("  HOTEL ") == (140.0, "Hotel")
+
+
+def test_substring_match():
+    assert RateResolver(RATES).resolve("weekday") == (60.0, "Per Diem Weekday")
+
+
+def test_substring_tie_break_is_sheet_order():
+    assert RateResolver(RATES).resolve("car rental") == (70.0, "Car Rental - Compact")
+    assert RateResolver(RATES).resolve("per diem") == (80.0, "Per Diem Weekend")
+
+
+def test_missing_rate_raises_key_error():
+    r = RateResolver(RATES)
+    with pytest.raises(KeyError):
+        r.resolve("parking")
+    with pytest.raises(KeyError):  # memoised misses still raise
+        r.resolve("parking")
+
+
+def test_expected_keys_report_missing_and_ambiguous():
+    r = RateResolver(RATES, ["hotel", "car rental", "parking", "per diem weekday"])
+    assert r.issues == [
+        "Rate 'car rental' is ambiguous ('Car Rental - Compact', 'Car Rental - SUV'); using 'Car Rental - Compact'",
+        "Rate not found for 'parking'",
+    ]
+    # An exact hit is never ambiguous, even when other rows also contain the key.
+    assert not any("hotel" in msg for msg in r.issues)
@@ -0,0 +1,42 @@
+"""Reactive tab: resource lines priced directly, with pricing failures shown to the user."""
+
+import pytest
+
+from conftest import wait_until, write_rates_workbook
+
+pytest.importorskip("PySide6")
+
+from app.reactive_pcp import ReactiveMainWindow
+
+
+@pytest.fixture
+def open_reactive(fresh_workbooks):
+    windows = []
+
+    def make(path):
+        fresh_workbooks.active_path = path
+        w = ReactiveMainWindow()
+        windows.append(w)
+        return w
+
+    yield make
+    for w in windows:
+        w.release_workbook()
+        w.deleteLater()
+
+
+def test_resource_lines_are_priced(rates_workbook, open_reactive):
+    w = open_reactive(rates_workbook)
+    assert wait_until(lambda: w.data is not None)
+    w.recalc()
+    assert w.card_total.lbl_value.text().startswith("$")
+    assert w.alert.isHidden()
+
+
+def test_pricing_failure_is_reported_not_hidden(tmp_path, open_reactive):
+    path = write_rates_workbook(tmp_path / "rates.xlsx", rates=[("Tech. Regular Time", 100.0), ("Hotel", 140.0)])
+    w = open_reactive(path)
+    assert wait_until(lambda: w.data is not None)
+    w.recalc()
+    assert w.card_total.lbl_value.text() == "—"
+    assert not w.alert.isHidden() and "Rate not found" in w.alert.text()
@@ -0,0 +1,81 @@
+"""Input bursts collapse into one recalc; explicit actions still see fresh results."""
+
+import pytest
+
+from conftest import wait_until
+
+pytest.importorskip("PySide6")
+
+from legacy_pcp import pcp_v1_1 as pcp
+from ui.recalc_scheduler import RecalcScheduler
+
+
+def test_requests_coalesce_until_the_timer_fires(qapp):
+    runs = []
+    sched = RecalcScheduler(lambda: runs.append(1), delay_ms=5)
+    for _ in range(10):
+        sched.request()
+    assert runs == [] and sched.pending
+    assert wait_until(lambda: runs)
+    assert sched.stats() == {"requested": 10, "runs": 1, "coalesced": 9}
+
+    sched.request()
+    sched.flush()
+    assert len(runs) == 2 and not sched.pending
+    sched.flush()  # nothing pending: no extra run
+    assert len(runs) == 2
+
+
+def test_cancel_drops_a_pending_recalc(qapp):
+    runs = []
+    sched = RecalcScheduler(lambda: runs.append(1), delay_ms=5)
+    sched.request()
+    sched.cancel()
+    assert not sched.pending and sched.coalesced == 1
+    sched.run_now()
+    assert runs == [1]
+
+
+@pytest.fixture
+def window(rates_workbook, fresh_workbooks):
+    fresh_workbooks.active_path = rates_workbook
+    w = pcp.MainWindow()
+    assert wait_until(lambda: w.data is not None)
+    yield w
+    w.release_workbook()
+    w.deleteLater()
+
+
+def test_holding_the_qty_arrow_runs_one_recalc(window, monkeypatch):
+    window.add_line()
+    window.lines[0].cmb_model.setCurrentText("A-100")
+    window.flush_recalc()
+    calls = []
+    original = window.calc
+    monkeypatch.setattr(window, "calc", lambda: calls.append(1) or original())
+
+    for qty in range(2, 22):
+        window.lines[0].spin_qty.setValue(qty)
+    assert calls == []
+    assert wait_until(lambda: calls)
+    assert len(calls) == 1
+    assert window.lines[0].value().qty == 21
+    assert window.card_tech.lbl_value.text() != "0"
+    stats = window._recalc_scheduler.stats()
+    assert stats["coalesced"] >= 19
+
+    names = dict(pcp.diagnostics_rows(window))
+    assert names["Recalcs coalesced"] == f"{stats['coalesced']:,}"
+
+
+def test_print_applies_a_pending_recalc_first(window, monkeypatch):
+    window.add_line()
+    window.lines[0].cmb_model.setCurrentText("A-100")
+    window.lines[0].spin_qty.setValue(5)
+    assert window._recalc_scheduler.pending
+    from PySide6.QtPrintSupport import QPrintPreviewDialog  # imported by pcp only when printing
+
+    monkeypatch.setattr(QPrintPreviewDialog, "exec", lambda self: 0)
+    window.print_quote_preview()
+    assert not window._recalc_scheduler.pending
+    assert window.btn_print.isEnabled()
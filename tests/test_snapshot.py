@@ -0,0 +1,87 @@
+"""Snapshot freshness: stale or corrupt snapshots must fall back to a full parse."""
+
+import os
+import pickle
+
+import pytest
+
+from core import snapshot
+from core.snapshot import load_snapshot, save_snapshot, source_key, _snapshot_file
+
+
+def _workbook(tmp_path, content=b"v1"):
+    p = tmp_path / "rates.xlsx"
+    p.write_bytes(content)
+    return p
+
+
+def test_round_trip(cache_dir, tmp_path):
+    p = _workbook(tmp_path)
+    key = source_key(p)
+    save_snapshot("rates", key, 1, {"models": [("A", 1, 0, True)]})
+    assert load_snapshot("rates", key, 1) == {"models": [("A", 1, 0, True)]}
+    assert str(cache_dir) in str(_snapshot_file("rates", key.path))
+
+
+def test_changed_mtime_is_stale(cache_dir, tmp_path):
+    p = _workbook(tmp_path)
+    key = source_key(p)
+    save_snapshot("rates", key, 1, {"x": 1})
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert load_snapshot("rates", source_key(p), 1) is None
+
+
+def test_changed_content_is_stale(cache_dir, tmp_path):
+    p = _workbook(tmp_path, b"v1")
+    key = source_key(p)
+    save_snapshot("rates", key, 1, {"x": 1})
+    st = p.stat()
+    p.write_bytes(b"v2")  # same size
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns))  # same mtime: only the hash differs
+    assert load_snapshot("rates", source_key(p), 1) is None
+
+
+def test_version_and_format_mismatch_are_stale(cache_dir, tmp_path, monkeypatch):
+    key = source_key(_workbook(tmp_path))
+    save_snapshot("rates", key, 1, {"x": 1})
+    assert load_snapshot("rates", key, 2) is None
+    monkeypatch.setattr(snapshot, "SNAPSHOT_FORMAT", snapshot.SNAPSHOT_FORMAT + 1)
+    assert load_snapshot("rates", key, 1) is None
+
+
+def test_corrupt_snapshot_is_ignored(cache_dir, tmp_path):
+    key = source_key(_workbook(tmp_path))
+    target = _snapshot_file("rates", key.path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(b"\x80\x05not a pickle")
+    assert load_snapshot("rates", key, 1) is None
+    target.write_bytes(pickle.dumps(["wrong", "shape"]))
+    assert load_snapshot("rates", key, 1) is None
+    # A fresh save replaces the corrupt file.
+    save_snapshot("rates", key, 1, {"x": 1})
+    assert load_snapshot("rates", key, 1) == {"x": 1}
+
+
+def test_excel_data_reparses_only_when_stale(rates_workbook, monkeypatch):
+    pytest.importorskip("PySide6")
+    from legacy_pcp.pcp_v1_1 import ExcelData
+
+    parses = []
+    real_parse = ExcelData._parse
+    monkeypatch.setattr(ExcelData, "_parse", lambda self: parses.append(1) or real_parse(self))
+
+    first = ExcelData(rates_workbook)
+    ExcelData(rates_workbook)
+    assert len(parses) == 1  # second load came from the snapshot
+
+    st = rates_workbook.stat()
+    os.utime(rates_workbook, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    again = ExcelData(rates_workbook)
+    assert len(parses) == 2
+    assert again.models == first.models
+
+    key = source_key(rates_workbook)
+    _snapshot_file("rates", key.path).write_bytes(b"garbage")
+    assert ExcelData(rates_workbook).rates == first.rates
+    assert len(parses) == 3
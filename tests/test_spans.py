@@ -0,0 +1,104 @@
+"""Phase span timing: free when off, percentiles per phase, Chrome-trace export."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from core import spans
+from core.spans import SpanRecorder, percentile
+
+
+def test_disabled_recorder_hands_out_a_shared_no_op():
+    rec = SpanRecorder()
+    assert rec.span("a") is rec.span("b")
+    with rec.span("a"):
+        pass
+    assert rec.stats() == [] and rec.chrome_trace()["traceEvents"] == []
+
+
+def test_percentiles_per_phase():
+    rec = SpanRecorder(enabled=True)
+    for ms in range(1, 101):
+        rec.record("recalc.calc", 0, ms * 1_000_000)
+    rec.record("recalc.tables", 0, 2_000_000)
+    assert rec.stats() == [("recalc.calc", 100, 50.0, 90.0, 99.0, 100.0), ("recalc.tables", 1, 2.0, 2.0, 2.0, 2.0)]
+    assert percentile([], 50) == 0.0
+
+
+def test_samples_and_events_are_bounded():
+    rec = SpanRecorder(enabled=True, max_events=10, max_samples=5)
+    for i in range(50):
+        rec.record("p", i, i)
+    assert rec.stats()[0][:2] == ("p", 50)
+    assert len(rec.chrome_trace()["traceEvents"]) == 10
+
+
+def test_chrome_trace_export(tmp_path):
+    rec = SpanRecorder(enabled=True)
+    with rec.span("startup.resolve_assets_dir"):
+        time.sleep(0.001)
+
+    def load():
+        with rec.span("workbook.load"):
+            pass
+
+    worker = threading.Thread(target=load)
+    worker.start()
+    worker.join()
+    assert rec.export_chrome_trace(tmp_path / "trace.json") == 2
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert [(e["name"], e["cat"], e["ph"]) for e in events] == [
+        ("startup.resolve_assets_dir", "startup", "X"), ("workbook.load", "workbook", "X")]
+    assert events[0]["dur"] >= 1000 and events[0]["tid"] != events[1]["tid"]
+
+
+def test_traced_functions_record_only_when_enabled(monkeypatch):
+    rec = SpanRecorder()
+    monkeypatch.setattr(spans, "SPANS", rec)
+
+    @spans.traced("work")
+    def work(x):
+        return x * 2
+
+    assert work(2) == 4 and rec.stats() == []
+    rec.enabled = True
+    assert work(3) == 6
+    assert [row[:2] for row in rec.stats()] == [("work", 1)]
+
+
+@pytest.fixture
+def timed_window(rates_workbook, fresh_workbooks, monkeypatch):
+    from conftest import wait_until
+    from legacy_pcp import pcp_v1_1 as pcp
+
+    monkeypatch.setattr(spans.SPANS, "enabled", True)
+    spans.SPANS.clear()
+    fresh_workbooks.active_path = rates_workbook
+    w = pcp.MainWindow()
+    assert wait_until(lambda: w.data is not None)
+    yield w
+    w.release_workbook()
+    w.deleteLater()
+    spans.SPANS.clear()
+
+
+def test_window_phases_show_in_the_diagnostics_panel(timed_window, tmp_path):
+    w = timed_window
+    w.add_line()
+    w.lines[-1].cmb_model.setCurrentText("B-200")
+    w.flush_recalc()
+    phases = {row[0] for row in spans.SPANS.stats()}
+    assert {"window.init", "window.apply_theme", "recalc", "recalc.calc", "recalc.tables",
+            "recalc.chart", "recalc.sweep"} <= phases
+
+    w.show_diagnostics()
+    dlg = w._diagnostics
+    shown = [dlg.tbl_spans.item(r, 0).text() for r in range(dlg.tbl_spans.rowCount())]
+    assert "recalc.calc" in shown
+    assert dlg.export_trace(str(tmp_path / "trace.json")) == len(json.loads((tmp_path / "trace.json").read_text())["traceEvents"])
+
+    dlg.chk_timing.setChecked(False)
+    assert not spans.SPANS.enabled
+    w.close()
@@ -0,0 +1,73 @@
+"""Results table model: only changed cells are signalled, row-count changes are single inserts/removes."""
+
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import Qt
+
+from ui.table_model import RowTableModel
+
+
+def spy(model):
+    events = []
+    model.dataChanged.connect(lambda tl, br: events.append(("changed", tl.row(), tl.column(), br.row(), br.column())))
+    model.rowsInserted.connect(lambda _p, first, last: events.append(("inserted", first, last)))
+    model.rowsRemoved.connect(lambda _p, first, last: events.append(("removed", first, last)))
+    return events
+
+
+def test_changed_cells_are_reported_as_row_runs(qapp):
+    model = RowTableModel(["A", "B", "C"])
+    rows = [(str(r), "x", "y") for r in range(6)]
+    model.set_rows(rows)
+    events = spy(model)
+
+    rows[1] = ("1", "X", "y")
+    rows[2] = ("2", "x", "Y")
+    rows[5] = ("5", "X", "y")
+    assert model.set_rows(rows) == 3
+    assert events == [("changed", 1, 1, 2, 2), ("changed", 5, 1, 5, 1)]
+    assert model.rows() == rows
+
+    events.clear()
+    assert model.set_rows(rows) == 0
+    assert events == []
+
+
+def test_row_count_changes_insert_or_remove_once(qapp):
+    model = RowTableModel(["A", "B"])
+    model.set_rows([("a", "1"), ("b", "2")])
+    events = spy(model)
+
+    assert model.set_rows([("a", "1"), ("b", "2"), ("c", "3"), ("d", "4")]) == 4
+    assert events == [("inserted", 2, 3)]
+    events.clear()
+    assert model.set_rows([("a", "9")]) == 1 + 3 * 2
+    assert events == [("changed", 0, 1, 0, 1), ("removed", 1, 3)]
+    assert model.rowCount() == 1 and model.text(0, 1) == "9"
+
+
+def test_styling_extras_repaint_the_whole_row(qapp):
+    model = RowTableModel(["A", "B"], align={1: Qt.AlignCenter},
+                          foreground=lambda c, row: Qt.red if row[-1] and c == 1 else None)
+    model.set_rows([("a", "1", False)])
+    events = spy(model)
+    model.set_rows([("a", "1", True)])
+    assert events == [("changed", 0, 0, 0, 1)]
+    assert model.data(model.index(0, 1), Qt.ForegroundRole) == Qt.red
+    assert model.data(model.index(0, 1), Qt.TextAlignmentRole) == int(Qt.AlignCenter)
+    assert model.data(model.index(0, 0), Qt.DisplayRole) == "a"
+    assert model.columnCount() == 2
+
+
+def test_large_updates_stay_cheap(qapp):
+    model = RowTableModel([f"C{c}" for c in range(6)])
+    rows = [tuple(f"{r}:{c}" for c in range(6)) for r in range(20000)]
+    model.set_rows(rows)
+    rows[10000] = ("changed",) + rows[10000][1:]
+    t0 = time.perf_counter()
+    assert model.set_rows(rows) == 1
+    assert time.perf_counter() - t0 < 0.5
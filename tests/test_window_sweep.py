@@ -0,0 +1,113 @@
+"""The window sweep must price every window exactly as calc() does."""
+
+import random
+
+import numpy as np
+import pytest
+
+from conftest import wait_until
+
+pytest.importorskip("PySide6")
+
+from core.window_sweep import allocation_shape
+from legacy_pcp import pcp_v1_1 as pcp
+
+
+def test_allocation_shape_matches_allocator():
+    windows = np.arange(1, 15)
+    for install in range(0, 8):
+        for qty in range(0, 40):
+            trainings = range(0, 31) if qty <= 15 else sorted({0, -(-qty // 3)})
+            for training in trainings:
+                heads, busiest = allocation_shape(np.array([install]), np.array([qty]), np.array([training]), windows)
+                for j, w in enumerate(windows):
+                    loads = pcp.chunk_allocate_by_machine(install, qty, training, int(w))
+                    assert heads[0, j] == len(loads), (install, qty, training, w)
+                    assert busiest[0, j] == max(loads, default=0), (install, qty, training, w)
+
+
+@pytest.fixture
+def window(fresh_workbooks):
+    fresh_workbooks.active_path = pcp.DEFAULT_EXCEL
+    w = pcp.MainWindow()
+    assert wait_until(lambda: w.data is not None)
+    yield w
+    w.release_workbook()
+    w.deleteLater()
+
+
+def _set_quote(w, lines):
+    while w.lines:
+        w.delete_line(w.lines[0])
+    for model, qty, training in lines:
+        w.add_line()
+        ln = w.lines[-1]
+        ln.cmb_model.setCurrentText(model)
+        ln.spin_qty.setValue(qty)
+        if ln.chk_training.isVisible():
+            ln.chk_training.setChecked(training)
+    w.flush_recalc()
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_sweep_matches_calc_for_every_window(window, seed):
+    rng = random.Random(seed)
+    models = window.models_sorted
+    _set_quote(window, [(rng.choice(models), rng.randint(1, 60), rng.random() < 0.8) for _ in range(rng.randint(1, 6))])
+    res = window.sweep()
+    for i, w in enumerate(res.windows):
+        window.spin_window.setValue(int(w))
+        try:
+            tech, eng, _exp, meta = window.calc()
+        except ValueError:
+            assert not res.feasible[i], w
+            continue
+        assert res.feasible[i], w
+        assert res.tech_headcount[i] == tech.headcount
+        assert res.eng_headcount[i] == eng.headcount
+        assert res.n_people[i] == meta["n_people"]
+        assert res.max_onsite[i] == meta["max_onsite"]
+        assert res.labor[i] == pytest.approx(tech.labor_cost + eng.labor_cost)
+        assert res.expenses[i] == pytest.approx(meta["exp_total"])
+        assert res.grand_total[i] == pytest.approx(meta["grand_total"])
+
+
+def test_cheapest_window_is_highlighted_and_selectable(window):
+    _set_quote(window, [(window.models_sorted[0], 12, True)])
+    res = window.sweep()
+    best = res.best()
+    assert best is not None
+    assert res.grand_total[best] == min(res.grand_total[res.feasible])
+    assert window.sweep_chart.best == (float(res.windows[best]), float(res.grand_total[best]))
+    assert len(window.sweep_chart.points) == int(res.feasible.sum())
+    window.use_best_window()
+    assert window.spin_window.value() == int(res.windows[best])
+    assert not window.btn_use_best_window.isEnabled()
+
+
+def test_sweep_reprices_only_when_its_inputs_change(window, monkeypatch):
+    _set_quote(window, [(window.models_sorted[0], 12, True)])
+    sweeps = []
+    sweep = window.sweep
+    monkeypatch.setattr(window, "sweep", lambda: sweeps.append(1) or sweep())
+
+    window.recalc()
+    window.spin_window.setValue(window.spin_window.value() - 1)  # only the marker moves
+    window.flush_recalc()
+    assert sweeps == []
+    assert window.sweep_chart.current[0] == window.spin_window.value()
+
+    window.lines[0].spin_qty.setValue(13)
+    window.flush_recalc()
+    assert len(sweeps) == 1
+
+
+def test_failed_recalc_sweeps_once(window, monkeypatch):
+    _set_quote(window, [(window.models_sorted[0], 12, True)])
+    sweeps = []
+    monkeypatch.setattr(window, "sweep", lambda: sweeps.append(1) or None)
+    monkeypatch.setattr(window, "calc", lambda: (_ for _ in ()).throw(ValueError("no window fits")))
+    window.lines[0].spin_qty.setValue(500)
+    window.flush_recalc()
+    assert window.alert.text() == "no window fits"
+    assert len(sweeps) == 1
@@ -0,0 +1,97 @@
+"""diff_workbooks and in-place model picker patching."""
+
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import pytest
+
+from core.workbook_diff import diff_workbooks
+
+
+@dataclass
+class Model:
+    item: str
+    tech_install_days_per_machine: int
+    eng_days_per_machine: int
+    training_applicable: bool = True
+
+
+def _book(models, rates=None, requirements=()):
+    return SimpleNamespace(
+        models={m.item: m for m in models},
+        rates=rates or {"hotel": {"description": "Hotel", "unit_price": 140.0, "notes": ""}},
+        requirements=list(requirements),
+    )
+
+
+def test_identical_workbooks_diff_empty():
+    a = _book([Model("A", 1, 0), Model("B", 2, 1)])
+    b = _book([Model("A", 1, 0), Model("B", 2, 1)])
+    d = diff_workbooks(a, b)
+    assert d.is_empty() and not d.affects_pricing
+
+
+def test_added_removed_changed_models():
+    old = _book([Model("A", 1, 0), Model("B", 2, 1), Model("D", 1, 1)])
+    new = _book([Model("C", 3, 0), Model("A", 1, 0), Model("B", 2, 1, False), Model("AA", 1, 0)])
+    d = diff_workbooks(old, new)
+    assert d.added_models == ["AA", "C"]
+    assert d.removed_models == ["D"]
+    assert d.changed_models == ["B"]
+    assert d.model_names_changed and d.affects_pricing
+
+
+def test_rates_and_requirements():
+    old = _book([Model("A", 1, 0)], requirements=["Power"])
+    new = _book([Model("A", 1, 0)], rates={"hotel": {"description": "Hotel", "unit_price": 150.0, "notes": ""},
+                                           "parking": {"description": "Parking", "unit_price": 20.0, "notes": ""}},
+                requirements=["Power", "Air"])
+    d = diff_workbooks(old, new)
+    assert d.changed_rates == ["hotel", "parking"]
+    assert d.requirements_changed
+    assert not d.model_names_changed
+
+
+def test_models_compare_by_value_across_classes():
+    @dataclass
+    class OtherModel(Model):
+        pass
+
+    d = diff_workbooks(_book([Model("A", 1, 0)]), _book([OtherModel("A", 1, 0)]))
+    assert d.is_empty()
+
+
+@pytest.fixture
+def line(qapp):
+    from legacy_pcp.pcp_v1_1 import MachineLine
+
+    changes = []
+    ln = MachineLine(["A", "C", "E"], {"A": True, "C": True, "E": False}, on_change=lambda: changes.append(1), on_delete=lambda _: None)
+    ln.changes = changes
+    yield ln
+    ln.deleteLater()
+
+
+def _items(ln):
+    return [ln.cmb_model.itemText(i) for i in range(ln.cmb_model.count())]
+
+
+def test_apply_model_changes_inserts_in_sorted_position(line):
+    line.cmb_model.setCurrentText("C")
+    line.changes.clear()
+    models = ["0", "A", "B", "C", "D", "F"]
+    # `added` deliberately out of order.
+    lost = line.apply_model_changes(models, added=["F", "D", "0", "B"], removed=["E"])
+    assert not lost
+    assert _items(line) == ["— Select —"] + models
+    assert line.cmb_model.currentText() == "C"
+    assert line.changes == []  # patched without signals
+
+
+def test_apply_model_changes_reports_lost_selection(line):
+    line.cmb_model.setCurrentText("C")
+    lost = line.apply_model_changes(["A", "E"], added=[], removed=["C"])
+    assert lost
+    assert _items(line) == ["— Select —", "A", "E"]
+    assert line.value().model == ""
+    assert line.chk_training.isHidden()
@@ -0,0 +1,59 @@
+"""Windows built by the runtime factory share one workbook load and one watcher."""
+
+import pytest
+
+from conftest import REPO, wait_until
+
+pytest.importorskip("PySide6")
+
+
+@pytest.fixture
+def factory(monkeypatch, fresh_workbooks):
+    from app import pcp_factory
+
+    monkeypatch.setenv("COMMISSION_PRO_PATH", str(REPO))
+    return pcp_factory
+
+
+def _count_workbook_opens(monkeypatch, name):
+    import openpyxl
+
+    opened = []
+    real = openpyxl.load_workbook
+
+    def spy(path, *args, **kwargs):
+        if str(path).endswith(name):
+            opened.append(str(path))
+        return real(path, *args, **kwargs)
+
+    monkeypatch.setattr(openpyxl, "load_workbook", spy)
+    return opened
+
+
+def test_two_factory_windows_parse_once(factory, monkeypatch):
+    from ui import workbook_loader
+
+    opened = _count_workbook_opens(monkeypatch, "Tech days and quote rates.xlsx")
+    first = factory.create_pcp_main_window()
+    second = factory.create_pcp_main_window()
+    try:
+        assert wait_until(lambda: first.data is not None and second.data is not None)
+        assert len(opened) == 1
+        assert first.data is second.data
+        assert workbook_loader._WATCHER is not None
+        assert not workbook_loader._LOAD_JOBS
+    finally:
+        for w in (first, second):
+            w.release_workbook()
+            w.deleteLater()
+
+
+def test_module_copies_see_identical_workbooks_as_unchanged(factory):
+    from core.workbook_diff import diff_workbooks
+
+    m1 = factory._load_module_from_file(factory._find_latest_pcp_module_file())
+    m2 = factory._load_module_from_file(factory._find_latest_pcp_module_file())
+    assert m1.ModelInfo is not m2.ModelInfo
+    a = m1.ExcelData(m1.DEFAULT_EXCEL)
+    b = m2.ExcelData(m2.DEFAULT_EXCEL)
+    assert diff_workbooks(a, b).is_empty()
@@ -0,0 +1,58 @@
+"""Workload calendar: interval rows, a horizon that fits the longest stay, one schedule for screen and print."""
+
+import time
+
+import pytest
+
+from core.pricing import Assignment
+from core.workload_calendar import schedule_assignments
+
+
+def person(role, num, model, days):
+    return Assignment(model=model, role=role, person_num=num, onsite_days=days, cost=0.0)
+
+
+def test_rows_travel_in_work_then_travel_out():
+    s = schedule_assignments([person("Technician", 1, "A-100", 3), person("Engineer", 1, "RPC-PH", 2)], str)
+    assert "".join(s.code(0, d) or "." for d in range(s.horizon)) == "TOOOT" + "." * 9
+    assert "".join(s.code(1, d) or "." for d in range(s.horizon)) == ".TOOT" + "." * 9  # late engineer start
+    assert (s.horizon, s.labels, s.groups) == (14, ["T1 - A-100", "E1 - RPC-PH"], ["A-100", "RPC-PH"])
+
+
+def test_shared_people_match_rules_by_their_models():
+    shared = [Assignment("RPC-PH + A-100", "Engineer", 1, 3, 0.0, {"RPC-PH": 2, "A-100": 1}),
+              Assignment("RPC-PH + RPC-OU", "Engineer", 2, 3, 0.0, {"RPC-PH": 2, "RPC-OU": 1})]
+    s = schedule_assignments(shared, lambda m: "RPC" if m.startswith("RPC") else "Non-RPC")
+    assert (s.travel_in[0], s.travel_in[1]) == (0, 1)  # late only when every model is a late one
+    assert s.groups == ["RPC + Non-RPC", "RPC"]
+    assert s.labels[0] == "E1 - RPC-PH + A-100"
+
+
+def test_horizon_grows_to_fit_long_stays():
+    s = schedule_assignments([person("Technician", 1, "A-100", 40)], str)
+    assert s.horizon == 42
+    assert s.code(0, 40) == "O" and s.code(0, 41) == "T"
+
+
+def test_printed_table_uses_the_same_schedule():
+    s = schedule_assignments([person("Technician", 1, "A<1>", 2)], lambda m: "Non-RPC")
+    table = s.html_table()
+    assert "<td>T1 - A&lt;1&gt;</td><td>Non-RPC</td>" in table
+    assert table.count("<td class='travel'>T</td>") == 2 and table.count("<td class='onsite'>O</td>") == 2
+    assert table.count("<th>D") == 14
+
+
+def test_large_schedule_model_is_cheap(qapp):
+    pytest.importorskip("PySide6")
+    from ui.calendar_model import CalendarModel
+
+    crew = [person("Technician", i, f"M{i % 7}", 5 + i % 60) for i in range(1, 501)]
+    model = CalendarModel()
+    t0 = time.perf_counter()
+    model.set_schedule(schedule_assignments(crew, str))
+    assert time.perf_counter() - t0 < 0.5
+    assert (model.rowCount(), model.columnCount()) == (500, 2 + 66)
+    assert model.data(model.index(0, 2)) == "T"
+
+    crew[3] = person("Technician", 4, "M4", 6)
+    assert model.set_schedule(schedule_assignments(crew, str)) == 1
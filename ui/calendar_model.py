@@ -0,0 +1,90 @@
+"""Table model and delegate that show a WorkloadSchedule without per-cell storage.
+
+Cells are computed from the schedule's interval arrays when the view asks for
+them, and the delegate fills day cells directly, so only the rows and days in
+view cost anything regardless of the horizon or crew size.
+"""
+
+from __future__ import annotations
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QPersistentModelIndex, Qt
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from core.workload_calendar import DAY_COLORS, WorkloadSchedule, schedule_assignments
+
+
+FIXED_COLUMNS = ("Resource", "Group")
+_BRUSHES = {code: QColor(color) for code, color in DAY_COLORS.items()}
+
+
+class CalendarModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.schedule: WorkloadSchedule = schedule_assignments([], str)
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.schedule)
+
+    def columnCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(FIXED_COLUMNS) + self.schedule.horizon
+
+    def code(self, row: int, col: int) -> str:
+        return self.schedule.code(row, col - len(FIXED_COLUMNS))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        r, c = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            if c == 0:
+                return self.schedule.labels[r]
+            if c == 1:
+                return self.schedule.groups[r]
+            return self.code(r, c)
+        if role == Qt.TextAlignmentRole and c >= len(FIXED_COLUMNS):
+            return int(Qt.AlignCenter)
+        if role == Qt.BackgroundRole and c >= len(FIXED_COLUMNS):
+            return _BRUSHES.get(self.code(r, c))
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal or role != Qt.DisplayRole:
+            return None
+        if section < len(FIXED_COLUMNS):
+            return FIXED_COLUMNS[section]
+        return f"D{section - len(FIXED_COLUMNS) + 1}"
+
+    def set_schedule(self, schedule: WorkloadSchedule) -> int:
+        """Show `schedule`; returns how many rows were repainted (all of them when the shape changes)."""
+        old = self.schedule
+        if len(old) != len(schedule) or old.horizon != schedule.horizon:
+            self.beginResetModel()
+            self.schedule = schedule
+            self.endResetModel()
+            return len(schedule)
+        self.schedule = schedule
+        changed = [r for r in range(len(schedule)) if old.row_key(r) != schedule.row_key(r)]
+        last = self.columnCount() - 1
+        for r in changed:
+            self.dataChanged.emit(self.index(r, 0), self.index(r, last))
+        return len(changed)
+
+
+class CalendarDelegate(QStyledItemDelegate):
+    """Paints day cells as a colour block and letter; names and groups use the default painting."""
+
+    def paint(self, painter, option, index):
+        if index.column() < len(FIXED_COLUMNS):
+            super().paint(painter, option, index)
+            return
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        elif option.features & QStyleOptionViewItem.Alternate:
+            painter.fillRect(option.rect, option.palette.alternateBase())
+        code = index.model().code(index.row(), index.column())
+        if not code:
+            return
+        painter.fillRect(option.rect.adjusted(1, 1, -1, -1), _BRUSHES[code])
+        painter.setPen(option.palette.text().color())
+        painter.drawText(option.rect, Qt.AlignCenter, code)
@@ -0,0 +1,235 @@
+"""Painted charts for the quote windows (no QtCharts).
+
+Each chart holds plain value lists. Setting new data replaces them and schedules
+one repaint, so a burst of edits costs nothing until the next paint and there is
+no scene graph or animation to rebuild. Bars shrink to the available height, so
+hundreds of people still draw in a single pass.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Sequence
+
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QWidget
+
+
+TECH_COLOR = QColor("#e04426")
+ENG_COLOR = QColor("#6790a0")
+TEXT_COLOR = QColor("#4B4F54")
+GRID_COLOR = QColor("#e3e7ec")
+AXIS_COLOR = QColor("#9aa4b2")
+BEST_COLOR = QColor("#F05A28")
+
+
+def _translucent(color: QColor, alpha: int = 110) -> QColor:
+    c = QColor(color)
+    c.setAlpha(alpha)
+    return c
+
+
+def nice_step(span: float, max_ticks: int) -> float:
+    """Tick spacing of 1, 2 or 5 times a power of ten giving at most `max_ticks` intervals."""
+    raw = span / max(1, max_ticks)
+    if raw <= 0:
+        return 1.0
+    mag = 10 ** math.floor(math.log10(raw))
+    for m in (1, 2, 5, 10):
+        if raw <= m * mag:
+            return m * mag
+    return 10 * mag
+
+
+def _draw_legend(p: QPainter, rect: QRectF, items: Sequence[tuple[str, QColor]]):
+    fm = p.fontMetrics()
+    sw = 10
+    widths = [sw + 4 + fm.horizontalAdvance(name) for name, _ in items]
+    x = rect.center().x() - (sum(widths) + 14 * (len(items) - 1)) / 2
+    cy = rect.center().y()
+    for (name, color), w in zip(items, widths):
+        p.fillRect(QRectF(x, cy - sw / 2, sw, sw), color)
+        p.setPen(TEXT_COLOR)
+        p.drawText(QRectF(x + sw + 4, rect.top(), w, rect.height()), Qt.AlignLeft | Qt.AlignVCenter, name)
+        x += w + 14
+
+
+class WorkloadChart(QWidget):
+    """Horizontal stacked bars of onsite + travel days per person (technicians first)."""
+
+    def __init__(self, title: str = "Workload (days)", parent: QWidget | None = None):
+        super().__init__(parent)
+        self.title = title
+        self.labels: list[str] = []
+        self.onsite: list[int] = []
+        self.travel: list[int] = []
+        self.n_tech = 0
+
+    def set_workload(self, tech_days: Sequence[int], eng_days: Sequence[int], travel_days: int):
+        n_tech, n_eng = len(tech_days), len(eng_days)
+        if n_tech != self.n_tech or n_tech + n_eng != len(self.labels):
+            self.labels = [f"T{i}" for i in range(1, n_tech + 1)] + [f"E{i}" for i in range(1, n_eng + 1)]
+        self.n_tech = n_tech
+        self.onsite = [int(d) for d in tech_days] + [int(d) for d in eng_days]
+        self.travel = [travel_days if d > 0 else 0 for d in self.onsite]
+        self.update()
+
+    def clear(self):
+        self.set_workload([], [], 0)
+
+    def max_total(self) -> int:
+        return max((o + t for o, t in zip(self.onsite, self.travel)), default=0)
+
+    def paintEvent(self, _event):
+        p = QPainter(self)
+        try:
+            self._paint(p)
+        finally:
+            p.end()
+
+    def _paint(self, p: QPainter):
+        fm = p.fontMetrics()
+        line_h = fm.height()
+        r = QRectF(self.rect()).adjusted(8, 6, -8, -6)
+        p.setPen(TEXT_COLOR)
+        p.drawText(QRectF(r.left(), r.top(), r.width(), line_h), Qt.AlignHCenter | Qt.AlignVCenter, self.title)
+        _draw_legend(p, QRectF(r.left(), r.bottom() - line_h, r.width(), line_h), [
+            ("Tech", TECH_COLOR), ("Tech travel", _translucent(TECH_COLOR)),
+            ("Eng", ENG_COLOR), ("Eng travel", _translucent(ENG_COLOR)),
+        ])
+
+        label_w = max((fm.horizontalAdvance(s) for s in self.labels), default=0) + 8
+        top = r.top() + line_h + 6
+        bottom = r.bottom() - 2 * line_h - 8  # tick labels, then the legend
+        plot = QRectF(r.left() + label_w, top, r.width() - label_w - 8, bottom - top)
+        if plot.width() <= 0 or plot.height() <= 0:
+            return
+
+        step = max(1, math.ceil(nice_step(max(self.max_total(), 1), 8)))
+        top_v = max(step, math.ceil(max(self.max_total(), 1) / step) * step)
+        scale = plot.width() / top_v
+        for v in range(0, top_v + 1, step):
+            x = plot.left() + v * scale
+            p.setPen(GRID_COLOR)
+            p.drawLine(QPointF(x, plot.top()), QPointF(x, plot.bottom()))
+            p.setPen(TEXT_COLOR)
+            p.drawText(QRectF(x - 20, plot.bottom() + 2, 40, line_h), Qt.AlignHCenter | Qt.AlignTop, str(v))
+        p.setPen(AXIS_COLOR)
+        p.drawLine(plot.bottomLeft(), plot.bottomRight())
+        p.drawLine(plot.topLeft(), plot.bottomLeft())
+
+        n = len(self.onsite)
+        if n == 0:
+            return
+        row_h = plot.height() / n
+        bar_h = max(1.0, row_h * 0.7)
+        label_every = max(1, math.ceil(line_h / row_h))
+        colors = [(TECH_COLOR, _translucent(TECH_COLOR)), (ENG_COLOR, _translucent(ENG_COLOR))]
+        for i, (onsite, travel) in enumerate(zip(self.onsite, self.travel)):
+            on_color, travel_color = colors[0] if i < self.n_tech else colors[1]
+            y = plot.top() + i * row_h + (row_h - bar_h) / 2
+            w_on = onsite * scale
+            p.fillRect(QRectF(plot.left(), y, w_on, bar_h), on_color)
+            p.fillRect(QRectF(plot.left() + w_on, y, travel * scale, bar_h), travel_color)
+            cy = y + bar_h / 2
+            if i % label_every == 0:
+                p.setPen(TEXT_COLOR)
+                p.drawText(QRectF(r.left(), cy - line_h / 2, label_w - 6, line_h),
+                           Qt.AlignRight | Qt.AlignVCenter, self.labels[i])
+            text = str(onsite)
+            if bar_h >= line_h and w_on >= fm.horizontalAdvance(text) + 8:
+                p.setPen(Qt.white)
+                p.drawText(QRectF(plot.left(), cy - line_h / 2, w_on - 4, line_h), Qt.AlignRight | Qt.AlignVCenter, text)
+
+
+class CostCurveChart(QWidget):
+    """Line of cost against a whole-number x value, with the selected and cheapest points marked."""
+
+    def __init__(self, x_range: tuple[int, int], x_title: str = "",
+                 y_format: Callable[[float], str] = lambda v: f"${v:,.0f}", parent: QWidget | None = None):
+        super().__init__(parent)
+        self.x_range = x_range
+        self.x_title = x_title
+        self.y_format = y_format
+        self.points: list[tuple[float, float]] = []
+        self.current: tuple[float, float] | None = None
+        self.best: tuple[float, float] | None = None
+
+    def set_curve(self, points: Sequence[tuple[float, float]], current: tuple[float, float] | None = None,
+                  best: tuple[float, float] | None = None):
+        self.points = [(float(x), float(y)) for x, y in points]
+        self.current = current
+        self.best = best
+        self.update()
+
+    def clear(self):
+        self.set_curve([])
+
+    def y_range(self) -> tuple[float, float]:
+        if not self.points:
+            return 0.0, 1.0
+        lo = min(y for _, y in self.points)
+        hi = max(y for _, y in self.points)
+        pad = max((hi - lo) * 0.1, hi * 0.02, 1.0)
+        return max(lo - pad, 0.0), hi + pad
+
+    def paintEvent(self, _event):
+        p = QPainter(self)
+        try:
+            p.setRenderHint(QPainter.Antialiasing)
+            self._paint(p)
+        finally:
+            p.end()
+
+    def _paint(self, p: QPainter):
+        fm = p.fontMetrics()
+        line_h = fm.height()
+        r = QRectF(self.rect()).adjusted(8, 8, -8, -6)
+        _draw_legend(p, QRectF(r.left(), r.bottom() - line_h, r.width(), line_h), [
+            ("Total cost", ENG_COLOR), ("Selected window", TEXT_COLOR), ("Cheapest", BEST_COLOR),
+        ])
+
+        y_lo, y_hi = self.y_range()
+        step = nice_step(y_hi - y_lo, 5)
+        y_ticks = [v * step for v in range(math.ceil(y_lo / step), math.floor(y_hi / step) + 1)]
+        label_w = max((fm.horizontalAdvance(self.y_format(v)) for v in y_ticks), default=0) + 8
+        bottom = r.bottom() - line_h * (3 if self.x_title else 2) - 10
+        plot = QRectF(r.left() + label_w, r.top() + line_h / 2, r.width() - label_w - 8, bottom - r.top() - line_h / 2)
+        if plot.width() <= 0 or plot.height() <= 0:
+            return
+
+        x_lo, x_hi = self.x_range
+        x_span = max(1, x_hi - x_lo)
+
+        def to_px(x: float, y: float) -> QPointF:
+            return QPointF(plot.left() + (x - x_lo) / x_span * plot.width(),
+                           plot.bottom() - (y - y_lo) / (y_hi - y_lo) * plot.height())
+
+        for v in y_ticks:
+            y = to_px(x_lo, v).y()
+            p.setPen(GRID_COLOR)
+            p.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            p.setPen(TEXT_COLOR)
+            p.drawText(QRectF(r.left(), y - line_h / 2, label_w - 6, line_h), Qt.AlignRight | Qt.AlignVCenter,
+                       self.y_format(v))
+        x_every = max(1, math.ceil((fm.horizontalAdvance(str(x_hi)) + 6) / (plot.width() / x_span)))
+        for x in range(x_lo, x_hi + 1, x_every):
+            px = to_px(x, y_lo).x()
+            p.setPen(TEXT_COLOR)
+            p.drawText(QRectF(px - 20, plot.bottom() + 2, 40, line_h), Qt.AlignHCenter | Qt.AlignTop, str(x))
+        if self.x_title:
+            p.drawText(QRectF(plot.left(), plot.bottom() + line_h + 4, plot.width(), line_h),
+                       Qt.AlignHCenter | Qt.AlignTop, self.x_title)
+        p.setPen(AXIS_COLOR)
+        p.drawLine(plot.bottomLeft(), plot.bottomRight())
+        p.drawLine(plot.topLeft(), plot.bottomLeft())
+
+        if self.points:
+            p.setPen(QPen(ENG_COLOR, 2))
+            p.drawPolyline(QPolygonF([to_px(x, y) for x, y in self.points]))
+        for point, color, size in ((self.current, TEXT_COLOR, 10), (self.best, BEST_COLOR, 14)):
+            if point is not None:
+                p.setPen(Qt.NoPen)
+                p.setBrush(color)
+                p.drawEllipse(to_px(*point), size / 2, size / 2)
@@ -0,0 +1,65 @@
+"""Coalesce bursts of recalc requests into one recalc per short interval.
+
+Input widgets call `request()` on every change; the scheduler marks the window
+dirty and runs the recalc once when its timer fires, however many requests
+arrived in between. Explicit actions (printing, adding a line) call `flush()`
+or `run_now()` so they never act on stale results.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from PySide6.QtCore import QObject, QTimer
+
+
+RECALC_DEBOUNCE_MS = 30
+
+
+class RecalcScheduler(QObject):
+    def __init__(self, run: Callable[[], None], delay_ms: int = RECALC_DEBOUNCE_MS, parent: QObject | None = None):
+        super().__init__(parent)
+        self._run = run
+        self.requested = 0
+        self.runs = 0
+        self.coalesced = 0
+        # Not restarted by later requests: a held-down spinbox still refreshes every interval.
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._fire)
+
+    @property
+    def pending(self) -> bool:
+        return self._timer.isActive()
+
+    def request(self, *_):
+        """Mark dirty; the recalc runs when the interval ends (extra requests are folded in)."""
+        self.requested += 1
+        if self._timer.isActive():
+            self.coalesced += 1
+        else:
+            self._timer.start()
+
+    def cancel(self):
+        """Drop a pending recalc because a synchronous one is about to run."""
+        if self._timer.isActive():
+            self._timer.stop()
+            self.coalesced += 1
+
+    def flush(self):
+        """Run a pending recalc now (no-op when nothing is pending)."""
+        if self._timer.isActive():
+            self._timer.stop()
+            self._fire()
+
+    def run_now(self):
+        self.cancel()
+        self._fire()
+
+    def _fire(self):
+        self.runs += 1
+        self._run()
+
+    def stats(self) -> dict[str, int]:
+        return {"requested": self.requested, "runs": self.runs, "coalesced": self.coalesced}
@@ -0,0 +1,117 @@
+"""Read-only table model over row tuples, updated by diffing against what is shown.
+
+Results tables hand `set_rows` the full list of row tuples on every recalc; the
+model keeps the previous list and emits dataChanged only for the cells that
+differ (plus one insert/remove for a changed row count), so views repaint just
+those cells and no per-cell items are ever allocated.
+
+A row tuple holds one display string per column; extra trailing values are not
+shown but reach the `foreground`/`background` callbacks (e.g. a styling flag).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Sequence
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QPersistentModelIndex, Qt
+
+
+StyleFn = Callable[[int, tuple], Any]  # (column, row) -> QColor/Qt.GlobalColor or None
+
+
+class RowTableModel(QAbstractTableModel):
+    def __init__(self, headers: Sequence[str], align: dict[int, Qt.AlignmentFlag] | None = None,
+                 foreground: StyleFn | None = None, background: StyleFn | None = None, parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._header_align: dict[int, Qt.AlignmentFlag] = {}
+        self._align = dict(align or {})
+        self._foreground = foreground
+        self._background = background
+        self._rows: list[tuple] = []
+        self.cells_changed = 0  # cells reported by the last set_rows
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def rows(self) -> list[tuple]:
+        return list(self._rows)
+
+    def text(self, row: int, col: int) -> str:
+        return self._rows[row][col]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        c = index.column()
+        if role == Qt.DisplayRole:
+            return row[c]
+        if role == Qt.TextAlignmentRole:
+            a = self._align.get(c)
+            return int(a) if a is not None else None
+        if role == Qt.ForegroundRole and self._foreground is not None:
+            return self._foreground(c, row)
+        if role == Qt.BackgroundRole and self._background is not None:
+            return self._background(c, row)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal:
+            return None
+        if role == Qt.DisplayRole:
+            return self._headers[section]
+        if role == Qt.TextAlignmentRole and section in self._header_align:
+            return int(self._header_align[section])
+        return None
+
+    def set_header_alignment(self, col: int, align: Qt.AlignmentFlag):
+        self._header_align[col] = align
+        self.headerDataChanged.emit(Qt.Horizontal, col, col)
+
+    def set_rows(self, rows: Sequence[tuple]) -> int:
+        """Show `rows`, signalling only what changed. Returns the number of changed cells."""
+        rows = list(rows)
+        old = self._rows
+        n_cols = len(self._headers)
+        common = min(len(old), len(rows))
+        changed = 0
+
+        # Rewrite shared rows, then report each run of consecutive changed rows as one block.
+        self._rows = rows[:common] + old[common:]
+        run_start = None
+        lo = hi = 0
+        for r in range(common + 1):
+            diff = None
+            if r < common and old[r] != rows[r]:
+                a, b = old[r], rows[r]
+                if a[n_cols:] != b[n_cols:]:
+                    diff = (0, n_cols - 1)  # styling changed: the whole row repaints
+                else:
+                    cols = [c for c in range(n_cols) if a[c] != b[c]]
+                    diff = (cols[0], cols[-1])
+                changed += diff[1] - diff[0] + 1
+            if diff is not None:
+                if run_start is None:
+                    run_start, lo, hi = r, diff[0], diff[1]
+                else:
+                    lo, hi = min(lo, diff[0]), max(hi, diff[1])
+            elif run_start is not None:
+                self.dataChanged.emit(self.index(run_start, lo), self.index(r - 1, hi))
+                run_start = None
+
+        if len(rows) > len(old):
+            self.beginInsertRows(QModelIndex(), len(old), len(rows) - 1)
+            self._rows = rows
+            self.endInsertRows()
+            changed += (len(rows) - len(old)) * n_cols
+        elif len(rows) < len(old):
+            self.beginRemoveRows(QModelIndex(), len(rows), len(old) - 1)
+            self._rows = rows
+            self.endRemoveRows()
+            changed += (len(old) - len(rows)) * n_cols
+        self.cells_changed = changed
+        return changed
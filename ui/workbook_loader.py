@@ -0,0 +1,148 @@
+"""Process-wide background workbook loads and the hot-reload watcher.
+
+The PCP module may be executed more than once per process (the runtime factory
+loads it from source for every window), so anything that must be shared by all
+tabs lives here, next to WORKBOOKS: the table of in-flight load jobs (so tabs
+join one parse instead of starting their own) and the single file watcher.
+
+Loaders are callables `loader(path, progress=..., should_cancel=...)` that
+raise LoadCancelled when `should_cancel()` turns true.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+from core.workbook_registry import WORKBOOKS, _key
+
+
+Loader = Callable[..., Any]
+
+
+class LoadCancelled(Exception):
+    """Raised inside a loader when its should_cancel callback asks to stop."""
+
+
+class WorkbookLoadJob(QObject):
+    """Parse a workbook on a worker thread; results are delivered on the UI thread.
+
+    A successful load is adopted into WORKBOOKS and published to every subscribed window.
+    """
+    progress = Signal(str)
+    loaded = Signal(object)
+    failed = Signal(str)
+    _result = Signal(object, str)
+
+    def __init__(self, path: Path, loader: Loader):
+        super().__init__()
+        self.path = Path(path)
+        self.loader = loader
+        self.cancelled = False
+        self._result.connect(self._on_result)
+
+    def start(self):
+        threading.Thread(target=self._run, name=f"load {self.path.name}", daemon=True).start()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _run(self):
+        try:
+            data = self.loader(self.path, progress=self.progress.emit, should_cancel=lambda: self.cancelled)
+        except LoadCancelled:
+            self._result.emit(None, "")
+        except Exception as e:
+            self._result.emit(None, str(e) or type(e).__name__)
+        else:
+            self._result.emit(data, "")
+
+    def _on_result(self, data, error: str):
+        if _LOAD_JOBS.get(_key(self.path)) is self:
+            del _LOAD_JOBS[_key(self.path)]
+        if self.cancelled:
+            return
+        if data is None:
+            self.failed.emit(error)
+            return
+        WORKBOOKS.adopt(data.path, data)
+        WORKBOOKS.publish(data.path, data)
+        watch_workbook(data.path, self.loader)
+        self.loaded.emit(data)
+
+
+_LOAD_JOBS: dict[str, WorkbookLoadJob] = {}
+
+
+def load_workbook_async(path: Path, loader: Loader, reload: bool = False) -> WorkbookLoadJob:
+    """Start (or join an in-flight) background load of `path`."""
+    key = _key(path)
+    job = _LOAD_JOBS.get(key)
+    if job is None or reload or job.cancelled:
+        job = WorkbookLoadJob(Path(path), loader)
+        _LOAD_JOBS[key] = job
+        job.start()
+    return job
+
+
+class WorkbookWatcher(QObject):
+    """Re-ingest the active workbook in the background whenever it changes on disk."""
+    DEBOUNCE_MS = 750
+    MAX_RETRIES = 5
+
+    def __init__(self):
+        super().__init__()
+        self.path: str | None = None
+        self.loader: Loader | None = None
+        self._retries = 0
+        self._fs = QFileSystemWatcher(self)
+        self._fs.fileChanged.connect(self._on_file_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DEBOUNCE_MS)
+        self._timer.timeout.connect(self._reload)
+
+    def watch(self, path: Path, loader: Loader):
+        path = _key(path)
+        if path != self.path and self._fs.files():
+            self._fs.removePaths(self._fs.files())
+        self.path = path
+        self.loader = loader
+        if path not in self._fs.files() and Path(path).exists():
+            self._fs.addPath(path)
+
+    def _on_file_changed(self, _path: str):
+        # Editors save in bursts (and often by replacing the file); wait for it to settle.
+        self._retries = 0
+        self._timer.start()
+
+    def _reload(self):
+        if not self.path or self.loader is None:
+            return
+        p = Path(self.path)
+        if not p.exists():
+            self._timer.start()
+            return
+        self.watch(p, self.loader)
+        job = load_workbook_async(p, self.loader, reload=True)
+        job.failed.connect(self._on_reload_failed)
+
+    def _on_reload_failed(self, _message: str):
+        # Typically the workbook is still locked by the editor (or mid-save); try again shortly.
+        self._retries += 1
+        if self._retries <= self.MAX_RETRIES:
+            self._timer.start()
+
+
+_WATCHER: WorkbookWatcher | None = None
+
+
+def watch_workbook(path: Path, loader: Loader):
+    """Hot-reload `path` (the active workbook) on change; replaces any previous watch."""
+    global _WATCHER
+    if _WATCHER is None:
+        _WATCHER = WorkbookWatcher()
+    _WATCHER.watch(path, loader)